@@ -0,0 +1,108 @@
+"""Compare sequential and batched Whisper transcription throughput.
+
+Runs every requested mode over the bundled test recording and over a long
+synthetic file built by looping it, then prints a Markdown table of wall
+time and real-time factor (RTF = processing time / audio duration). The
+model is loaded before any run is timed, so every mode is measured with the
+same warm model and the times cover inference only.
+
+Usage:
+    python -m benchmarks.transcription_throughput --model small --synthetic-minutes 30
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from pydub import AudioSegment
+
+from meeting_tool.audio import get_audio_duration, prepare_audio
+from meeting_tool.transcription import DEFAULT_BATCH_SIZE, load_whisper_model, run_transcription
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_AUDIO = REPO_ROOT / "audio" / "testaudio" / "audio1.m4a"
+
+
+def build_synthetic_audio(source: Path, minutes: float, output_path: Path) -> Path:
+    """Loop a short recording until it is at least `minutes` long."""
+    clip = AudioSegment.from_file(str(source)).set_frame_rate(16000).set_channels(1)
+    target_ms = int(minutes * 60 * 1000)
+    repeats = max(1, -(-target_ms // len(clip)))
+    long_audio = clip * repeats
+    long_audio[:target_ms].export(str(output_path), format="wav")
+    return output_path
+
+
+def time_transcription(audio_path: Path, mode: str, args: argparse.Namespace) -> float:
+    """Transcribe once and return the wall-clock time in seconds.
+
+    The model must already be loaded (see main), or the first run also
+    times loading it.
+    """
+    start = time.perf_counter()
+    run_transcription(
+        audio_path,
+        model_size=args.model,
+        device=args.device,
+        mode=mode,
+        batch_size=args.batch_size,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--device", default="cpu", choices=["cpu", "cuda"])
+    parser.add_argument("--compute-type", default=None)
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--synthetic-minutes", type=float, default=30.0)
+    parser.add_argument("--modes", default="sequential,batched")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        inputs = [
+            (SAMPLE_AUDIO.name, prepare_audio(SAMPLE_AUDIO, tmp_dir / "sample.wav")),
+            (
+                f"synthetic ({args.synthetic_minutes:g} min)",
+                build_synthetic_audio(
+                    SAMPLE_AUDIO, args.synthetic_minutes, tmp_dir / "synthetic.wav"
+                ),
+            ),
+        ]
+
+        # Loaded models are kept by the model registry, so every mode reuses this one
+        load_whisper_model(args.model, args.device, args.compute_type, args.cpu_threads)
+
+        rows = []
+        for name, audio_path in inputs:
+            duration = get_audio_duration(audio_path)
+            for mode in modes:
+                elapsed = time_transcription(audio_path, mode, args)
+                rows.append((name, mode, duration, elapsed))
+
+    print()
+    print(f"Model: {args.model}  |  Device: {args.device}  |  "
+          f"Compute type: {args.compute_type or 'default'}  |  "
+          f"CPU threads: {args.cpu_threads or 'default'}  |  "
+          f"Batch size: {args.batch_size}")
+    print()
+    print("| Input | Mode | Audio (s) | Wall time (s) | RTF | Speed-up |")
+    print("|-------|------|-----------|---------------|-----|----------|")
+    baseline: dict[str, float] = {}
+    for name, mode, duration, elapsed in rows:
+        baseline.setdefault(name, elapsed)
+        speedup = baseline[name] / elapsed if elapsed else 0.0
+        print(f"| {name} | {mode} | {duration:.1f} | {elapsed:.1f} | "
+              f"{elapsed / duration:.3f} | {speedup:.2f}x |")
+
+
+if __name__ == "__main__":
+    main()
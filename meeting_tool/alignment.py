@@ -1,6 +1,7 @@
 """Align transcription words with diarization speaker segments."""
 
 import bisect
+import heapq
 
 from .models import (
     AlignedUtterance,
@@ -148,3 +149,47 @@ def align_transcript(
             merged.append(utt)
 
     return merged
+
+
+def track_utterances(
+    transcription_segments: list[TranscriptionSegment],
+    speaker_label: str,
+) -> list[AlignedUtterance]:
+    """Turn the transcription of a single-speaker track into utterances.
+
+    Used for per-participant recordings, where the track itself identifies
+    the speaker. Words are grouped into one utterance until a pause of
+    MERGE_GAP_SECONDS or more, matching the grouping of align_transcript.
+
+    Args:
+        transcription_segments: Transcription of the track with word timestamps.
+        speaker_label: Label given to every utterance of the track.
+
+    Returns:
+        List of AlignedUtterance sorted by start time.
+    """
+    utterances: list[AlignedUtterance] = []
+    words = [word for seg in transcription_segments for word in seg.words]
+    for word in words:
+        if utterances and word.start - utterances[-1].end < MERGE_GAP_SECONDS:
+            prev = utterances[-1]
+            prev.end = word.end
+            prev.text = prev.text + " " + word.text
+        else:
+            utterances.append(AlignedUtterance(
+                speaker_label=speaker_label,
+                speaker_name=speaker_label,
+                start=word.start,
+                end=word.end,
+                text=word.text,
+            ))
+    return utterances
+
+
+def merge_tracks(tracks: list[list[AlignedUtterance]]) -> list[AlignedUtterance]:
+    """Merge per-track utterance lists, each sorted by start time, into one timeline.
+
+    A k-way merge on a heap (heapq.merge) keeps this O(n log k) for n
+    utterances over k tracks, without re-sorting the combined list.
+    """
+    return list(heapq.merge(*tracks, key=lambda utt: utt.start))
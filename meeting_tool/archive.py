@@ -0,0 +1,367 @@
+"""Compact binary archive of a meeting's transcript with random access by time.
+
+Every processed meeting gets a .transcript.bin file next to its minutes.
+Reading a meeting back from it needs no Markdown parsing, and reading one
+part of a meeting decompresses only the text of that part.
+
+File layout (all integers little-endian):
+
+    8 bytes   magic
+    4 bytes   length of the JSON header
+    header    JSON: meeting metadata, speaker table, section directory
+    sections  columns and compressed text blocks, at offsets (relative to
+              the end of the header) listed in the section directory
+
+Utterances and words are stored as columns: start and end times in
+milliseconds and an index into the interned speaker table (utterances) or
+a quantized probability (words). Their text is kept in zlib-compressed
+blocks, one per BLOCK_SECONDS of meeting time, and the block table serves
+as the time index. Opening an archive reads only the header and the
+columns; text blocks are read when utterances or words are requested.
+"""
+
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .models import AlignedUtterance, MeetingTranscript, TranscriptionWord
+
+ARCHIVE_SUFFIX = ".transcript.bin"
+
+MAGIC = b"MTGARCH\x00"
+FORMAT_VERSION = 1
+
+# Meeting time covered by one compressed text block
+DEFAULT_BLOCK_SECONDS = 60.0
+
+# Archives opened in parallel by load_archives
+DEFAULT_LOAD_WORKERS = 8
+
+# Separates the strings of a text block (never part of transcribed text)
+_SEPARATOR = "\x00"
+
+_BLOCK_DTYPE = np.dtype([
+    ("start", "<u4"),
+    ("end", "<u4"),
+    ("first_utterance", "<u4"),
+    ("utterances", "<u4"),
+    ("first_word", "<u4"),
+    ("words", "<u4"),
+    ("text_offset", "<u8"),
+    ("text_length", "<u4"),
+    ("word_text_offset", "<u8"),
+    ("word_text_length", "<u4"),
+])
+
+_COLUMNS = {
+    "utterance_start": "<u4",
+    "utterance_end": "<u4",
+    "utterance_speaker": "<u2",
+    "word_start": "<u4",
+    "word_end": "<u4",
+    "word_probability": "u1",
+    "blocks": _BLOCK_DTYPE,
+}
+
+
+def archive_path_for(minutes_path: Path) -> Path:
+    """Return the archive file that belongs to a minutes .md file."""
+    return minutes_path.with_suffix(ARCHIVE_SUFFIX)
+
+
+def _milliseconds(seconds: list[float]) -> np.ndarray:
+    """Convert times in seconds to a uint32 column of milliseconds."""
+    return np.round(np.maximum(np.asarray(seconds, dtype=np.float64), 0.0) * 1000).astype("<u4")
+
+
+def _pack_text(strings: list[str]) -> bytes:
+    """Compress a list of strings into one text block."""
+    return zlib.compress(_SEPARATOR.join(strings).encode("utf-8"))
+
+
+def _unpack_text(block: bytes, count: int) -> list[str]:
+    """Inverse of _pack_text."""
+    if count == 0:
+        return []
+    return zlib.decompress(block).decode("utf-8").split(_SEPARATOR)
+
+
+def _write_atomic(path: Path, parts: list[bytes]) -> None:
+    """Write a file through a temporary file, so readers never see half of it."""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, "wb") as f:
+        for part in parts:
+            f.write(part)
+    os.replace(temp_path, path)
+
+
+def _header_bytes(header: dict) -> bytes:
+    """Encode the magic, header length and JSON header."""
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return MAGIC + len(encoded).to_bytes(4, "little") + encoded
+
+
+def write_archive(
+    path: Path,
+    transcript: MeetingTranscript,
+    words: list[TranscriptionWord] | None = None,
+    block_seconds: float = DEFAULT_BLOCK_SECONDS,
+) -> Path:
+    """Write a meeting transcript (and optionally its words) as an archive.
+
+    Args:
+        path: Archive file to write (see archive_path_for).
+        transcript: The meeting's speaker-labeled utterances and metadata.
+        words: Word-level timestamps from the transcription.
+        block_seconds: Meeting time covered by one text block.
+
+    Returns:
+        Path to the written archive.
+    """
+    utterances = sorted(transcript.utterances, key=lambda u: u.start)
+    words = sorted(words or [], key=lambda w: w.start)
+
+    speakers: dict[tuple[str, str], int] = {}
+    speaker_ids = [
+        speakers.setdefault((u.speaker_label, u.speaker_name), len(speakers))
+        for u in utterances
+    ]
+    columns = {
+        "utterance_start": _milliseconds([u.start for u in utterances]),
+        "utterance_end": _milliseconds([u.end for u in utterances]),
+        "utterance_speaker": np.asarray(speaker_ids, dtype="<u2"),
+        "word_start": _milliseconds([w.start for w in words]),
+        "word_end": _milliseconds([w.end for w in words]),
+        "word_probability": np.round(
+            np.clip([w.probability for w in words], 0.0, 1.0) * 255
+        ).astype("u1"),
+    }
+
+    # Text blocks are laid out first, each block's utterances then its words
+    block_ms = int(block_seconds * 1000)
+    keys = sorted(
+        set((columns["utterance_start"] // block_ms).tolist())
+        | set((columns["word_start"] // block_ms).tolist())
+    )
+    blocks = np.zeros(len(keys), dtype=_BLOCK_DTYPE)
+    texts: list[bytes] = []
+    offset = 0
+    for i, key in enumerate(keys):
+        bounds = (key * block_ms, (key + 1) * block_ms)
+        first_u, last_u = np.searchsorted(columns["utterance_start"], bounds)
+        first_w, last_w = np.searchsorted(columns["word_start"], bounds)
+        text = _pack_text([u.text for u in utterances[first_u:last_u]])
+        word_text = _pack_text([w.text for w in words[first_w:last_w]])
+        ends = [*columns["utterance_end"][first_u:last_u], *columns["word_end"][first_w:last_w]]
+        blocks[i] = (
+            bounds[0], max(ends), first_u, last_u - first_u, first_w, last_w - first_w,
+            offset, len(text), offset + len(text), len(word_text),
+        )
+        texts += [text, word_text]
+        offset += len(text) + len(word_text)
+    columns["blocks"] = blocks
+
+    sections = {}
+    data = texts
+    for name, column in columns.items():
+        raw = column.tobytes()
+        sections[name] = [offset, len(raw)]
+        data.append(raw)
+        offset += len(raw)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "source_file": str(transcript.source_file),
+        "duration_seconds": transcript.duration_seconds,
+        "speaker_map": transcript.speaker_map,
+        "speakers": [list(speaker) for speaker in speakers],
+        "block_seconds": block_seconds,
+        "sections": sections,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, [_header_bytes(header), *data])
+    return path
+
+
+def _read_header(f, path: Path) -> tuple[dict, int]:
+    """Read the header of an open archive.
+
+    Returns:
+        (header, file offset where the sections start).
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not a meeting archive")
+    length = int.from_bytes(f.read(4), "little")
+    header = json.loads(f.read(length).decode("utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has unsupported archive version {header.get('version')}")
+    return header, len(MAGIC) + 4 + length
+
+
+class MeetingArchive:
+    """An opened meeting archive.
+
+    The columns (times, speakers, probabilities) are loaded when the
+    archive is opened, which is enough for statistics like talk time per
+    speaker. Text is read from the file block by block on request.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            header, self._data_start = _read_header(f, path)
+            columns = {}
+            for name, dtype in _COLUMNS.items():
+                offset, length = header["sections"][name]
+                f.seek(self._data_start + offset)
+                columns[name] = np.frombuffer(f.read(length), dtype=dtype)
+
+        self.source_file = Path(header["source_file"])
+        self.duration_seconds: float = header["duration_seconds"]
+        self.speaker_map: dict[str, str] = header["speaker_map"]
+        # Interned (label, name) pairs, indexed by utterance_speaker
+        self.speakers: list[tuple[str, str]] = [tuple(s) for s in header["speakers"]]
+        self.utterance_start = columns["utterance_start"]
+        self.utterance_end = columns["utterance_end"]
+        self.utterance_speaker = columns["utterance_speaker"]
+        self.word_start = columns["word_start"]
+        self.word_end = columns["word_end"]
+        self.word_probability = columns["word_probability"]
+        self.blocks = columns["blocks"]
+
+    @property
+    def num_utterances(self) -> int:
+        """Number of utterances in the meeting."""
+        return len(self.utterance_start)
+
+    @property
+    def num_words(self) -> int:
+        """Number of words in the meeting."""
+        return len(self.word_start)
+
+    def _blocks_between(self, start: float | None, end: float | None) -> np.ndarray:
+        """Blocks holding anything that overlaps the time range."""
+        selected = np.ones(len(self.blocks), dtype=bool)
+        if start is not None:
+            selected &= self.blocks["end"] > start * 1000
+        if end is not None:
+            selected &= self.blocks["start"] < end * 1000
+        return self.blocks[selected]
+
+    def _read_blocks(self, blocks: np.ndarray, offset_field: str, length_field: str) -> list[bytes]:
+        """Read the compressed text blocks of the given blocks."""
+        result = []
+        with open(self.path, "rb") as f:
+            for block in blocks:
+                f.seek(self._data_start + int(block[offset_field]))
+                result.append(f.read(int(block[length_field])))
+        return result
+
+    def utterances(self, start: float | None = None, end: float | None = None) -> list[AlignedUtterance]:
+        """Utterances overlapping the time range (default: the whole meeting), by start time."""
+        blocks = self._blocks_between(start, end)
+        result = []
+        for block, text in zip(blocks, self._read_blocks(blocks, "text_offset", "text_length")):
+            first, count = int(block["first_utterance"]), int(block["utterances"])
+            for i, utterance_text in enumerate(_unpack_text(text, count), start=first):
+                u_start, u_end = self.utterance_start[i] / 1000, self.utterance_end[i] / 1000
+                if (start is not None and u_end <= start) or (end is not None and u_start >= end):
+                    continue
+                label, name = self.speakers[self.utterance_speaker[i]]
+                result.append(AlignedUtterance(label, name, u_start, u_end, utterance_text))
+        return result
+
+    def words(self, start: float | None = None, end: float | None = None) -> list[TranscriptionWord]:
+        """Words overlapping the time range (default: the whole meeting), by start time."""
+        blocks = self._blocks_between(start, end)
+        result = []
+        for block, text in zip(blocks, self._read_blocks(blocks, "word_text_offset", "word_text_length")):
+            first, count = int(block["first_word"]), int(block["words"])
+            for i, word_text in enumerate(_unpack_text(text, count), start=first):
+                w_start, w_end = self.word_start[i] / 1000, self.word_end[i] / 1000
+                if (start is not None and w_end <= start) or (end is not None and w_start >= end):
+                    continue
+                result.append(TranscriptionWord(w_start, w_end, word_text,
+                                                float(self.word_probability[i]) / 255))
+        return result
+
+    def transcript(self, start: float | None = None, end: float | None = None) -> MeetingTranscript:
+        """The meeting (or the part in the time range) as a MeetingTranscript."""
+        return MeetingTranscript(
+            source_file=self.source_file,
+            duration_seconds=self.duration_seconds,
+            utterances=self.utterances(start, end),
+            speaker_map=dict(self.speaker_map),
+        )
+
+    def speaker_seconds(self) -> dict[str, float]:
+        """Total speaking time per speaker name, computed from the columns alone."""
+        durations = (self.utterance_end.astype(np.int64) - self.utterance_start) / 1000
+        totals = np.bincount(self.utterance_speaker, weights=durations, minlength=len(self.speakers))
+        result: dict[str, float] = {}
+        for (_, name), seconds in zip(self.speakers, totals):
+            result[name] = result.get(name, 0.0) + float(seconds)
+        return result
+
+
+def load_archives(paths: list[Path], workers: int = DEFAULT_LOAD_WORKERS) -> list[MeetingArchive]:
+    """Open many archives at once, for analytics over a collection of meetings.
+
+    Only headers and columns are read, in parallel. The result is in the
+    order of paths.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return [MeetingArchive(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(MeetingArchive, paths))
+
+
+def _update_header(path: Path, update) -> bool:
+    """Rewrite an archive's header with update(header), copying the sections unchanged.
+
+    Returns:
+        True if the archive exists and was updated.
+    """
+    if not path.exists():
+        return False
+    with open(path, "rb") as f:
+        header, data_start = _read_header(f, path)
+        f.seek(data_start)
+        data = f.read()
+    update(header)
+    _write_atomic(path, [_header_bytes(header), data])
+    return True
+
+
+def rename_archive_speakers(path: Path, speaker_map: dict[str, str]) -> bool:
+    """Apply a label -> name mapping to an archive's speaker table.
+
+    Speakers are interned, so only the header is rewritten; the columns
+    and text blocks are copied unchanged.
+
+    Returns:
+        True if the archive exists and was updated.
+    """
+    def rename(header: dict) -> None:
+        header["speakers"] = [[label, speaker_map.get(label, name)]
+                              for label, name in header["speakers"]]
+        header["speaker_map"].update(speaker_map)
+
+    return _update_header(path, rename)
+
+
+def set_archive_source(path: Path, source_file: Path, duration_seconds: float) -> bool:
+    """Point a copied archive at the recording it now stands for.
+
+    Returns:
+        True if the archive exists and was updated.
+    """
+    def retarget(header: dict) -> None:
+        header["source_file"] = str(source_file)
+        header["duration_seconds"] = duration_seconds
+
+    return _update_header(path, retarget)
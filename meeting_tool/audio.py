@@ -1,20 +1,190 @@
 """Convert audio/video files to WAV format for processing."""
 
+import json
 import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 import click
-from pydub import AudioSegment
+
+from .wav import TARGET_SAMPLE_RATE, PcmWav
 
 SUPPORTED_EXTENSIONS = {".m4a", ".mp4", ".wav", ".mp3", ".ogg", ".flac", ".webm"}
 
+# Format the models read: 16kHz mono 16-bit PCM (TARGET_SAMPLE_RATE, from the wav module)
+TARGET_CODEC = "pcm_s16le"
+
+# Samples copied at a time when cutting a range out of a WAV file
+_COPY_CHUNK_SAMPLES = 1 << 20
+
+
+@dataclass
+class MediaInfo:
+    """Properties of a media file's first audio stream, read from its headers."""
+    duration: float
+    codec: str
+    sample_rate: int
+    channels: int
+    format_name: str
+    has_video: bool = False
+
 
 def check_ffmpeg() -> bool:
     """Check if ffmpeg is available on PATH."""
     return shutil.which("ffmpeg") is not None
 
 
-def prepare_audio(input_path: Path, output_path: Path | None = None) -> Path:
+def check_ffprobe() -> bool:
+    """Check if ffprobe (installed alongside ffmpeg) is available on PATH."""
+    return shutil.which("ffprobe") is not None
+
+
+def _parse_probe_output(data: dict, name: str) -> MediaInfo:
+    """Build a MediaInfo from ffprobe's JSON output."""
+    streams = data.get("streams", [])
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if audio is None:
+        raise ValueError(f"No audio stream found in {name}")
+
+    container = data.get("format", {})
+    duration = container.get("duration") or audio.get("duration")
+    if duration is None:
+        raise ValueError(f"Could not read the duration of {name}")
+
+    return MediaInfo(
+        duration=float(duration),
+        codec=audio.get("codec_name", ""),
+        sample_rate=int(audio.get("sample_rate", 0)),
+        channels=int(audio.get("channels", 0)),
+        format_name=container.get("format_name", ""),
+        has_video=any(s.get("codec_type") == "video" for s in streams),
+    )
+
+
+def probe_media(input_path: Path) -> MediaInfo:
+    """Read duration, codec, sample rate and channels with ffprobe.
+
+    Only the container headers are read, so this takes milliseconds even
+    for multi-hour recordings.
+
+    Raises:
+        RuntimeError: If ffprobe is missing or cannot read the file.
+        ValueError: If the file has no audio stream.
+    """
+    if not check_ffprobe():
+        raise RuntimeError("ffprobe not found on PATH. It is installed together with ffmpeg.")
+
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries",
+        "format=duration,format_name:stream=codec_type,codec_name,sample_rate,channels,duration",
+        "-of", "json",
+        str(input_path),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed to read {input_path.name}:\n{result.stderr.strip()}")
+    return _parse_probe_output(json.loads(result.stdout), input_path.name)
+
+
+def is_model_ready(info: MediaInfo) -> bool:
+    """True if the audio is already 16kHz mono 16-bit PCM."""
+    return (
+        info.codec == TARGET_CODEC
+        and info.sample_rate == TARGET_SAMPLE_RATE
+        and info.channels == 1
+    )
+
+
+def validate_range(start: float | None, end: float | None) -> None:
+    """Check a --start/--end time range in seconds (None: from the start / to the end).
+
+    Raises:
+        ValueError: If start is negative or end does not come after start.
+    """
+    if start is not None and start < 0:
+        raise ValueError(f"The start of the range must not be negative, got {start:.1f}s")
+    if end is not None and end <= (start or 0.0):
+        raise ValueError(f"The end of the range ({end:.1f}s) must come after its start "
+                         f"({start or 0:.1f}s)")
+
+
+def range_label(start: float | None, end: float | None) -> str:
+    """Short file name tag for a time range, e.g. "1800-4500s" or "1800s-end"."""
+    first = f"{start or 0:.0f}"
+    return f"{first}-{end:.0f}s" if end is not None else f"{first}s-end"
+
+
+def conversion_command(
+    input_path: Path,
+    output_path: Path,
+    info: MediaInfo,
+    threads: int = 0,
+    start: float | None = None,
+    end: float | None = None,
+) -> list[str]:
+    """ffmpeg command that writes the first audio stream as 16kHz mono PCM WAV.
+
+    Only the audio stream is read from the container (video in Zoom .mp4
+    files is never decoded). Audio that is already 16kHz mono PCM is
+    stream-copied into the WAV container instead of being re-encoded.
+
+    With start, ffmpeg seeks in the input before decoding, so the audio
+    before start is skipped rather than decoded and thrown away; with
+    end, it stops there.
+    """
+    command = ["ffmpeg", "-y", "-v", "error", "-threads", str(threads)]
+    if start:
+        command += ["-ss", f"{start:.3f}"]
+    command += ["-i", str(input_path)]
+    if end is not None:
+        command += ["-t", f"{end - (start or 0):.3f}"]
+    command += ["-map", "0:a:0", "-vn", "-sn", "-dn"]
+    if is_model_ready(info):
+        command += ["-c:a", "copy"]
+    else:
+        command += ["-ac", "1", "-ar", str(TARGET_SAMPLE_RATE), "-c:a", TARGET_CODEC]
+    return command + [str(output_path)]
+
+
+def _is_usable_wav(path: Path) -> bool:
+    """True if path is a 16kHz mono 16-bit PCM WAV file the models can read directly."""
+    try:
+        return PcmWav(path).sample_rate == TARGET_SAMPLE_RATE
+    except ValueError:
+        return False
+
+
+def _write_wav_range(wav: PcmWav, output_path: Path, start: float, end: float | None) -> Path:
+    """Copy part of a 16kHz mono PCM WAV file into a new WAV file, without ffmpeg."""
+    with wave.open(str(output_path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(wav.sample_rate)
+        samples = wav.window(start, end)
+        for first in range(0, len(samples), _COPY_CHUNK_SAMPLES):
+            out.writeframes(samples[first:first + _COPY_CHUNK_SAMPLES].tobytes())
+    return output_path
+
+
+def _check_range_start(start: float | None, duration: float, input_path: Path) -> None:
+    """Reject a range that starts after the recording ends."""
+    if start is not None and start >= duration:
+        raise ValueError(f"The range starts at {start:.1f}s, after the end of "
+                         f"{input_path.name} ({duration:.1f}s)")
+
+
+def prepare_audio(
+    input_path: Path,
+    output_path: Path | None = None,
+    threads: int = 0,
+    start: float | None = None,
+    end: float | None = None,
+    log: Callable[[str], None] = click.echo,
+) -> Path:
     """Convert an audio or video file to 16kHz mono .wav for processing.
 
     Accepts .m4a (Zoom audio), .mp4 (Zoom video), and other common formats.
@@ -22,10 +192,20 @@ def prepare_audio(input_path: Path, output_path: Path | None = None) -> Path:
 
     Args:
         input_path: Path to the input audio/video file.
-        output_path: Path for the output .wav file. Defaults to same name with .wav extension.
+        output_path: Path for the output .wav file. Defaults to same name with .wav extension
+            (with the range added to the name if start or end is given).
+        threads: Decoder threads passed to ffmpeg's -threads (0 = ffmpeg default).
+        start: Only convert the audio from this many seconds on.
+        end: Only convert the audio up to this many seconds.
+        log: Receives the lines describing what is done (e.g. EventEmitter.message).
 
     Returns:
-        Path to the .wav file ready for processing.
+        Path to the .wav file ready for processing. With a range, it starts
+        at start: its timestamps are offset by start from the input's.
+
+    Raises:
+        ValueError: If the range is invalid (see validate_range) or starts
+            after the end of the input.
     """
     if not input_path.exists():
         raise FileNotFoundError(f"File not found: {input_path}")
@@ -36,6 +216,20 @@ def prepare_audio(input_path: Path, output_path: Path | None = None) -> Path:
             f"Supported formats: {', '.join(sorted(SUPPORTED_EXTENSIONS))}"
         )
 
+    validate_range(start, end)
+    ranged = start is not None or end is not None
+    if ranged and output_path is None:
+        output_path = input_path.with_name(f"{input_path.stem}_{range_label(start, end)}.wav")
+
+    if _is_usable_wav(input_path):
+        if not ranged:
+            log(f"  Using {input_path.name} directly (already 16kHz mono PCM)")
+            return input_path
+        wav = PcmWav(input_path)
+        _check_range_start(start, wav.duration, input_path)
+        log(f"  Copying {range_label(start, end)} of {input_path.name} to WAV...")
+        return _write_wav_range(wav, output_path, start or 0.0, end)
+
     if not check_ffmpeg():
         raise RuntimeError(
             "ffmpeg not found on PATH. Install it:\n"
@@ -44,19 +238,39 @@ def prepare_audio(input_path: Path, output_path: Path | None = None) -> Path:
             "  Linux: sudo apt install ffmpeg"
         )
 
+    info = probe_media(input_path)
+
     if output_path is None:
         output_path = input_path.with_suffix(".wav")
+    if output_path.resolve() == input_path.resolve():
+        # ffmpeg cannot write over its own input
+        output_path = input_path.with_suffix(".16k.wav")
 
-    click.echo(f"  Converting {input_path.name} to WAV...")
-    audio = AudioSegment.from_file(str(input_path))
-    audio = audio.set_frame_rate(16000).set_channels(1)
-    audio.export(str(output_path), format="wav")
-    click.echo(f"  Audio ready: {output_path.name} ({len(audio) / 1000:.1f}s)")
+    if ranged:
+        _check_range_start(start, info.duration, input_path)
+
+    action = "Copying" if is_model_ready(info) else "Converting"
+    part = f" ({range_label(start, end)})" if ranged else ""
+    log(f"  {action} {input_path.name} audio ({info.codec}, {info.sample_rate}Hz, "
+               f"{info.channels}ch, {info.duration:.1f}s) to WAV{part}...")
+    command = conversion_command(input_path, output_path, info, threads, start, end)
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to convert {input_path.name}:\n{result.stderr.strip()}"
+        )
+    log(f"  Audio ready: {output_path.name} ({get_audio_duration(output_path):.1f}s)")
 
     return output_path
 
 
 def get_audio_duration(audio_path: Path) -> float:
-    """Get duration of an audio file in seconds."""
-    audio = AudioSegment.from_file(str(audio_path))
-    return len(audio) / 1000.0
+    """Get duration of an audio file in seconds from its headers.
+
+    PCM WAV files (such as those written by prepare_audio) are read directly;
+    other formats are probed with ffprobe. Nothing is decoded.
+    """
+    try:
+        return PcmWav(audio_path).duration
+    except ValueError:
+        return probe_media(audio_path).duration
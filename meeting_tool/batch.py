@@ -0,0 +1,541 @@
+"""Batch processing of many recordings with a pool of warm worker processes."""
+
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+
+from .audio import SUPPORTED_EXTENSIONS
+from .cache import cache_dir_for, load_meeting_info
+from .isolation import describe_failure
+from .model_registry import preload
+from .pipeline import (
+    MeetingJob,
+    cleanup_job,
+    meeting_graph,
+    minutes_settings,
+    process_meeting,
+    reuse_duplicate,
+    start_job,
+)
+from .resources import plan_threads
+from .stage_graph import StageGraph, run_graph
+from .wav import remove_orphaned_samples
+
+DONE = "done"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+DEFAULT_REPORT_NAME = "batch_report.json"
+
+# Console output of each recording processed by a worker, next to its minutes
+LOG_SUFFIX = ".log"
+
+# Recordings that may wait between two pipelined stages (each holds a decoded WAV file)
+DEFAULT_QUEUE_SIZE = 1
+
+# Marks the end of the stream of jobs between pipelined stages
+_END = object()
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one recording in a batch."""
+    input_path: str
+    output_path: str
+    status: str
+    seconds: float = 0.0
+    audio_seconds: float | None = None
+    error: str | None = None
+    log_path: str | None = None
+
+
+def collect_inputs(source: str, recursive: bool = False) -> list[Path]:
+    """Find recordings in a directory or matching a glob pattern.
+
+    Args:
+        source: A directory, or a glob pattern such as "zoom/**/*.m4a".
+        recursive: Also search subdirectories when source is a directory.
+
+    Returns:
+        Sorted list of supported audio/video files.
+    """
+    source_path = Path(source).expanduser()
+    if source_path.is_dir():
+        candidates = source_path.rglob("*") if recursive else source_path.iterdir()
+    else:
+        candidates = (Path(p) for p in glob.glob(str(source_path), recursive=True))
+
+    return sorted(
+        path for path in candidates
+        if path.is_file()
+        and path.suffix.lower() in SUPPORTED_EXTENSIONS
+        # Temporary WAV written by prepare_audio for a .wav input
+        and not path.name.endswith(".16k.wav")
+    )
+
+
+def output_path_for(input_path: Path, output_dir: Path | None = None) -> Path:
+    """Output .md path for a recording: next to it, or inside output_dir."""
+    if output_dir is None:
+        return input_path.with_suffix(".md")
+    return output_dir / input_path.with_suffix(".md").name
+
+
+def log_path_for(output_path: Path) -> Path:
+    """Where a worker keeps the console output of the recording writing output_path."""
+    return output_path.with_suffix(LOG_SUFFIX)
+
+
+def _save_log(log: str, output_path: Path) -> str | None:
+    """Write a recording's console output next to its minutes; None if that fails."""
+    path = log_path_for(output_path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(log, encoding="utf-8")
+    except OSError:
+        return None
+    return str(path)
+
+
+def is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    """True if the output exists and is newer than the recording."""
+    return output_path.exists() and output_path.stat().st_mtime >= input_path.stat().st_mtime
+
+
+def plan_batch(
+    inputs: list[Path],
+    output_dir: Path | None = None,
+    force: bool = False,
+) -> tuple[list[tuple[Path, Path]], list[BatchResult]]:
+    """Decide which recordings need processing.
+
+    Recordings whose output is up to date are skipped unless force is set.
+    If two recordings would write the same output (e.g. meeting.m4a and
+    meeting.mp4), only the first is processed.
+
+    Returns:
+        (input, output) pairs to process, and results for skipped recordings.
+    """
+    todo: list[tuple[Path, Path]] = []
+    skipped: list[BatchResult] = []
+    claimed: set[Path] = set()
+
+    for input_path in inputs:
+        output_path = output_path_for(input_path, output_dir)
+        if output_path in claimed:
+            skipped.append(BatchResult(
+                str(input_path), str(output_path), SKIPPED,
+                error="another recording in this batch writes the same output",
+            ))
+            continue
+        claimed.add(output_path)
+
+        if not force and is_up_to_date(input_path, output_path):
+            skipped.append(BatchResult(str(input_path), str(output_path), SKIPPED))
+        else:
+            todo.append((input_path, output_path))
+    return todo, skipped
+
+
+def init_worker(options: dict) -> None:
+    """Pool initializer: load the models once per worker process."""
+    if options.get("isolation") is not None:
+        return  # each stage loads its models in its own child process
+    threads = plan_threads(options.get("cpus"), options.get("jobs_per_host"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        preload(
+            whisper_models=[options["whisper_model"]],
+            device=options["device"],
+            compute_type=options.get("compute_type"),
+            cpu_threads=options.get("cpu_threads") or threads.whisper_threads,
+        )
+
+
+def process_one(input_path: Path, output_path: Path, options: dict) -> BatchResult:
+    """Process one recording in a worker.
+
+    Its console output is saved next to the minutes (see log_path_for).
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            process_meeting(
+                input_path=input_path,
+                output_path=output_path,
+                no_interactive=True,
+                **options,
+            )
+    except Exception as e:
+        return BatchResult(
+            str(input_path), str(output_path), FAILED,
+            seconds=time.perf_counter() - start,
+            error=describe_failure(e),
+            log_path=_save_log(log.getvalue(), output_path),
+        )
+
+    audio_seconds = None
+    if options.get("cache", True):
+        with contextlib.suppress(FileNotFoundError, KeyError):
+            audio_seconds = load_meeting_info(cache_dir_for(output_path))["duration_seconds"]
+    return BatchResult(
+        str(input_path), str(output_path), DONE,
+        seconds=time.perf_counter() - start,
+        audio_seconds=audio_seconds,
+        log_path=_save_log(log.getvalue(), output_path),
+    )
+
+
+def run_batch(
+    todo: list[tuple[Path, Path]],
+    options: dict,
+    workers: int = 1,
+) -> list[BatchResult]:
+    """Process recordings across a pool of worker processes.
+
+    Each worker loads the models once (pool initializer) and keeps them in
+    its model registry for every recording it handles. The core budget is
+    split between the workers.
+
+    If a worker process dies (e.g. killed for using too much memory), the
+    pool breaks and every recording still in it fails with it. Those
+    recordings are retried one at a time, each in a fresh single-worker
+    pool, so only the one that really kills its worker is reported failed.
+    Temporary files the dead workers left behind are removed.
+
+    Args:
+        todo: (input, output) pairs from plan_batch.
+        options: process_meeting keyword arguments shared by all recordings.
+        workers: Number of worker processes.
+
+    Returns:
+        One BatchResult per recording, in completion order.
+    """
+    options = {**options, "jobs_per_host": workers}
+    results: list[BatchResult] = []
+    if not todo:
+        return results
+
+    def report(result: BatchResult) -> None:
+        results.append(result)
+        name = Path(result.input_path).name
+        click.echo(f"  [{len(results)}/{len(todo)}] {result.status:<7} "
+                   f"{name} ({result.seconds:.1f}s)")
+        if result.status == FAILED:
+            click.echo(f"      {result.error.splitlines()[0]}")
+
+    broken = _run_pool(todo, options, min(workers, len(todo)), report)
+    if broken:
+        click.echo(f"  A worker process died; retrying {len(broken)} recording(s) one at a time")
+    for input_path, output_path in broken:
+        # The dead worker never released the samples it shared between stages
+        remove_orphaned_samples()
+        if _run_pool([(input_path, output_path)], options, 1, report):
+            remove_orphaned_samples()
+            report(BatchResult(
+                str(input_path), str(output_path), FAILED,
+                error="Worker crashed (e.g. killed for using too much memory)",
+            ))
+    return results
+
+
+def _run_pool(
+    todo: list[tuple[Path, Path]],
+    options: dict,
+    workers: int,
+    report: Callable[[BatchResult], None],
+) -> list[tuple[Path, Path]]:
+    """Process recordings on a new worker pool, passing each result to report.
+
+    Returns:
+        The recordings lost because a worker process died, in input order.
+    """
+    broken: list[tuple[Path, Path]] = []
+    # spawn keeps CUDA and the model libraries out of the parent process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(options,),
+    ) as executor:
+        futures = {
+            executor.submit(process_one, input_path, output_path, options): (input_path, output_path)
+            for input_path, output_path in todo
+        }
+        for future in as_completed(futures):
+            input_path, output_path = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken.append((input_path, output_path))
+                continue
+            except Exception as e:
+                result = BatchResult(
+                    str(input_path), str(output_path), FAILED, error=f"Worker failed: {e}"
+                )
+            report(result)
+    return sorted(broken, key=todo.index)
+
+
+@dataclass
+class _PipelinedItem:
+    """A recording in flight between pipelined stages.
+
+    values holds what the stages of its graph have produced so far.
+    """
+    job: MeetingJob
+    start: float
+    error: str | None = None
+    graph: StageGraph | None = None
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+class _JobLogs(io.TextIOBase):
+    """stdout of the pipelined stages: each thread writes to the log of its recording.
+
+    A stage thread appends to the log file of the recording it is working
+    on (see log_path_for), so the output of several recordings doesn't mix
+    and none of it is held in memory. Output of other threads is dropped.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # Tells click this is a text stream, not a binary one
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        log = getattr(self._local, "log", None)
+        if log is not None:
+            log.write(text)
+        return len(text)
+
+    @contextlib.contextmanager
+    def writing_to(self, path: Path):
+        """Send this thread's output to the end of path while in the block."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            log = open(path, "a", encoding="utf-8")
+        except OSError:
+            log = None
+        self._local.log = log
+        try:
+            yield
+        finally:
+            self._local.log = None
+            if log is not None:
+                log.close()
+
+
+def _stage_worker(name, stage, inbox, outbox, console, logs: _JobLogs) -> None:
+    """Run one stage on every item from inbox and pass it on to outbox.
+
+    Items that already failed in an earlier stage are passed through untouched.
+    """
+    while True:
+        item = inbox.get()
+        if item is _END:
+            outbox.put(_END)
+            return
+        if item.error is None:
+            click.echo(f"  {name:<10} {item.job.input_path.name}", file=console)
+            with logs.writing_to(log_path_for(item.job.output_path)):
+                try:
+                    stage(item)
+                except Exception as e:
+                    item.error = describe_failure(e)
+                    click.echo(item.error)
+        outbox.put(item)
+
+
+def _graph_stage(targets: list[str], step_names: list[str]):
+    """A pipelined stage running the part of each recording's graph that produces targets.
+
+    Recordings that duplicate an earlier one skip it.
+    """
+    def run(item: _PipelinedItem) -> None:
+        if item.values.get("duplicate_of") is None:
+            item.values = run_graph(item.graph, targets, item.values,
+                                    events=item.job.events, step_names=step_names)
+    return run
+
+
+def _write_stage(step_names: list[str]):
+    """The last pipelined stage: write the minutes (or copy a duplicate's) and clean up."""
+    write = _graph_stage(["minutes_path"], step_names)
+
+    def run(item: _PipelinedItem) -> None:
+        try:
+            if item.values.get("duplicate_of") is not None:
+                reuse_duplicate(item.job)
+            else:
+                write(item)
+        finally:
+            cleanup_job(item.job)
+    return run
+
+
+def run_pipelined(
+    todo: list[tuple[Path, Path]],
+    options: dict,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> list[BatchResult]:
+    """Process recordings with their stages overlapped across recordings.
+
+    Decoding, diarization, transcription and the final write-out (the
+    remaining stages of meeting_graph) each run in their own thread, connected by bounded queues. While recording N is being
+    diarized, recording N+1 is decoded and recording N-1 is transcribed.
+    Each queue holds at most queue_size recordings, which caps how many
+    decoded WAV files and intermediate results exist at once.
+
+    The models are loaded once in this process, and the core budget is
+    split between diarization and Whisper because they run at the same
+    time. The reported time per recording includes time spent waiting in
+    the queues. The stages' console output goes to each recording's log
+    file (see log_path_for).
+
+    Args:
+        todo: (input, output) pairs from plan_batch.
+        options: process_meeting keyword arguments shared by all recordings.
+        queue_size: Recordings that may wait between two stages.
+
+    Returns:
+        One BatchResult per recording, in input order.
+    """
+    results: list[BatchResult] = []
+    if not todo:
+        return results
+
+    threads = plan_threads(options.get("cpus"), options.get("jobs_per_host"),
+                           concurrent_stages=True)
+    whisper_threads = options.get("cpu_threads") or threads.whisper_threads
+
+    summary = options.get("summary", False)
+    step_names = ["decode", "diarize", "transcribe", "align", "name_speakers",
+                  "summarize" if summary else "prompt", "write"]
+    stages = [
+        ("decode", _graph_stage(["audio", "duration", "duplicate_of"], step_names)),
+        ("diarize", _graph_stage(["diarization_segments"], step_names)),
+        ("transcribe", _graph_stage(["transcription_segments", "turn_speakers"], step_names)),
+        ("write", _write_stage(step_names)),
+    ]
+
+    def graph(job: MeetingJob) -> StageGraph:
+        return meeting_graph(
+            job, threads, whisper_threads,
+            speakers=options.get("speakers"),
+            no_interactive=True,
+            num_speakers=options.get("num_speakers"),
+            device=options.get("device", "cpu"),
+            whisper_model=options.get("whisper_model", "large-v3"),
+            transcribe_mode=options.get("transcribe_mode", "sequential"),
+            batch_size=options.get("batch_size", 16),
+            compute_type=options.get("compute_type"),
+            diarization_window=options.get("diarization_window"),
+            diarization_overlap=options.get("diarization_overlap", 60.0),
+            diarization_workers=options.get("diarization_workers", 1),
+            summary=summary,
+            index=options.get("index", True),
+            dedup=options.get("dedup", True),
+        )
+
+    console = sys.stdout
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    # The stages print their usual step-by-step output from several threads
+    # at once, so it goes to each recording's log and only one progress line
+    # per stage is shown
+    logs = _JobLogs()
+    with contextlib.redirect_stdout(logs):
+        workers = [
+            threading.Thread(
+                target=_stage_worker,
+                args=(name, stage, queues[i], queues[i + 1], console, logs),
+                name=f"meeting-tool-{name}",
+                daemon=True,
+            )
+            for i, (name, stage) in enumerate(stages)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def feed():
+            try:
+                for input_path, output_path in todo:
+                    item = _PipelinedItem(job=MeetingJob(input_path, output_path),
+                                          start=time.perf_counter())
+                    with contextlib.suppress(OSError):
+                        log_path_for(output_path).unlink(missing_ok=True)
+                    try:
+                        item.job = start_job(input_path, output_path, options.get("cache", True),
+                                             isolation=options.get("isolation"))
+                        item.job.settings = minutes_settings(options)
+                        item.graph = graph(item.job)
+                        item.values = {"input_path": input_path}
+                    except Exception as e:
+                        item.error = f"{e}\n{traceback.format_exc()}"
+                    queues[0].put(item)
+            finally:
+                queues[0].put(_END)
+
+        feeder = threading.Thread(target=feed, name="meeting-tool-feed", daemon=True)
+        feeder.start()
+
+        while (item := queues[-1].get()) is not _END:
+            job = item.job
+            if item.error is not None:
+                cleanup_job(job)
+            audio_seconds = job.duration if item.error is None else None
+            log_path = log_path_for(job.output_path)
+            result = BatchResult(
+                str(job.input_path), str(job.output_path),
+                DONE if item.error is None else FAILED,
+                seconds=time.perf_counter() - item.start,
+                audio_seconds=audio_seconds,
+                error=item.error,
+                log_path=str(log_path) if log_path.exists() else None,
+            )
+            results.append(result)
+            click.echo(f"  [{len(results)}/{len(todo)}] {result.status:<7} "
+                       f"{job.input_path.name} ({result.seconds:.1f}s)", file=console)
+            if result.status == FAILED:
+                click.echo(f"      {result.error.splitlines()[0]}", file=console)
+
+        feeder.join()
+        for worker in workers:
+            worker.join()
+    return results
+
+
+def write_report(results: list[BatchResult], report_path: Path) -> Path:
+    """Write a JSON summary of a batch: totals plus one entry per recording."""
+    processed = [r for r in results if r.status == DONE]
+    report = {
+        "total": len(results),
+        "done": len(processed),
+        "skipped": sum(r.status == SKIPPED for r in results),
+        "failed": sum(r.status == FAILED for r in results),
+        "processing_seconds": sum(r.seconds for r in results),
+        "audio_seconds": sum(r.audio_seconds or 0.0 for r in processed),
+        "files": [asdict(r) for r in results],
+    }
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report_path
@@ -0,0 +1,204 @@
+"""On-disk cache of intermediate pipeline results, kept next to the output file."""
+
+import json
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .models import DiarizationSegment, TranscriptionSegment, TranscriptionWord
+
+CACHE_SUFFIX = ".cache"
+
+DIARIZATION_STATE_FILE = "diarization_state.npz"
+WINDOWED_STATE_FILE = "windowed_diarization_state.json"
+DIARIZATION_FILE = "diarization.json"
+TRANSCRIPTION_FILE = "transcription.json"
+MEETING_INFO_FILE = "meeting.json"
+INPUTS_FILE = "inputs.json"
+
+
+@dataclass
+class DiarizationState:
+    """Intermediate pyannote outputs needed to re-run only the clustering step.
+
+    Windows are (start, duration, step) triples describing the pyannote
+    SlidingWindow of the matching array.
+    """
+    segmentations: np.ndarray
+    segmentation_window: tuple[float, float, float]
+    count: np.ndarray
+    count_window: tuple[float, float, float]
+    embeddings: np.ndarray
+
+
+@dataclass
+class WindowedDiarizationState:
+    """Per-window results of windowed diarization, enough to re-link the speakers.
+
+    Windows are (start, end, own_start, own_end) tuples; segments use
+    window-relative times and window-local labels, and embeddings map each
+    window's local labels to their centroids.
+    """
+    windows: list[tuple[float, float, float, float]]
+    segments: list[list[DiarizationSegment]]
+    embeddings: list[dict[str, np.ndarray]]
+
+
+def cache_dir_for(output_path: Path) -> Path:
+    """Return the cache directory that belongs to an output .md file."""
+    return output_path.with_suffix(CACHE_SUFFIX)
+
+
+def save_diarization_state(state: DiarizationState, cache_dir: Path) -> Path:
+    """Write diarization intermediates as a compressed .npz file."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / DIARIZATION_STATE_FILE
+    # Only the state of the latest run is re-clustered
+    (cache_dir / WINDOWED_STATE_FILE).unlink(missing_ok=True)
+    np.savez_compressed(
+        path,
+        segmentations=state.segmentations,
+        segmentation_window=np.asarray(state.segmentation_window, dtype=np.float64),
+        count=state.count,
+        count_window=np.asarray(state.count_window, dtype=np.float64),
+        embeddings=state.embeddings,
+    )
+    return path
+
+
+def save_windowed_state(state: WindowedDiarizationState, cache_dir: Path) -> Path:
+    """Write the per-window results of windowed diarization as JSON."""
+    (cache_dir / DIARIZATION_STATE_FILE).unlink(missing_ok=True)
+    return _write_json(cache_dir / WINDOWED_STATE_FILE, {
+        "windows": [list(window) for window in state.windows],
+        "segments": [[asdict(s) for s in segments] for segments in state.segments],
+        "embeddings": [
+            {label: np.asarray(embedding, dtype=np.float64).tolist()
+             for label, embedding in embeddings.items()}
+            for embeddings in state.embeddings
+        ],
+    })
+
+
+def load_diarization_state(cache_dir: Path) -> DiarizationState | WindowedDiarizationState:
+    """Read the diarization state of the latest run.
+
+    That is the intermediates written by save_diarization_state, or for
+    windowed diarization the results written by save_windowed_state.
+    """
+    windowed_path = cache_dir / WINDOWED_STATE_FILE
+    if windowed_path.exists():
+        data = _read_json(windowed_path)
+        return WindowedDiarizationState(
+            windows=[tuple(window) for window in data["windows"]],
+            segments=[[DiarizationSegment(**s) for s in segments] for segments in data["segments"]],
+            embeddings=[
+                {label: np.asarray(embedding, dtype=np.float64)
+                 for label, embedding in embeddings.items()}
+                for embeddings in data["embeddings"]
+            ],
+        )
+
+    path = cache_dir / DIARIZATION_STATE_FILE
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No cached diarization state found at {path}\n"
+            "Run the process command again (without --no-cache) to create it."
+        )
+    with np.load(path) as data:
+        return DiarizationState(
+            segmentations=data["segmentations"],
+            segmentation_window=tuple(data["segmentation_window"].tolist()),
+            count=data["count"],
+            count_window=tuple(data["count_window"].tolist()),
+            embeddings=data["embeddings"],
+        )
+
+
+def _write_json(path: Path, data) -> Path:
+    """Write JSON data, creating the cache directory if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+    return path
+
+
+def _read_json(path: Path):
+    """Read a JSON cache file."""
+    if not path.exists():
+        raise FileNotFoundError(f"Cache file not found: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_diarization(segments: list[DiarizationSegment], cache_dir: Path) -> Path:
+    """Cache diarization segments as JSON."""
+    return _write_json(cache_dir / DIARIZATION_FILE, [asdict(s) for s in segments])
+
+
+def load_diarization(cache_dir: Path) -> list[DiarizationSegment]:
+    """Load diarization segments cached by save_diarization."""
+    return [DiarizationSegment(**s) for s in _read_json(cache_dir / DIARIZATION_FILE)]
+
+
+def save_transcription(segments: list[TranscriptionSegment], cache_dir: Path) -> Path:
+    """Cache transcription segments (with words) as JSON."""
+    return _write_json(cache_dir / TRANSCRIPTION_FILE, [asdict(s) for s in segments])
+
+
+def load_transcription(cache_dir: Path) -> list[TranscriptionSegment]:
+    """Load transcription segments cached by save_transcription."""
+    segments = []
+    for data in _read_json(cache_dir / TRANSCRIPTION_FILE):
+        words = [TranscriptionWord(**w) for w in data.pop("words")]
+        segments.append(TranscriptionSegment(words=words, **data))
+    return segments
+
+
+def save_meeting_info(info: dict, cache_dir: Path) -> Path:
+    """Cache meeting metadata (source file, duration, speaker map, ...)."""
+    return _write_json(cache_dir / MEETING_INFO_FILE, info)
+
+
+def load_meeting_info(cache_dir: Path) -> dict:
+    """Load meeting metadata cached by save_meeting_info."""
+    return _read_json(cache_dir / MEETING_INFO_FILE)
+
+
+def cache_inputs(input_path: Path, start: float | None = None, end: float | None = None) -> dict:
+    """Describe what a cache was made from: the recording (as found on disk) and its range."""
+    try:
+        stat = input_path.stat()
+        size, mtime = stat.st_size, stat.st_mtime
+    except OSError:
+        size = mtime = None
+    return {
+        "source_file": str(input_path.resolve()),
+        "size": size,
+        "mtime": mtime,
+        "start": start,
+        "end": end,
+    }
+
+
+def reset_cache(cache_dir: Path, inputs: dict) -> bool:
+    """Keep a cache made from the same inputs, else delete it and start a new one.
+
+    A cache from the same recording and range stays usable (e.g. by the
+    recluster command) until the new run replaces its files.
+
+    Returns:
+        Whether an existing cache was deleted.
+    """
+    path = cache_dir / INPUTS_FILE
+    if path.exists():
+        try:
+            if _read_json(path) == inputs:
+                return False
+        except (OSError, ValueError):
+            pass
+    cleared = cache_dir.exists()
+    if cleared:
+        shutil.rmtree(cache_dir)
+    _write_json(path, inputs)
+    return cleared
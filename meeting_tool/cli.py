@@ -1,13 +1,13 @@
 """Click CLI commands and options."""
 
 import shutil
+import sqlite3
 from pathlib import Path
 
 import click
-import torch
 
 from .config import get_huggingface_token
-from .pipeline import process_meeting
+from .search_index import SearchIndex, default_index_path, parse_timestamp
 from .speaker_mapping import (
     find_speaker_labels,
     parse_speaker_string,
@@ -15,6 +15,40 @@ from .speaker_mapping import (
 )
 
 
+def _detect_device() -> str:
+    """Pick cuda if available, else cpu.
+
+    torch is imported here rather than at module level so that lightweight
+    commands (--help, rename) start without loading it.
+    """
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _parse_time_option(ctx, param, value):
+    """Click callback turning HH:MM:SS, MM:SS or seconds into seconds."""
+    if value is None:
+        return None
+    try:
+        return parse_timestamp(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def _stage_limits(isolate_stages, stage_memory, stage_timeout):
+    """StageLimits from the isolation options, or None to run stages in-process."""
+    if not (isolate_stages or stage_memory or stage_timeout):
+        return None
+    from .isolation import StageLimits
+    from .model_registry import parse_memory_size
+
+    try:
+        memory_bytes = parse_memory_size(stage_memory) if stage_memory else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--stage-memory")
+    return StageLimits(memory_bytes=memory_bytes, timeout=stage_timeout)
+
+
 @click.group()
 def cli():
     """Meeting Documentation Tool - Convert Zoom recordings to formatted meeting minutes."""
@@ -64,8 +98,169 @@ def cli():
     default=None,
     help="Device for model inference (default: auto-detect)",
 )
+@click.option(
+    "--transcribe-mode",
+    type=click.Choice(["sequential", "batched", "turns"]),
+    default="sequential",
+    show_default=True,
+    help="Whisper inference mode (batched is much faster on long recordings; "
+         "turns transcribes only the speaker turns found by diarization)",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Number of audio chunks per Whisper batch (batched and turns modes)",
+)
+@click.option(
+    "--compute-type",
+    default=None,
+    help="CTranslate2 compute type, e.g. int8, int8_float16, float16, float32 "
+         "(default: float16 on CUDA, int8 on CPU)",
+)
+@click.option(
+    "--cpu-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    help="CPU threads for Whisper inference (default: taken from the core budget)",
+)
+@click.option(
+    "--cpus",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="MEETING_TOOL_CPUS",
+    help="Core budget shared by torch, Whisper and ffmpeg "
+         "(env: MEETING_TOOL_CPUS, default: all CPUs)",
+)
+@click.option(
+    "--jobs-per-host",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="MEETING_TOOL_JOBS",
+    help="Number of jobs sharing the core budget on this host "
+         "(env: MEETING_TOOL_JOBS, default: 1)",
+)
+@click.option(
+    "--diarization-window",
+    type=click.FloatRange(min=60),
+    default=None,
+    help="Diarize long recordings in windows of this many seconds, e.g. 1800 "
+         "(default: whole file at once)",
+)
+@click.option(
+    "--diarization-overlap",
+    type=click.FloatRange(min=0),
+    default=60.0,
+    show_default=True,
+    help="Overlap between diarization windows in seconds",
+)
+@click.option(
+    "--diarization-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of diarization windows processed in parallel",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Don't keep intermediate results (disables the recluster command)",
+)
+@click.option(
+    "--no-index",
+    is_flag=True,
+    default=False,
+    help="Don't add the meeting to the search index",
+)
+@click.option(
+    "--no-dedup",
+    is_flag=True,
+    default=False,
+    help="Process the recording even if the same audio was processed before",
+)
+@click.option(
+    "--deadline",
+    default=None,
+    callback=_parse_time_option,
+    help="Finish within this time (HH:MM:SS, MM:SS or seconds): picks the most "
+         "accurate Whisper model that fits, from the calibrate profile "
+         "(overrides --whisper-model)",
+)
+@click.option(
+    "--speed-profile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    envvar="MEETING_TOOL_SPEED_PROFILE",
+    help="Speed profile used with --deadline (env: MEETING_TOOL_SPEED_PROFILE, "
+         "default: ~/.meeting_tool/speed_profile.json)",
+)
+@click.option(
+    "--draft-model",
+    default=None,
+    help="Progressive mode: write draft minutes with this fast model (e.g. base) "
+         "first, then replace them with the --whisper-model transcript",
+)
+@click.option(
+    "--selective",
+    is_flag=True,
+    default=False,
+    help="With --draft-model: re-transcribe only low-confidence regions with "
+         "--whisper-model and write the minutes once",
+)
+@click.option(
+    "--parallel-stages",
+    is_flag=True,
+    default=False,
+    help="Run diarization and transcription at the same time, splitting the cores "
+         "between them (not in turns mode)",
+)
+@click.option(
+    "--only",
+    type=click.Choice(["minutes", "prompt"]),
+    default="minutes",
+    show_default=True,
+    help="Stop after this output: 'prompt' writes only the .prompt.txt file",
+)
+@click.option(
+    "--isolate-stages",
+    is_flag=True,
+    default=False,
+    help="Run decoding, diarization and transcription each in a supervised child process",
+)
+@click.option(
+    "--stage-memory",
+    default=None,
+    help="Stop an isolated stage whose memory use (RSS) exceeds this, e.g. 8GB "
+         "(implies --isolate-stages; Linux only)",
+)
+@click.option(
+    "--stage-timeout",
+    default=None,
+    callback=_parse_time_option,
+    help="Stop an isolated stage running longer than this (HH:MM:SS, MM:SS or "
+         "seconds; implies --isolate-stages)",
+)
+@click.option(
+    "--start",
+    default=None,
+    callback=_parse_time_option,
+    help="Process the recording from this time on (HH:MM:SS, MM:SS or seconds); "
+         "the part before it is never decoded",
+)
+@click.option(
+    "--end",
+    default=None,
+    callback=_parse_time_option,
+    help="Process the recording up to this time (HH:MM:SS, MM:SS or seconds)",
+)
 def process(input_file, output, speakers, num_speakers, whisper_model,
-            summary, no_interactive, device):
+            summary, no_interactive, device, transcribe_mode, batch_size,
+            compute_type, cpu_threads, cpus, jobs_per_host, diarization_window,
+            diarization_overlap, diarization_workers, no_cache, no_index, no_dedup,
+            deadline, speed_profile, draft_model, selective, parallel_stages, only,
+            isolate_stages, stage_memory, stage_timeout, start, end):
     """Process a Zoom recording into meeting minutes.
 
     INPUT_FILE is the path to the recording (.m4a, .mp4, or other audio format).
@@ -74,8 +269,16 @@ def process(input_file, output, speakers, num_speakers, whisper_model,
     it into any LLM (ChatGPT, Claude, Gemini, etc.) for summarization.
     Use --summary to auto-summarize via the Claude API instead.
     """
+    from .audio import validate_range
+    from .pipeline import process_meeting
+
+    isolation = _stage_limits(isolate_stages, stage_memory, stage_timeout)
+    try:
+        validate_range(start, end)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint=["--start", "--end"])
     if device is None:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
+        device = _detect_device()
         click.echo(f"Using device: {device}")
 
     try:
@@ -88,11 +291,382 @@ def process(input_file, output, speakers, num_speakers, whisper_model,
             summary=summary,
             no_interactive=no_interactive,
             device=device,
+            transcribe_mode=transcribe_mode,
+            batch_size=batch_size,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            cpus=cpus,
+            jobs_per_host=jobs_per_host,
+            diarization_window=diarization_window,
+            diarization_overlap=diarization_overlap,
+            diarization_workers=diarization_workers,
+            cache=not no_cache,
+            index=not no_index,
+            dedup=not no_dedup,
+            deadline=deadline,
+            speed_profile=speed_profile,
+            draft_model=draft_model,
+            selective=selective,
+            parallel_stages=parallel_stages,
+            only=only,
+            isolation=isolation,
+            start=start,
+            end=end,
         )
     except Exception as e:
         raise click.ClickException(str(e))
 
 
+@cli.command("process-tracks")
+@click.argument("sources", nargs=-1, required=True,
+                type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-o", "--output",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Output file path (default: <folder>.md next to the tracks' folder)",
+)
+@click.option(
+    "-s", "--speakers",
+    default=None,
+    help='Override names taken from the file names: "SPEAKER_00=Alice,SPEAKER_01=Bob"',
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=2,
+    show_default=True,
+    help="Tracks transcribed at the same time, each worker with its own Whisper model",
+)
+@click.option("--whisper-model", default="small", show_default=True,
+              help="Whisper model size (tiny, base, small, medium, large-v3)")
+@click.option("--transcribe-mode", type=click.Choice(["sequential", "batched"]),
+              default="sequential", show_default=True, help="Whisper inference mode")
+@click.option("--batch-size", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Number of audio chunks per Whisper batch (batched mode only)")
+@click.option("--compute-type", default=None,
+              help="CTranslate2 compute type (default: float16 on CUDA, int8 on CPU)")
+@click.option("--cpus", type=click.IntRange(min=1), default=None, envvar="MEETING_TOOL_CPUS",
+              help="Core budget split between the workers (env: MEETING_TOOL_CPUS)")
+@click.option("--summary", is_flag=True, default=False,
+              help="Use Claude API for automatic summarization (requires ANTHROPIC_API_KEY)")
+@click.option("--no-index", is_flag=True, default=False,
+              help="Don't add the meeting to the search index")
+@click.option("--device", type=click.Choice(["cpu", "cuda"]), default=None,
+              help="Device for model inference (default: auto-detect)")
+def process_tracks(sources, output, speakers, workers, whisper_model, transcribe_mode,
+                   batch_size, compute_type, cpus, summary, no_index, device):
+    """Process a meeting recorded as one audio file per participant.
+
+    SOURCES are the per-participant files, or the folder that holds them
+    (Zoom: "Audio Record" inside the meeting folder). Each file is one
+    speaker, so diarization is skipped; tracks are transcribed in parallel.
+    """
+    from .multitrack import collect_tracks
+    from .pipeline import process_tracks as run_process_tracks
+
+    tracks = collect_tracks(list(sources))
+    if not tracks:
+        raise click.ClickException("No audio tracks found")
+    if output is None:
+        first = sources[0]
+        output = first.with_suffix(".md") if first.is_dir() else first.parent.with_suffix(".md")
+
+    if device is None:
+        device = _detect_device()
+        click.echo(f"Using device: {device}")
+
+    try:
+        run_process_tracks(
+            tracks,
+            output,
+            speakers=speakers,
+            whisper_model=whisper_model,
+            summary=summary,
+            device=device,
+            transcribe_mode=transcribe_mode,
+            batch_size=batch_size,
+            compute_type=compute_type,
+            cpus=cpus,
+            workers=workers,
+            index=not no_index,
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command("process-batch")
+@click.argument("source")
+@click.option(
+    "-o", "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for the .md files (default: next to each recording)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes, each keeping its models loaded",
+)
+@click.option(
+    "--pipeline", is_flag=True, default=False,
+    help="Overlap decoding, diarization and transcription of consecutive recordings "
+         "in one process instead of using worker processes",
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Recordings that may wait between two stages (--pipeline only)",
+)
+@click.option("--recursive", is_flag=True, default=False,
+              help="Search subdirectories when SOURCE is a directory")
+@click.option("--force", is_flag=True, default=False,
+              help="Re-process recordings whose output is already up to date")
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Path of the JSON summary report (default: batch_report.json in the output or source directory)",
+)
+@click.option("--num-speakers", type=int, default=None,
+              help="Expected number of speakers in every recording")
+@click.option("--whisper-model", default="small", show_default=True,
+              help="Whisper model size (tiny, base, small, medium, large-v3)")
+@click.option("--transcribe-mode", type=click.Choice(["sequential", "batched", "turns"]),
+              default="sequential", show_default=True, help="Whisper inference mode")
+@click.option("--batch-size", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Number of audio chunks per Whisper batch (batched and turns modes)")
+@click.option("--compute-type", default=None,
+              help="CTranslate2 compute type (default: float16 on CUDA, int8 on CPU)")
+@click.option("--cpus", type=click.IntRange(min=1), default=None, envvar="MEETING_TOOL_CPUS",
+              help="Core budget split between the workers (env: MEETING_TOOL_CPUS)")
+@click.option("--summary", is_flag=True, default=False,
+              help="Use Claude API for automatic summarization (requires ANTHROPIC_API_KEY)")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Don't keep intermediate results (disables the recluster command)")
+@click.option("--no-index", is_flag=True, default=False,
+              help="Don't add the meetings to the search index")
+@click.option("--no-dedup", is_flag=True, default=False,
+              help="Process recordings even if the same audio was processed before")
+@click.option("--device", type=click.Choice(["cpu", "cuda"]), default=None,
+              help="Device for model inference (default: auto-detect)")
+@click.option("--isolate-stages", is_flag=True, default=False,
+              help="Run decoding, diarization and transcription each in a supervised child process")
+@click.option("--stage-memory", default=None,
+              help="Fail a recording whose isolated stage uses more memory (RSS) than this, "
+                   "e.g. 8GB (implies --isolate-stages; Linux only)")
+@click.option("--stage-timeout", default=None, callback=_parse_time_option,
+              help="Fail a recording whose isolated stage runs longer than this "
+                   "(HH:MM:SS, MM:SS or seconds; implies --isolate-stages)")
+def process_batch(source, output_dir, workers, pipeline, queue_size, recursive, force, report, num_speakers,
+                  whisper_model, transcribe_mode, batch_size, compute_type, cpus,
+                  summary, no_cache, no_index, no_dedup, device,
+                  isolate_stages, stage_memory, stage_timeout):
+    """Process many recordings with a pool of workers.
+
+    SOURCE is a directory or a quoted glob pattern, e.g. "zoom/**/*.m4a".
+
+    With --pipeline, recording N+1 is decoded while recording N is diarized
+    and recording N-1 is transcribed, so the models and the decoder are
+    busy at the same time.
+
+    Recordings whose .md output is newer than the recording are skipped.
+    Speakers are never prompted for; use rename afterwards. A JSON report
+    with per-file processing time and errors is written at the end.
+    """
+    from .batch import (
+        DEFAULT_REPORT_NAME,
+        FAILED,
+        collect_inputs,
+        plan_batch,
+        run_batch,
+        run_pipelined,
+        write_report,
+    )
+
+    if pipeline and workers > 1:
+        raise click.UsageError("--pipeline runs in a single process; drop --workers")
+    isolation = _stage_limits(isolate_stages, stage_memory, stage_timeout)
+
+    inputs = collect_inputs(source, recursive=recursive)
+    if not inputs:
+        raise click.ClickException(f"No recordings found for: {source}")
+
+    todo, skipped = plan_batch(inputs, output_dir, force=force)
+    click.echo(f"Found {len(inputs)} recordings: {len(todo)} to process, "
+               f"{len(skipped)} up to date or duplicate")
+
+    if device is None:
+        device = _detect_device()
+        click.echo(f"Using device: {device}")
+
+    options = {
+        "num_speakers": num_speakers,
+        "whisper_model": whisper_model,
+        "transcribe_mode": transcribe_mode,
+        "batch_size": batch_size,
+        "compute_type": compute_type,
+        "cpus": cpus,
+        "summary": summary,
+        "cache": not no_cache,
+        "index": not no_index,
+        "dedup": not no_dedup,
+        "device": device,
+        "isolation": isolation,
+    }
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    if pipeline:
+        results = skipped + run_pipelined(todo, options, queue_size=queue_size)
+    else:
+        results = skipped + run_batch(todo, options, workers=workers)
+
+    if report is None:
+        source_dir = Path(source).expanduser()
+        report_dir = output_dir or (source_dir if source_dir.is_dir() else Path.cwd())
+        report = report_dir / DEFAULT_REPORT_NAME
+    write_report(results, report)
+    failed = [r for r in results if r.status == FAILED]
+    click.echo(f"\nBatch complete: {len(results) - len(skipped) - len(failed)} processed, "
+               f"{len(skipped)} skipped, {len(failed)} failed")
+    click.echo(f"  Report saved to: {report}")
+    if failed:
+        raise click.ClickException(f"{len(failed)} recording(s) failed, see {report}")
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "-o", "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for the .md files (default: next to each recording)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Recordings processed at the same time, each worker keeping its models loaded",
+)
+@click.option(
+    "--settle",
+    "settle_seconds",
+    type=click.FloatRange(min=0),
+    default=30.0,
+    show_default=True,
+    help="Seconds a file must stay unchanged before it is processed",
+)
+@click.option(
+    "--poll-interval",
+    "poll_seconds",
+    type=click.FloatRange(min=0.1),
+    default=5.0,
+    show_default=True,
+    help="Seconds between scans of the directory",
+)
+@click.option(
+    "--extensions",
+    default=".m4a,.mp4",
+    show_default=True,
+    help="Comma-separated file extensions to pick up",
+)
+@click.option(
+    "--state-db",
+    "state_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Database of handled files (default: ~/.meeting_tool/watch.db)",
+)
+@click.option("--num-speakers", type=int, default=None,
+              help="Expected number of speakers in every recording")
+@click.option("--whisper-model", default="small", show_default=True,
+              help="Whisper model size (tiny, base, small, medium, large-v3)")
+@click.option("--transcribe-mode", type=click.Choice(["sequential", "batched", "turns"]),
+              default="sequential", show_default=True, help="Whisper inference mode")
+@click.option("--batch-size", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Number of audio chunks per Whisper batch (batched and turns modes)")
+@click.option("--compute-type", default=None,
+              help="CTranslate2 compute type (default: float16 on CUDA, int8 on CPU)")
+@click.option("--cpus", type=click.IntRange(min=1), default=None, envvar="MEETING_TOOL_CPUS",
+              help="Core budget split between the workers (env: MEETING_TOOL_CPUS)")
+@click.option("--summary", is_flag=True, default=False,
+              help="Use Claude API for automatic summarization (requires ANTHROPIC_API_KEY)")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Don't keep intermediate results (disables the recluster command)")
+@click.option("--no-index", is_flag=True, default=False,
+              help="Don't add the meetings to the search index")
+@click.option("--no-dedup", is_flag=True, default=False,
+              help="Process recordings even if the same audio was processed before")
+@click.option("--device", type=click.Choice(["cpu", "cuda"]), default=None,
+              help="Device for model inference (default: auto-detect)")
+@click.option("--isolate-stages", is_flag=True, default=False,
+              help="Run decoding, diarization and transcription each in a supervised child process")
+@click.option("--stage-memory", default=None,
+              help="Fail a recording whose isolated stage uses more memory (RSS) than this, "
+                   "e.g. 8GB (implies --isolate-stages; Linux only)")
+@click.option("--stage-timeout", default=None, callback=_parse_time_option,
+              help="Fail a recording whose isolated stage runs longer than this "
+                   "(HH:MM:SS, MM:SS or seconds; implies --isolate-stages)")
+def watch(directory, output_dir, workers, settle_seconds, poll_seconds, extensions,
+          state_path, num_speakers, whisper_model, transcribe_mode, batch_size,
+          compute_type, cpus, summary, no_cache, no_index, no_dedup, device,
+          isolate_stages, stage_memory, stage_timeout):
+    """Watch a folder and process new recordings as they appear.
+
+    Point it at Zoom's local recording folder (e.g. ~/Documents/Zoom). Files
+    are processed once they have stopped changing. Handled files are
+    remembered across restarts, and copies of an already processed
+    recording are skipped. Press Ctrl+C to stop.
+    """
+    from .watcher import DEFAULT_STATE_PATH, watch as watch_folder
+
+    extension_list = tuple(
+        ext if ext.startswith(".") else f".{ext}"
+        for ext in (e.strip().lower() for e in extensions.split(","))
+        if ext
+    )
+    if not extension_list:
+        raise click.UsageError("--extensions must list at least one extension")
+    isolation = _stage_limits(isolate_stages, stage_memory, stage_timeout)
+
+    if device is None:
+        device = _detect_device()
+        click.echo(f"Using device: {device}")
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        "num_speakers": num_speakers,
+        "whisper_model": whisper_model,
+        "transcribe_mode": transcribe_mode,
+        "batch_size": batch_size,
+        "compute_type": compute_type,
+        "cpus": cpus,
+        "summary": summary,
+        "cache": not no_cache,
+        "index": not no_index,
+        "dedup": not no_dedup,
+        "device": device,
+        "isolation": isolation,
+    }
+    watch_folder(
+        directory.resolve(),
+        options,
+        state_path=state_path or DEFAULT_STATE_PATH,
+        output_dir=output_dir,
+        workers=workers,
+        extensions=extension_list,
+        settle_seconds=settle_seconds,
+        poll_seconds=poll_seconds,
+    )
+
+
 @cli.command()
 @click.argument("markdown_file", type=click.Path(exists=True, path_type=Path))
 @click.option(
@@ -131,6 +705,20 @@ def rename(markdown_file, speakers):
     for label, name in speaker_map.items():
         click.echo(f"  {label} -> {name}")
 
+    # Without an index there is nothing to update, and none is created
+    index_path = default_index_path()
+    if index_path.exists():
+        try:
+            if SearchIndex(index_path).rename_speakers(markdown_file, speaker_map):
+                click.echo("  Also updated the search index")
+        except (sqlite3.Error, OSError) as e:
+            click.echo(f"  Warning: could not update the search index: {e}")
+
+    from .archive import archive_path_for, rename_archive_speakers
+    archive_path = archive_path_for(markdown_file)
+    if rename_archive_speakers(archive_path, speaker_map):
+        click.echo(f"  Also updated {archive_path.name}")
+
     # Also update the sibling .prompt.txt if it exists
     prompt_file = markdown_file.with_suffix(".prompt.txt")
     if prompt_file.exists():
@@ -140,6 +728,329 @@ def rename(markdown_file, speakers):
         click.echo(f"  Also updated {prompt_file.name}")
 
 
+@cli.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option("--speaker", default=None, help="Only utterances by this speaker (name or SPEAKER_XX label)")
+@click.option("--since", type=click.DateTime(["%Y-%m-%d"]), default=None,
+              help="Only meetings on or after this date (YYYY-MM-DD)")
+@click.option("--until", type=click.DateTime(["%Y-%m-%d"]), default=None,
+              help="Only meetings on or before this date (YYYY-MM-DD)")
+@click.option("--from", "from_time", default=None, callback=_parse_time_option,
+              help="Only the part of each meeting after this time (HH:MM:SS)")
+@click.option("--to", "to_time", default=None, callback=_parse_time_option,
+              help="Only the part of each meeting before this time (HH:MM:SS)")
+@click.option("--limit", type=click.IntRange(min=1), default=20, show_default=True,
+              help="Maximum number of results")
+@click.option("--index", "index_path", type=click.Path(dir_okay=False, path_type=Path),
+              default=None, envvar="MEETING_TOOL_INDEX",
+              help="Search index file (env: MEETING_TOOL_INDEX, default: ~/.meeting_tool/search.db)")
+def search(query, speaker, since, until, from_time, to_time, limit, index_path):
+    """Search the transcripts of all processed meetings.
+
+    QUERY is one or more words that must all appear in an utterance.
+    Use quotes for exact phrases, e.g. '"new API framework"', OR between
+    alternatives and a trailing * for prefixes (decid*).
+    """
+    from .output_formatter import format_timestamp
+
+    index = SearchIndex(index_path)
+    try:
+        hits = index.search(
+            " ".join(query),
+            speaker=speaker,
+            since=since.date() if since else None,
+            until=until.date() if until else None,
+            start=from_time,
+            end=to_time,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if not hits:
+        stats = index.stats()
+        click.echo(f"No matches in {stats['meetings']} indexed meetings.")
+        return
+
+    for hit in hits:
+        click.echo(f"\n{hit.minutes_path}")
+        click.echo(f"  {hit.meeting_date}  {format_timestamp(hit.start)}  {hit.speaker_name}")
+        click.echo(f"  {hit.snippet}")
+
+
+@cli.command()
+@click.argument("markdown_file", type=click.Path(path_type=Path))
+@click.option("--from", "from_time", default=None, callback=_parse_time_option,
+              help="Start of the part to show (HH:MM:SS)")
+@click.option("--to", "to_time", default=None, callback=_parse_time_option,
+              help="End of the part to show (HH:MM:SS)")
+@click.option("--words", is_flag=True, default=False,
+              help="Show word timestamps and probabilities instead of utterances")
+def show(markdown_file, from_time, to_time, words):
+    """Print the transcript of a processed meeting, or part of it.
+
+    MARKDOWN_FILE is the path to the .md file generated by the process
+    command. The transcript is read from the .transcript.bin archive next
+    to it, and only the blocks covering --from/--to are decompressed.
+    """
+    from .archive import MeetingArchive, archive_path_for
+    from .output_formatter import format_timestamp
+
+    archive_path = archive_path_for(markdown_file)
+    if not archive_path.exists():
+        raise click.ClickException(
+            f"No transcript archive found at {archive_path}\n"
+            "Run the process command again to create it."
+        )
+    try:
+        archive = MeetingArchive(archive_path)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if words:
+        for word in archive.words(from_time, to_time):
+            click.echo(f"{format_timestamp(word.start)}  {word.probability:.2f}  {word.text}")
+        return
+    for utterance in archive.utterances(from_time, to_time):
+        click.echo(f"\n**{utterance.speaker_name}** ({format_timestamp(utterance.start)}):")
+        click.echo(utterance.text)
+
+
+@cli.command()
+@click.argument("markdown_file", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--num-speakers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Expected number of speakers",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=None,
+    help="Clustering distance threshold (lower finds more speakers, pyannote default: 0.7045)",
+)
+@click.option(
+    "-s", "--speakers",
+    default=None,
+    help='Speaker mapping for the new labels: "SPEAKER_00=Alice,SPEAKER_01=Bob"',
+)
+@click.option(
+    "--device",
+    type=click.Choice(["cpu", "cuda"]),
+    default=None,
+    help="Device for model inference (default: auto-detect)",
+)
+def recluster(markdown_file, num_speakers, threshold, speakers, device):
+    """Re-assign speakers in processed minutes without re-running inference.
+
+    MARKDOWN_FILE is the path to the .md file generated by the process command.
+
+    Re-runs only the speaker clustering step from the cached embeddings and
+    re-aligns the cached transcript, so fixing a wrong speaker count takes
+    seconds instead of a full re-run. The .prompt.txt file is updated too.
+    """
+    if num_speakers is None and threshold is None:
+        raise click.UsageError("Give --num-speakers and/or --threshold.")
+
+    from .pipeline import recluster_meeting
+
+    if device is None:
+        device = _detect_device()
+
+    try:
+        recluster_meeting(
+            markdown_path=markdown_file,
+            num_speakers=num_speakers,
+            threshold=threshold,
+            speakers=speakers,
+            device=device,
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to listen on")
+@click.option("--port", type=int, default=8765, show_default=True, help="TCP port to listen on")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Listen on this Unix socket instead of TCP",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes, each holding its own warm models",
+)
+@click.option(
+    "--db",
+    "db_path",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="SQLite job database (default: ~/.meeting_tool/jobs.db)",
+)
+@click.option(
+    "--whisper-model",
+    default="small",
+    show_default=True,
+    help="Whisper model size kept warm in each worker",
+)
+@click.option(
+    "--transcribe-mode",
+    type=click.Choice(["sequential", "batched", "turns"]),
+    default="sequential",
+    show_default=True,
+    help="Default Whisper inference mode for jobs",
+)
+@click.option(
+    "--compute-type",
+    default=None,
+    help="CTranslate2 compute type (default: float16 on CUDA, int8 on CPU)",
+)
+@click.option(
+    "--cpus",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="MEETING_TOOL_CPUS",
+    help="Core budget split between the workers (env: MEETING_TOOL_CPUS, default: all CPUs)",
+)
+@click.option(
+    "--device",
+    type=click.Choice(["cpu", "cuda"]),
+    default=None,
+    help="Device for model inference (default: auto-detect)",
+)
+@click.option(
+    "--model-memory",
+    default=None,
+    envvar="MEETING_TOOL_MODEL_MEMORY",
+    help="Memory budget for loaded models per worker, e.g. 6GB; least recently "
+         "used models are unloaded beyond it (env: MEETING_TOOL_MODEL_MEMORY)",
+)
+def serve(host, port, socket_path, workers, db_path, whisper_model,
+          transcribe_mode, compute_type, cpus, device, model_memory):
+    """Run a job server with warm models.
+
+    Worker processes load the diarization and Whisper models once and then
+    process queued jobs without reloading them. Jobs are submitted over a
+    local HTTP API and kept in SQLite, so they survive a restart.
+
+    \b
+    Submit a job:
+      curl -X POST http://127.0.0.1:8765/jobs \\
+           -d '{"input_path": "meeting.m4a", "options": {"num_speakers": 3}}'
+    Check progress:
+      curl http://127.0.0.1:8765/jobs/1
+      curl http://127.0.0.1:8765/stats
+    """
+    from .model_registry import parse_memory_size
+    from .server import DEFAULT_DB_PATH, WorkerConfig
+    from .server import serve as run_server
+
+    try:
+        model_memory = parse_memory_size(model_memory) if model_memory else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--model-memory")
+
+    if device is None:
+        device = _detect_device()
+        click.echo(f"Using device: {device}")
+
+    config = WorkerConfig(
+        db_path=db_path or DEFAULT_DB_PATH,
+        device=device,
+        whisper_model=whisper_model,
+        compute_type=compute_type,
+        transcribe_mode=transcribe_mode,
+        cpus=cpus,
+        workers=workers,
+        model_memory=model_memory,
+    )
+    try:
+        run_server(config, host=host, port=port, socket_path=socket_path)
+    except FileExistsError as e:
+        raise click.BadParameter(str(e), param_hint="--socket")
+
+
+@cli.command()
+@click.argument("sample", required=False, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--models", default="tiny,base,small,medium,large-v3", show_default=True,
+              help="Comma-separated Whisper model sizes to measure")
+@click.option("--compute-types", default=None,
+              help="Comma-separated CTranslate2 compute types to measure "
+                   "(default: float16 on CUDA, int8 on CPU)")
+@click.option("--transcribe-mode", type=click.Choice(["sequential", "batched", "turns"]),
+              default="sequential", show_default=True,
+              help="Whisper inference mode to measure (turns mode diarizes the sample first)")
+@click.option("--batch-size", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Number of audio chunks per Whisper batch (batched mode only)")
+@click.option("--cpus", type=click.IntRange(min=1), default=None, envvar="MEETING_TOOL_CPUS",
+              help="Core budget, as used by process (env: MEETING_TOOL_CPUS, default: all CPUs)")
+@click.option("--no-diarization", is_flag=True, default=False,
+              help="Don't measure diarization (deadlines then only account for Whisper)")
+@click.option("--profile", "profile_path", type=click.Path(dir_okay=False, path_type=Path),
+              default=None, envvar="MEETING_TOOL_SPEED_PROFILE",
+              help="Speed profile file (env: MEETING_TOOL_SPEED_PROFILE, "
+                   "default: ~/.meeting_tool/speed_profile.json)")
+@click.option("--device", type=click.Choice(["cpu", "cuda"]), default=None,
+              help="Device for model inference (default: auto-detect)")
+def calibrate(sample, models, compute_types, transcribe_mode, batch_size, cpus,
+              no_diarization, profile_path, device):
+    """Measure how fast each Whisper model runs on this host.
+
+    SAMPLE is a recording to time the models on (default: the bundled
+    audio/testaudio/audio1.m4a). The real-time factors are stored in a
+    speed profile that process --deadline uses to pick a model.
+    """
+    from .speed_profile import SpeedProfile
+    from .speed_profile import calibrate as run_calibration
+    from .transcription import default_compute_type
+
+    if sample is None:
+        sample = Path(__file__).resolve().parent.parent / "audio" / "testaudio" / "audio1.m4a"
+        if not sample.exists():
+            raise click.ClickException("No SAMPLE given and the bundled test recording is missing")
+
+    if device is None:
+        device = _detect_device()
+        click.echo(f"Using device: {device}")
+
+    model_list = [m.strip() for m in models.split(",") if m.strip()]
+    if compute_types:
+        type_list = [c.strip() for c in compute_types.split(",") if c.strip()]
+    else:
+        type_list = [default_compute_type(device)]
+
+    try:
+        profile = run_calibration(
+            sample,
+            model_list,
+            type_list,
+            device=device,
+            transcribe_mode=transcribe_mode,
+            batch_size=batch_size,
+            cpus=cpus,
+            diarization=not no_diarization,
+            profile=SpeedProfile(profile_path),
+        )
+        profile.save()
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+    click.echo("\n| Model | Compute type | RTF | 1h of audio |")
+    click.echo("|-------|--------------|-----|-------------|")
+    for m in sorted(profile.measurements, key=lambda m: m.rtf):
+        if m.device == device and m.transcribe_mode in (transcribe_mode, None):
+            click.echo(f"| {m.model} | {m.compute_type or '-'} | {m.rtf:.3f} | "
+                       f"{m.rtf * 60:.1f} min |")
+    click.echo(f"\nSpeed profile saved to: {profile.path}")
+
+
 @cli.command("check-setup")
 def check_setup():
     """Verify that all dependencies and configuration are in place."""
@@ -153,8 +1064,17 @@ def check_setup():
         click.echo("NOT FOUND - install ffmpeg and add to PATH")
         all_ok = False
 
+    # Check ffprobe (ships with ffmpeg; used to read media headers)
+    click.echo("Checking ffprobe... ", nl=False)
+    if shutil.which("ffprobe"):
+        click.echo("OK")
+    else:
+        click.echo("NOT FOUND - install the full ffmpeg package, which includes ffprobe")
+        all_ok = False
+
     # Check CUDA
     click.echo("Checking CUDA... ", nl=False)
+    import torch
     if torch.cuda.is_available():
         click.echo(f"OK ({torch.cuda.get_device_name(0)})")
     else:
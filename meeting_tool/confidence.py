@@ -0,0 +1,121 @@
+"""Find low-confidence regions of a transcript and splice in better transcriptions.
+
+In selective mode a fast model transcribes the whole recording, and only
+the segments it was unsure about are transcribed again with the accurate
+model. Whisper's segment log probability, word probabilities and
+no-speech probability decide which segments need a second look.
+"""
+
+from .models import TranscriptionSegment
+
+# Segments whose average token log probability is below this are re-transcribed
+LOW_AVG_LOGPROB = -0.7
+
+# ... as are segments whose words have a lower mean probability than this
+LOW_WORD_PROBABILITY = 0.6
+
+# ... and segments Whisper thinks are more likely silence or noise than speech
+# (faster-whisper's own no_speech_threshold)
+HIGH_NO_SPEECH_PROB = 0.6
+
+# Low-confidence segments closer than this are re-transcribed as one span
+SPAN_JOIN_GAP_SECONDS = 1.0
+
+# Whisper decodes at most 30 seconds of audio per window
+MAX_SPAN_SECONDS = 30.0
+
+
+def is_low_confidence(
+    segment: TranscriptionSegment,
+    min_avg_logprob: float = LOW_AVG_LOGPROB,
+    min_word_probability: float = LOW_WORD_PROBABILITY,
+    max_no_speech_prob: float = HIGH_NO_SPEECH_PROB,
+) -> bool:
+    """True if Whisper was unsure about the segment, or that it is speech at all."""
+    if segment.avg_logprob < min_avg_logprob:
+        return True
+    if segment.no_speech_prob > max_no_speech_prob:
+        return True
+    if segment.words:
+        mean = sum(w.probability for w in segment.words) / len(segment.words)
+        return mean < min_word_probability
+    return False
+
+
+def find_low_confidence_spans(
+    segments: list[TranscriptionSegment],
+    min_avg_logprob: float = LOW_AVG_LOGPROB,
+    min_word_probability: float = LOW_WORD_PROBABILITY,
+    max_no_speech_prob: float = HIGH_NO_SPEECH_PROB,
+    join_gap: float = SPAN_JOIN_GAP_SECONDS,
+    max_length: float = MAX_SPAN_SECONDS,
+) -> list[tuple[float, float]]:
+    """Time spans covering the low-confidence segments.
+
+    Spans follow segment boundaries, so a span never cuts into a segment
+    that is kept. Neighbouring low-confidence segments are joined while the
+    span stays within one Whisper window.
+
+    Returns:
+        (start, end) spans in seconds, sorted by start.
+    """
+    spans: list[tuple[float, float]] = []
+    for seg in sorted(segments, key=lambda s: s.start):
+        if not is_low_confidence(seg, min_avg_logprob, min_word_probability, max_no_speech_prob):
+            continue
+        if spans:
+            start, end = spans[-1]
+            if seg.start - end < join_gap and seg.end - start <= max_length:
+                spans[-1] = (start, max(end, seg.end))
+                continue
+        spans.append((seg.start, seg.end))
+    return spans
+
+
+def _in_spans(time: float, spans: list[tuple[float, float]]) -> bool:
+    """True if time falls inside one of the spans."""
+    return any(start <= time <= end for start, end in spans)
+
+
+def splice_segments(
+    draft: list[TranscriptionSegment],
+    spans: list[tuple[float, float]],
+    refined: list[TranscriptionSegment],
+) -> list[TranscriptionSegment]:
+    """Replace the draft segments inside spans with the refined transcription.
+
+    A draft segment is replaced if its midpoint lies in a span. Refined
+    words are kept by the same rule, so words the accurate model placed
+    outside the spans cannot duplicate the kept draft segments.
+
+    Args:
+        draft: Transcript of the whole recording from the fast model.
+        spans: Spans that were re-transcribed (see find_low_confidence_spans).
+        refined: Transcript of the spans from the accurate model.
+
+    Returns:
+        The merged transcript, sorted by start time.
+    """
+    kept = [seg for seg in draft if not _in_spans((seg.start + seg.end) / 2, spans)]
+
+    for seg in refined:
+        if not seg.words:
+            if _in_spans((seg.start + seg.end) / 2, spans):
+                kept.append(seg)
+            continue
+        words = [w for w in seg.words if _in_spans((w.start + w.end) / 2, spans)]
+        if not words:
+            continue
+        if len(words) < len(seg.words):
+            seg = TranscriptionSegment(
+                start=words[0].start,
+                end=words[-1].end,
+                text=" ".join(w.text for w in words),
+                words=words,
+                avg_logprob=seg.avg_logprob,
+                no_speech_prob=seg.no_speech_prob,
+            )
+        kept.append(seg)
+
+    kept.sort(key=lambda s: s.start)
+    return kept
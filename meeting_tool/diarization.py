@@ -1,69 +1,457 @@
 """Speaker diarization using pyannote.audio."""
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
 import click
+import numpy as np
 import torch
-import torchaudio
 from pyannote.audio import Pipeline
+from pyannote.audio.utils.signal import binarize
+from pyannote.core import SlidingWindow, SlidingWindowFeature
 
+from .cache import (
+    DiarizationState,
+    WindowedDiarizationState,
+    save_diarization_state,
+    save_windowed_state,
+)
 from .config import get_huggingface_token
+from .model_registry import DIARIZATION_PIPELINE_BYTES, ModelKey, get_registry
 from .models import DiarizationSegment
+from .speaker_linking import (
+    LINK_SIMILARITY_THRESHOLD,
+    DiarizationWindow,
+    link_speakers,
+    plan_windows,
+    stitch_segments,
+)
+from .wav import PcmWav, SharedSamples, open_audio
 
+# Default overlap between windows in windowed mode
+DEFAULT_WINDOW_OVERLAP_SECONDS = 60.0
 
-def _load_audio(audio_path: Path) -> dict:
-    """Load audio with torchaudio and return a waveform dict.
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+
+def _load_audio(
+    wav: PcmWav | SharedSamples, start: float = 0.0, end: float | None = None
+) -> dict:
+    """Convert part of a memory-mapped WAV file into a pyannote waveform dict.
 
     This bypasses pyannote's built-in audio decoding (torchcodec),
-    which is broken on Windows.
+    which is broken on Windows. Only the samples between start and end
+    are converted to float32; SharedSamples are already float32 and are
+    used without a copy.
     """
-    waveform, sample_rate = torchaudio.load(str(audio_path))
-    return {"waveform": waveform, "sample_rate": sample_rate}
+    waveform = torch.from_numpy(wav.float_window(start, end)).unsqueeze(0)
+    return {"waveform": waveform, "sample_rate": wav.sample_rate}
+
+
+def _load_pipeline(device: str) -> Pipeline:
+    """Load the pyannote diarization pipeline onto a device."""
+    token = get_huggingface_token()
+    os.environ["HF_TOKEN"] = token
+
+    pipeline = Pipeline.from_pretrained(
+        DIARIZATION_MODEL,
+    )
+    pipeline.to(torch.device(device))
+    return pipeline
+
+
+def load_diarization_pipeline(
+    device: str = "cpu",
+    log: Callable[[str], None] = click.echo,
+) -> Pipeline:
+    """Load the diarization pipeline, reusing an already loaded one for the device."""
+    def load() -> Pipeline:
+        log("  Loading diarization model...")
+        return _load_pipeline(device)
+
+    key = ModelKey(name=DIARIZATION_MODEL, size=None, device=device)
+    return get_registry().get(key, load, DIARIZATION_PIPELINE_BYTES)
+
+
+def _annotation_to_segments(diarization) -> list[DiarizationSegment]:
+    """Convert a pyannote Annotation to DiarizationSegment objects."""
+    segments = []
+    for turn, _, speaker in diarization.itertracks(yield_label=True):
+        segments.append(DiarizationSegment(
+            start=turn.start,
+            end=turn.end,
+            speaker_label=speaker,
+        ))
+    return segments
+
+
+class _IntermediateCapture:
+    """pyannote pipeline hook that keeps the final artefact of each step.
+
+    Progress calls (with completed/total set) are not stored, so after the
+    pipeline returns, artefacts holds the full segmentation, speaker count
+    and embedding outputs. If progress is given, the batches completed in
+    the embeddings step (most of the diarization time) are reported to it
+    as the share of the audio's duration they cover.
+    """
+
+    def __init__(
+        self,
+        keep: bool = True,
+        progress: Callable[..., None] | None = None,
+        duration: float = 0.0,
+    ):
+        self.keep = keep
+        self.progress = progress
+        self.duration = duration
+        self.artefacts = {}
+
+    def __call__(self, step_name, step_artefact, file=None, total=None, completed=None):
+        if completed is None:
+            if self.keep and step_artefact is not None:
+                self.artefacts[step_name] = step_artefact
+        elif self.progress is not None and step_name == "embeddings" and total:
+            self.progress(self.duration * completed / total, self.duration)
+
+    def to_state(self) -> DiarizationState | None:
+        """Package the captured artefacts, or None if a step was missing."""
+        try:
+            segmentations = self.artefacts["segmentation"]
+            count = self.artefacts["speaker_counting"]
+            embeddings = self.artefacts["embeddings"]
+        except KeyError:
+            return None
+
+        def window(feature):
+            sw = feature.sliding_window
+            return (sw.start, sw.duration, sw.step)
+
+        return DiarizationState(
+            segmentations=np.asarray(segmentations.data, dtype=np.float32),
+            segmentation_window=window(segmentations),
+            count=np.asarray(count.data, dtype=np.int8),
+            count_window=window(count),
+            embeddings=np.asarray(embeddings, dtype=np.float32),
+        )
 
 
 def run_diarization(
-    audio_path: Path,
+    audio_path: Path | SharedSamples,
     num_speakers: int | None = None,
     device: str = "cpu",
+    num_threads: int | None = None,
+    window_seconds: float | None = None,
+    window_overlap: float = DEFAULT_WINDOW_OVERLAP_SECONDS,
+    window_workers: int = 1,
+    state_dir: Path | None = None,
+    progress: Callable[..., None] | None = None,
+    log: Callable[[str], None] = click.echo,
 ) -> list[DiarizationSegment]:
     """Run speaker diarization on an audio file.
 
+    If window_seconds is set and the recording is longer than one window,
+    diarization runs on fixed-length overlapping windows instead of the
+    whole file (see _run_windowed_diarization).
+
     Args:
-        audio_path: Path to the .wav audio file.
+        audio_path: Path to the mono 16-bit PCM .wav file written by prepare_audio,
+            or its SharedSamples.
         num_speakers: Expected number of speakers (optional hint).
         device: Device to run on ("cpu" or "cuda").
+        num_threads: Intra-op threads for torch on CPU (default: torch's own choice).
+        window_seconds: Window length for windowed diarization (default: off).
+        window_overlap: Overlap between consecutive windows in seconds.
+        window_workers: Number of windows diarized in parallel.
+        state_dir: If set, keep the segmentation and embedding outputs (in
+            windowed mode, each window's segments and speaker embeddings) in
+            this cache directory so recluster_diarization can reuse them.
+        progress: Called with the seconds of audio processed so far and the
+            audio duration, as progress(processed_seconds, total_seconds).
+        log: Receives the lines describing what is done (e.g. EventEmitter.message).
 
     Returns:
         List of DiarizationSegment sorted by start time.
     """
-    token = get_huggingface_token()
-    os.environ["HF_TOKEN"] = token
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
 
-    click.echo("  Loading diarization model...")
-    pipeline = Pipeline.from_pretrained(
-        "pyannote/speaker-diarization-3.1",
-    )
-    pipeline.to(torch.device(device))
+    pipeline = load_diarization_pipeline(device, log)
+
+    log("  Running speaker diarization...")
+    wav = open_audio(audio_path)
 
-    click.echo("  Running speaker diarization...")
-    audio = _load_audio(audio_path)
+    if window_seconds is not None and wav.duration > window_seconds:
+        segments = _run_windowed_diarization(
+            pipeline, wav, device, num_speakers,
+            window_seconds, window_overlap, window_workers, state_dir, progress, log,
+        )
+    else:
+        audio = _load_audio(wav)
+        kwargs = {}
+        if num_speakers is not None:
+            kwargs["num_speakers"] = num_speakers
+
+        capture = None
+        if state_dir is not None or progress is not None:
+            capture = _IntermediateCapture(state_dir is not None, progress, wav.duration)
+        diarization = pipeline(audio, hook=capture, **kwargs)
+        segments = _annotation_to_segments(diarization)
+
+        state = capture.to_state() if state_dir is not None else None
+        if state is not None:
+            save_diarization_state(state, state_dir)
+
+    segments.sort(key=lambda s: s.start)
+    log(f"  Diarization complete: {len(segments)} segments, "
+               f"{len(set(s.speaker_label for s in segments))} speakers detected")
+    return segments
+
+
+def _run_windowed_diarization(
+    pipeline: Pipeline,
+    wav: PcmWav | SharedSamples,
+    device: str,
+    num_speakers: int | None,
+    window_seconds: float,
+    window_overlap: float,
+    window_workers: int,
+    state_dir: Path | None = None,
+    progress: Callable[..., None] | None = None,
+    log: Callable[[str], None] = click.echo,
+) -> list[DiarizationSegment]:
+    """Diarize overlapping windows separately and link speakers across them.
+
+    Clustering cost grows super-linearly with the number of embeddings, so
+    running it per window keeps peak memory bounded by the window length and
+    total runtime linear in the recording length. Each window is converted
+    from the memory-mapped WAV file only when it is diarized, so the audio
+    of the whole recording is never held in memory either. Each window
+    returns its speaker centroids, which link_speakers matches into global
+    labels.
+    """
+    windows = plan_windows(wav.duration, window_seconds, window_overlap)
+    log(f"  Windowed diarization: {len(windows)} windows of "
+               f"{window_seconds:.0f}s ({window_overlap:.0f}s overlap)")
 
     kwargs = {}
     if num_speakers is not None:
-        kwargs["num_speakers"] = num_speakers
+        # A window may contain only some of the speakers
+        kwargs["max_speakers"] = num_speakers
 
-    diarization = pipeline(audio, **kwargs)
+    # pyannote pipelines are not thread-safe: the first worker thread takes
+    # the already loaded one, each other worker loads its own
+    local = threading.local()
+    spare = [pipeline]
+    spare_lock = threading.Lock()
 
-    segments = []
-    for turn, _, speaker in diarization.itertracks(yield_label=True):
-        segments.append(DiarizationSegment(
-            start=turn.start,
-            end=turn.end,
-            speaker_label=speaker,
-        ))
+    def diarize_window(index: int) -> tuple[list[DiarizationSegment], dict]:
+        if window_workers == 1:
+            window_pipeline = pipeline
+        else:
+            if not hasattr(local, "pipeline"):
+                with spare_lock:
+                    local.pipeline = spare.pop() if spare else None
+                if local.pipeline is None:
+                    local.pipeline = _load_pipeline(device)
+            window_pipeline = local.pipeline
+
+        window = windows[index]
+        window_audio = _load_audio(wav, window.start, window.end)
+        diarization, embeddings = window_pipeline(
+            window_audio, return_embeddings=True, **kwargs
+        )
+        return _annotation_to_segments(diarization), dict(zip(diarization.labels(), embeddings))
+
+    def collect(window_results) -> list[tuple[list[DiarizationSegment], dict]]:
+        # Progress is reported from this thread, as windows complete in order
+        results = []
+        for result in window_results:
+            results.append(result)
+            log(f"    Window {len(results)}/{len(windows)}: {len(result[1])} speakers")
+            if progress is not None:
+                progress(wav.duration * len(results) / len(windows), wav.duration)
+        return results
+
+    if window_workers > 1:
+        with ThreadPoolExecutor(max_workers=window_workers) as executor:
+            results = collect(executor.map(diarize_window, range(len(windows))))
+    else:
+        results = collect(diarize_window(i) for i in range(len(windows)))
+
+    state = WindowedDiarizationState(
+        windows=[(w.start, w.end, w.own_start, w.own_end) for w in windows],
+        segments=[segments for segments, _ in results],
+        embeddings=[embeddings for _, embeddings in results],
+    )
+    if state_dir is not None:
+        save_windowed_state(state, state_dir)
+    return _link_windows(state, num_speakers)
+
+
+def _link_windows(
+    state: WindowedDiarizationState,
+    num_speakers: int | None,
+    threshold: float = LINK_SIMILARITY_THRESHOLD,
+) -> list[DiarizationSegment]:
+    """Link the speakers of diarized windows and stitch their segments together."""
+    windows = [DiarizationWindow(*window) for window in state.windows]
+    speaker_maps = link_speakers(
+        state.embeddings,
+        num_speakers=num_speakers,
+        threshold=threshold,
+        speaker_times=[
+            _speaker_midpoints(segments, window.start)
+            for window, segments in zip(windows, state.segments)
+        ],
+    )
+    return stitch_segments(windows, state.segments, speaker_maps)
+
+
+def _speaker_midpoints(segments: list[DiarizationSegment], offset: float) -> dict[str, float]:
+    """Middle of each speaker's speech in a window, in recording time."""
+    spans: dict[str, list[float]] = {}
+    for seg in segments:
+        span = spans.setdefault(seg.speaker_label, [seg.start, seg.end])
+        span[0] = min(span[0], seg.start)
+        span[1] = max(span[1], seg.end)
+    return {label: offset + (start + end) / 2 for label, (start, end) in spans.items()}
+
+
+def recluster_diarization(
+    state: DiarizationState | WindowedDiarizationState,
+    num_speakers: int | None = None,
+    threshold: float | None = None,
+    device: str = "cpu",
+) -> list[DiarizationSegment]:
+    """Re-run only the clustering step of diarization from cached intermediates.
+
+    Segmentation and embedding extraction are the expensive part of
+    pyannote's pipeline. Given their cached outputs, this repeats the
+    remaining steps (clustering, reconstruction, conversion to segments)
+    with a new speaker count or clustering threshold, which takes seconds.
+    For windowed diarization, the windows' speakers are linked again.
+
+    Args:
+        state: Intermediates saved by run_diarization(state_dir=...).
+        num_speakers: Expected number of speakers (optional hint).
+        threshold: Clustering distance threshold (lower = more speakers).
+        device: Device to run on ("cpu" or "cuda").
+
+    Returns:
+        List of DiarizationSegment sorted by start time.
+
+    Raises:
+        RuntimeError: If the installed pyannote.audio pipeline does not
+            have the steps re-clustering repeats.
+    """
+    if isinstance(state, WindowedDiarizationState):
+        click.echo("  Re-linking speakers across windows...")
+        similarity = LINK_SIMILARITY_THRESHOLD
+        if threshold is not None:
+            # Euclidean distance between unit-length embeddings, as cosine similarity
+            similarity = 1.0 - threshold ** 2 / 2
+        segments = _link_windows(state, num_speakers, similarity)
+    else:
+        segments = _recluster_whole(state, num_speakers, threshold, device)
 
     segments.sort(key=lambda s: s.start)
-    click.echo(f"  Diarization complete: {len(segments)} segments, "
+    click.echo(f"  Re-clustering complete: {len(segments)} segments, "
                f"{len(set(s.speaker_label for s in segments))} speakers detected")
     return segments
+
+
+def _clustering_steps(pipeline: Pipeline) -> tuple[bool, SlidingWindow]:
+    """What re-clustering needs from pyannote 3.1's SpeakerDiarization.
+
+    pyannote has no public API for running only the clustering step, so
+    this reads the two values SpeakerDiarization.apply uses itself: whether
+    the segmentation model is powerset (its output needs no binarization),
+    and the frames of its output.
+
+    Returns:
+        (powerset, frames).
+
+    Raises:
+        RuntimeError: If the pipeline doesn't have them, e.g. after a
+            pyannote.audio upgrade.
+    """
+    try:
+        powerset = pipeline._segmentation.model.specifications.powerset
+        frames = pipeline._frames
+    except AttributeError as e:
+        raise RuntimeError(
+            f"Re-clustering is not supported by this version of pyannote.audio "
+            f"({DIARIZATION_MODEL} pipeline without {e.name!r}). "
+            "Run the process command again instead."
+        ) from e
+    return bool(powerset), frames
+
+
+def _recluster_whole(
+    state: DiarizationState,
+    num_speakers: int | None,
+    threshold: float | None,
+    device: str,
+) -> list[DiarizationSegment]:
+    """Repeat pyannote's clustering and reconstruction on the whole-file state."""
+    pipeline = load_diarization_pipeline(device)
+    powerset, frames = _clustering_steps(pipeline)
+    default_threshold = pipeline.clustering.threshold
+    if threshold is not None:
+        pipeline.clustering.threshold = threshold
+
+    segmentations = SlidingWindowFeature(
+        state.segmentations, SlidingWindow(**_window_args(state.segmentation_window))
+    )
+    count = SlidingWindowFeature(
+        state.count, SlidingWindow(**_window_args(state.count_window))
+    )
+
+    if powerset:
+        binarized = segmentations
+    else:
+        binarized = binarize(
+            segmentations, onset=pipeline.segmentation.threshold, initial_state=False
+        )
+
+    num_speakers, min_speakers, max_speakers = pipeline.set_num_speakers(
+        num_speakers=num_speakers
+    )
+
+    click.echo("  Re-clustering speakers...")
+    try:
+        hard_clusters, _, _ = pipeline.clustering(
+            embeddings=state.embeddings,
+            segmentations=binarized,
+            num_clusters=num_speakers,
+            min_clusters=min_speakers,
+            max_clusters=max_speakers,
+            file={},
+            frames=frames,
+        )
+    finally:
+        # The pipeline is shared across calls, so don't leak the override
+        pipeline.clustering.threshold = default_threshold
+
+    # Same post-processing as SpeakerDiarization.apply
+    count.data = np.minimum(count.data, max_speakers).astype(np.int8)
+    inactive_speakers = np.sum(binarized.data, axis=1) == 0
+    hard_clusters[inactive_speakers] = -2
+    discrete_diarization = pipeline.reconstruct(segmentations, hard_clusters, count)
+    diarization = pipeline.to_annotation(
+        discrete_diarization,
+        min_duration_on=0.0,
+        min_duration_off=pipeline.segmentation.min_duration_off,
+    )
+    mapping = dict(zip(diarization.labels(), pipeline.classes()))
+    diarization = diarization.rename_labels(mapping=mapping)
+    return _annotation_to_segments(diarization)
+
+
+def _window_args(window: tuple[float, float, float]) -> dict:
+    """Turn a cached (start, duration, step) triple into SlidingWindow kwargs."""
+    start, duration, step = window
+    return {"start": start, "duration": duration, "step": step}
@@ -0,0 +1,212 @@
+"""Structured progress events for code that embeds the pipeline.
+
+The pipeline reports each stage's start and end, how much of the audio
+a stage has processed and the stage's detail lines ("Aligned 412
+utterances") through an EventEmitter. Subscribers are plain callables that
+receive the event objects below; the CLI's step-by-step output is one of
+them (print_event).
+
+    def on_event(event):
+        if isinstance(event, StageProgress):
+            print(f"{event.stage}: {event.fraction:.0%}, ETA {event.eta_seconds}")
+
+    process_meeting(path, events=EventEmitter([on_event]))
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Union
+
+import click
+
+# Progress events of a stage are sent at most this often (the last one always is)
+DEFAULT_PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class StageStarted:
+    """A pipeline stage has started."""
+    stage: str
+    step: int
+    total_steps: int
+    title: str
+    input_path: Path | None = None
+
+
+@dataclass(frozen=True)
+class StageFinished:
+    """A pipeline stage has completed successfully."""
+    stage: str
+    step: int
+    total_steps: int
+    seconds: float
+    input_path: Path | None = None
+
+
+@dataclass(frozen=True)
+class StageProgress:
+    """How far the running stage has got through the audio.
+
+    processed_seconds is the end time of the last segment produced, so
+    fraction is the share of the recording the stage has worked through.
+    eta_seconds extrapolates the stage's elapsed time (None until known).
+    """
+    stage: str
+    fraction: float
+    processed_seconds: float
+    total_seconds: float
+    elapsed_seconds: float
+    eta_seconds: float | None
+    counters: dict[str, int] = field(default_factory=dict)
+    input_path: Path | None = None
+
+
+@dataclass(frozen=True)
+class StageMessage:
+    """A line of detail from the running stage, as the CLI prints it under the step header."""
+    stage: str
+    text: str
+    input_path: Path | None = None
+
+
+class StageCancelled(Exception):
+    """Raised in a running stage once its emitter is cancelled (see EventEmitter.cancel)."""
+
+
+Event = Union[StageStarted, StageFinished, StageProgress, StageMessage]
+EventCallback = Callable[[Event], None]
+
+
+def print_event(event: Event) -> None:
+    """Subscriber printing the CLI's "[1/7] Preparing audio..." step headers and detail lines."""
+    if isinstance(event, StageStarted):
+        click.echo(f"\n[{event.step}/{event.total_steps}] {event.title}...")
+    elif isinstance(event, StageMessage):
+        click.echo(event.text)
+
+
+class EventEmitter:
+    """Sends pipeline events to subscribers.
+
+    One emitter belongs to one recording. Progress is rate-limited, so
+    reporting after every transcribed segment costs a clock read and a
+    comparison, and an emitter without subscribers does no work at all.
+    The running stage is tracked per thread, so stages of one recording
+    may run concurrently. A subscriber that raises is reported and skipped
+    for that event; it never fails the stage that sent it.
+
+    Once cancelled, the emitter raises StageCancelled from the next message
+    or progress report, which stops stages still running for a recording
+    that has already failed.
+    """
+
+    def __init__(
+        self,
+        subscribers: list[EventCallback] | tuple[EventCallback, ...] = (print_event,),
+        input_path: Path | None = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL_SECONDS,
+    ):
+        self.subscribers = list(subscribers)
+        self.input_path = input_path
+        self.progress_interval = progress_interval
+        self._local = threading.local()
+        self._cancelled = threading.Event()
+
+    def _state(self):
+        """The calling thread's stage, start time, last progress time and fraction."""
+        state = self._local
+        if not hasattr(state, "stage"):
+            state.stage, state.start, state.last_progress, state.fraction = None, 0.0, 0.0, 0.0
+        return state
+
+    def subscribe(self, callback: EventCallback) -> None:
+        """Add a subscriber."""
+        self.subscribers.append(callback)
+
+    def emit(self, event: Event) -> None:
+        """Send an event to every subscriber."""
+        for callback in self.subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                click.echo(f"  Warning: event subscriber {callback!r} failed: {e}", err=True)
+
+    def cancel(self) -> None:
+        """Stop the stages reporting to this emitter at their next report."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel has been called."""
+        return self._cancelled.is_set()
+
+    def _check_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise StageCancelled(f"Stage {self._state().stage or ''} was cancelled")
+
+    def message(self, text: str) -> None:
+        """Report a line of detail from the running stage.
+
+        Raises:
+            StageCancelled: If the emitter has been cancelled.
+        """
+        self._check_cancelled()
+        if self.subscribers:
+            self.emit(StageMessage(self._state().stage or "", text, self.input_path))
+
+    @contextmanager
+    def stage(self, stage: str, step: int, total_steps: int, title: str):
+        """Report a stage: StageStarted on entry, StageFinished if it completes.
+
+        Raises:
+            StageCancelled: If the emitter has been cancelled.
+        """
+        self._check_cancelled()
+        self.emit(StageStarted(stage, step, total_steps, title, self.input_path))
+        state = self._state()
+        previous = state.stage
+        state.stage, state.start = stage, time.monotonic()
+        state.last_progress, state.fraction = 0.0, 0.0
+        try:
+            yield
+            self.emit(StageFinished(stage, step, total_steps,
+                                    time.monotonic() - state.start, self.input_path))
+        finally:
+            state.stage = previous
+
+    def progress(self, processed_seconds: float, total_seconds: float, **counters: int) -> None:
+        """Report that the running stage has processed audio up to processed_seconds.
+
+        Progress never goes backwards: a value no higher than reported before
+        (e.g. a second pass over overlapping speech) is dropped.
+
+        Raises:
+            StageCancelled: If the emitter has been cancelled.
+        """
+        self._check_cancelled()
+        state = self._state()
+        if not self.subscribers or total_seconds <= 0:
+            return
+        fraction = min(1.0, processed_seconds / total_seconds)
+        if fraction <= state.fraction:
+            return
+        now = time.monotonic()
+        if fraction < 1.0 and now - state.last_progress < self.progress_interval:
+            return
+        state.last_progress, state.fraction = now, fraction
+
+        elapsed = now - state.start
+        eta = elapsed * (1.0 - fraction) / fraction if fraction > 0 else None
+        self.emit(StageProgress(
+            stage=state.stage or "",
+            fraction=fraction,
+            processed_seconds=fraction * total_seconds,
+            total_seconds=total_seconds,
+            elapsed_seconds=elapsed,
+            eta_seconds=eta,
+            counters=counters,
+            input_path=self.input_path,
+        ))
@@ -0,0 +1,378 @@
+"""Acoustic fingerprints to recognise recordings that were already processed.
+
+Zoom saves every meeting as audio_only.m4a and as .mp4, and recordings get
+re-uploaded under other names. A fingerprint of the decoded audio identifies
+the same meeting regardless of container, codec or file name, and matching
+at an offset also catches copies with a trimmed start.
+
+The fingerprint follows Haitsma and Kalker's scheme: one 32-bit value per
+32ms frame, each bit the sign of an energy difference between neighbouring
+frequency bands and consecutive frames. Re-encoding flips only a few bits,
+while unrelated audio differs in about half of them.
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .audio import TARGET_SAMPLE_RATE
+from .sqlite_store import DATA_DIR, SqliteStore, path_from_env
+from .wav import PcmWav
+
+# Environment variable that moves the index away from the default location
+FINGERPRINT_PATH_ENV_VAR = "MEETING_TOOL_FINGERPRINTS"
+
+DEFAULT_FINGERPRINT_PATH = DATA_DIR / "fingerprints.db"
+
+# Analysis frames of 128ms every 32ms at 16kHz
+FRAME_SAMPLES = 2048
+HOP_SAMPLES = 512
+
+# 33 log-spaced bands between 300Hz and 3kHz give 32 bits per frame
+_BAND_EDGES_HZ = np.geomspace(300.0, 3000.0, 34)
+
+# Frames analysed per FFT batch, which bounds memory use on long recordings
+_FRAMES_PER_CHUNK = 2048
+
+# Recordings match if at most this share of fingerprint bits differ...
+MAX_BIT_ERROR_RATE = 0.25
+
+# ... the earlier recording covers at least this share of the new one...
+MIN_COVERAGE = 0.95
+
+# ... and the new one leaves at most this many seconds (or, if more, the
+# share not in MIN_COVERAGE) of the earlier one uncovered. A copy with a
+# trimmed start matches; a clip of a longer meeting does not
+MAX_TRIM_SECONDS = 10.0
+
+# Frames of the new recording looked up to find the offset between the two
+_PROBE_FRAMES = 2000
+
+# Fingerprint values occurring more often than this (silence, hum) don't vote
+_MAX_HITS_PER_VALUE = 50
+
+# One in 2**_INDEX_SHARE_BITS frames is looked up through the value index,
+# chosen by a hash of its value so both recordings pick the same frames
+# whatever the offset between them
+_INDEX_SHARE_BITS = 3
+
+# Values of an indexed frame are sent to SQLite this many at a time
+_LOOKUP_BATCH = 500
+
+# Earlier recordings need this many votes for one offset to be compared in full...
+_MIN_VOTES = 3
+
+# ... and at most this many of the best-voted ones are
+_MAX_CANDIDATES = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    output_path TEXT NOT NULL UNIQUE,
+    source_file TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    fingerprint BLOB NOT NULL,
+    added_at REAL NOT NULL,
+    settings TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS recordings_duration ON recordings (duration_seconds);
+CREATE TABLE IF NOT EXISTS fingerprint_values (
+    value INTEGER NOT NULL,
+    recording_id INTEGER NOT NULL REFERENCES recordings (id) ON DELETE CASCADE,
+    frame INTEGER NOT NULL,
+    PRIMARY KEY (value, recording_id, frame)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fingerprint_values_recording ON fingerprint_values (recording_id);
+"""
+
+# Version of the database layout, kept in PRAGMA user_version
+_SCHEMA_VERSION = 1
+
+
+@dataclass
+class FingerprintMatch:
+    """An earlier recording that contains the same audio."""
+    source_file: str
+    output_path: str
+    # Where the new recording starts within the earlier one, in seconds
+    offset_seconds: float
+    bit_error_rate: float
+    coverage: float
+
+
+def default_fingerprint_path() -> Path:
+    """Index location: MEETING_TOOL_FINGERPRINTS if set, else ~/.meeting_tool/fingerprints.db."""
+    return path_from_env(FINGERPRINT_PATH_ENV_VAR, DEFAULT_FINGERPRINT_PATH)
+
+
+def compute_fingerprint(wav: PcmWav) -> np.ndarray:
+    """Fingerprint a memory-mapped WAV file, one uint32 per frame.
+
+    The file is analysed in chunks of frames, so memory use does not grow
+    with the length of the recording.
+    """
+    if wav.num_samples < FRAME_SAMPLES:
+        return np.zeros(0, dtype=np.uint32)
+    num_frames = 1 + (wav.num_samples - FRAME_SAMPLES) // HOP_SAMPLES
+    edges = (_BAND_EDGES_HZ * FRAME_SAMPLES / wav.sample_rate).astype(int)
+    window = np.hanning(FRAME_SAMPLES).astype(np.float32)
+
+    energies = np.empty((num_frames, len(edges) - 1), dtype=np.float32)
+    for first in range(0, num_frames, _FRAMES_PER_CHUNK):
+        last = min(first + _FRAMES_PER_CHUNK, num_frames)
+        samples = wav.samples[first * HOP_SAMPLES:(last - 1) * HOP_SAMPLES + FRAME_SAMPLES]
+        frames = np.lib.stride_tricks.sliding_window_view(
+            samples.astype(np.float32), FRAME_SAMPLES
+        )[::HOP_SAMPLES]
+        power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        energies[first:last] = np.add.reduceat(power[:, edges[0]:edges[-1]],
+                                               edges[:-1] - edges[0], axis=1)
+
+    band_diff = energies[:, :-1] - energies[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    weights = np.left_shift(np.uint64(1), np.arange(bits.shape[1], dtype=np.uint64))
+    return (bits.astype(np.uint64) @ weights).astype(np.uint32)
+
+
+def _bit_error_rate(query: np.ndarray, stored: np.ndarray, offset: int) -> tuple[float, int]:
+    """Share of differing bits where query overlaps stored at offset.
+
+    Returns:
+        (bit error rate, number of overlapping frames).
+    """
+    first = max(0, -offset)
+    last = min(len(query), len(stored) - offset)
+    if last <= first:
+        return 1.0, 0
+    differing = np.bitwise_xor(query[first:last], stored[first + offset:last + offset])
+    return float(np.unpackbits(differing.view(np.uint8)).mean()), last - first
+
+
+def match_fingerprints(query: np.ndarray, stored: np.ndarray) -> tuple[int, float, float] | None:
+    """Align two fingerprints and measure how well they agree.
+
+    The offset is found by voting: sampled frames of query are looked up in
+    stored, and each exact hit votes for the offset between the two frames.
+
+    Returns:
+        (offset in frames of query's start within stored, bit error rate,
+        share of query covered by stored), or None if nothing lines up.
+    """
+    if len(query) == 0 or len(stored) == 0:
+        return None
+    order = np.argsort(stored, kind="stable")
+    sorted_values = stored[order]
+    probes = np.unique(np.linspace(0, len(query) - 1, min(len(query), _PROBE_FRAMES)).astype(int))
+    lows = np.searchsorted(sorted_values, query[probes], side="left")
+    highs = np.searchsorted(sorted_values, query[probes], side="right")
+
+    votes = [
+        order[low:high] - probe
+        for probe, low, high in zip(probes, lows, highs)
+        if 0 < high - low <= _MAX_HITS_PER_VALUE
+    ]
+    if not votes:
+        return None
+    offsets, counts = np.unique(np.concatenate(votes), return_counts=True)
+    return _align_at(query, stored, int(offsets[np.argmax(counts)]))
+
+
+def _align_at(query: np.ndarray, stored: np.ndarray, offset: int) -> tuple[int, float, float]:
+    """Bit error rate and coverage of query around the offset its frames voted for.
+
+    Returns:
+        (offset in frames, bit error rate, share of query covered by stored).
+    """
+    # A trim that isn't a whole number of frames lands between two offsets
+    ber, overlap, offset = min(
+        (*_bit_error_rate(query, stored, candidate), candidate)
+        for candidate in (offset - 1, offset, offset + 1)
+    )
+    return offset, ber, overlap / len(query)
+
+
+def _indexed_frames(fingerprint: np.ndarray) -> np.ndarray:
+    """Frames whose values go into the value index (about one in 2**_INDEX_SHARE_BITS).
+
+    Values occurring more than _MAX_HITS_PER_VALUE times (silence, hum)
+    are left out, as they couldn't vote anyway.
+    """
+    hashed = (fingerprint.astype(np.uint64) * np.uint64(0x9E3779B1)) & np.uint64(0xFFFFFFFF)
+    frames = np.flatnonzero((hashed >> np.uint64(32 - _INDEX_SHARE_BITS)) == 0)
+    _, inverse, counts = np.unique(fingerprint[frames], return_inverse=True,
+                                   return_counts=True)
+    return frames[counts[inverse] <= _MAX_HITS_PER_VALUE]
+
+
+def _max_stored_duration(duration_seconds: float) -> float:
+    """Longest earlier recording that a recording of this length can duplicate."""
+    return max(duration_seconds + MAX_TRIM_SECONDS, duration_seconds / MIN_COVERAGE)
+
+
+def _covers_stored(overlap_frames: float, stored_frames: int) -> bool:
+    """Whether the new recording leaves at most a trim of the earlier one uncovered."""
+    allowed = max(MAX_TRIM_SECONDS * TARGET_SAMPLE_RATE / HOP_SAMPLES,
+                  (1 - MIN_COVERAGE) * stored_frames)
+    return stored_frames - overlap_frames <= allowed
+
+
+class FingerprintIndex(SqliteStore):
+    """Fingerprints of processed recordings, keyed by their minutes file.
+
+    Each recording also stores the settings its minutes were made with, so
+    only minutes made the same way are offered for reuse.
+    """
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, db_path: Path | None = None):
+        super().__init__(db_path or default_fingerprint_path())
+
+    def _setup_connection(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(recordings)")}
+        if "settings" not in columns:
+            conn.execute("ALTER TABLE recordings ADD COLUMN settings TEXT NOT NULL DEFAULT ''")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            # Databases from before the value index: index the stored fingerprints
+            for row in conn.execute("SELECT id, fingerprint FROM recordings").fetchall():
+                self._index_values(conn, row["id"], np.frombuffer(row["fingerprint"], dtype="<u4"))
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _index_values(conn: sqlite3.Connection, recording_id: int, fingerprint: np.ndarray) -> None:
+        frames = _indexed_frames(fingerprint)
+        conn.executemany(
+            "INSERT OR IGNORE INTO fingerprint_values (value, recording_id, frame) VALUES (?, ?, ?)",
+            ((int(fingerprint[frame]), recording_id, int(frame)) for frame in frames),
+        )
+
+    def add(
+        self,
+        output_path: Path,
+        source_file: Path,
+        duration_seconds: float,
+        fingerprint: np.ndarray,
+        settings: str = "",
+    ) -> None:
+        """Record the fingerprint of a processed recording, replacing any earlier one."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM recordings WHERE output_path = ?",
+                         (str(output_path.resolve()),))
+            cursor = conn.execute(
+                "INSERT INTO recordings "
+                "(output_path, source_file, duration_seconds, fingerprint, added_at, settings) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(output_path.resolve()), str(source_file), duration_seconds,
+                 fingerprint.astype("<u4").tobytes(), time.time(), settings),
+            )
+            self._index_values(conn, cursor.lastrowid, fingerprint)
+
+    def find_duplicate(
+        self,
+        fingerprint: np.ndarray,
+        duration_seconds: float,
+        exclude_output: Path | None = None,
+        settings: str = "",
+    ) -> FingerprintMatch | None:
+        """Find an earlier recording with the same audio as this one.
+
+        The two must cover each other: the earlier recording contains
+        nearly all of this one, and this one all of the earlier recording
+        but a trimmed start or end (see MAX_TRIM_SECONDS). Only recordings
+        of a matching length processed with the same settings are compared,
+        and those whose minutes no longer exist are ignored.
+
+        Args:
+            fingerprint: Fingerprint of the new recording.
+            duration_seconds: Length of the new recording.
+            exclude_output: Minutes file to ignore (the one about to be rewritten).
+            settings: Settings the new recording is processed with.
+
+        Returns:
+            The closest match, or None.
+        """
+        excluded = str(exclude_output.resolve()) if exclude_output is not None else None
+        best: FingerprintMatch | None = None
+        with self._connect() as conn:
+            for recording_id, offset in self._vote(conn, fingerprint, duration_seconds, settings):
+                row = conn.execute(
+                    "SELECT output_path, source_file, fingerprint FROM recordings WHERE id = ?",
+                    (recording_id,),
+                ).fetchone()
+                if row["output_path"] == excluded or not Path(row["output_path"]).exists():
+                    continue
+                stored = np.frombuffer(row["fingerprint"], dtype="<u4")
+                offset, ber, coverage = _align_at(fingerprint, stored, offset)
+                if ber > MAX_BIT_ERROR_RATE or coverage < MIN_COVERAGE:
+                    continue
+                if not _covers_stored(coverage * len(fingerprint), len(stored)):
+                    continue
+                if best is None or ber < best.bit_error_rate:
+                    best = FingerprintMatch(
+                        source_file=row["source_file"],
+                        output_path=row["output_path"],
+                        offset_seconds=offset * HOP_SAMPLES / TARGET_SAMPLE_RATE,
+                        bit_error_rate=ber,
+                        coverage=coverage,
+                    )
+        return best
+
+    @staticmethod
+    def _vote(
+        conn: sqlite3.Connection,
+        fingerprint: np.ndarray,
+        duration_seconds: float,
+        settings: str,
+    ) -> list[tuple[int, int]]:
+        """Candidate recordings and offsets, found through the value index.
+
+        The new recording's indexed frames are looked up by value, and each
+        hit votes for its recording at the offset between the two frames.
+        Only the candidates' fingerprints are then loaded and compared in full.
+
+        Returns:
+            (recording id, offset in frames) of the best-voted recordings,
+            most votes first.
+        """
+        frames = _indexed_frames(fingerprint)
+        if len(frames) > _PROBE_FRAMES:
+            frames = frames[np.linspace(0, len(frames) - 1, _PROBE_FRAMES).astype(int)]
+        probes: dict[int, list[int]] = {}
+        for frame in frames:
+            probes.setdefault(int(fingerprint[frame]), []).append(int(frame))
+
+        values = list(probes)
+        hits: dict[tuple[int, int], list[int]] = {}
+        for first in range(0, len(values), _LOOKUP_BATCH):
+            batch = values[first:first + _LOOKUP_BATCH]
+            rows = conn.execute(
+                "SELECT v.value, v.recording_id, v.frame FROM fingerprint_values AS v "
+                "JOIN recordings AS r ON r.id = v.recording_id "
+                f"WHERE v.value IN ({', '.join('?' * len(batch))}) "
+                "AND r.duration_seconds BETWEEN ? AND ? AND r.settings = ?",
+                (*batch, duration_seconds * MIN_COVERAGE,
+                 _max_stored_duration(duration_seconds), settings),
+            )
+            for value, recording_id, frame in rows:
+                hits.setdefault((recording_id, value), []).append(frame)
+
+        votes: dict[int, dict[int, int]] = {}
+        for (recording_id, value), stored_frames in hits.items():
+            offsets = votes.setdefault(recording_id, {})
+            for stored_frame in stored_frames:
+                for frame in probes[value]:
+                    offsets[stored_frame - frame] = offsets.get(stored_frame - frame, 0) + 1
+
+        candidates = []
+        for recording_id, offsets in votes.items():
+            offset, count = max(offsets.items(), key=lambda item: item[1])
+            if count >= _MIN_VOTES:
+                candidates.append((count, recording_id, offset))
+        candidates.sort(reverse=True)
+        return [(recording_id, offset) for _, recording_id, offset in candidates[:_MAX_CANDIDATES]]
@@ -0,0 +1,279 @@
+"""Run heavy pipeline stages in supervised child processes.
+
+When pyannote or CTranslate2 runs out of memory or hangs on a bad file,
+the process running it dies or stalls. run_isolated calls the stage in a
+child process instead and watches it from the caller: if the child's
+resident memory (including the processes it starts, such as ffmpeg)
+goes over the cap, or it runs longer than the timeout, its whole process
+group is killed and StageFailed is raised. Exceptions raised by the stage
+come back as StageFailed too, with the child's traceback, so one bad
+recording fails on its own instead of taking a batch down.
+
+The stage's console output and progress reports are forwarded to the
+caller as they happen, and its return value is pickled back over a pipe.
+Large data such as the decoded audio stays in files and only their paths
+travel between the processes.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# How often the caller checks the child's memory and running time
+POLL_SECONDS = 0.2
+
+# Reasons a stage fails in a child process
+ERROR = "error"
+MEMORY = "memory"
+TIMEOUT = "timeout"
+CRASHED = "crashed"
+
+
+@dataclass(frozen=True)
+class StageLimits:
+    """Limits for stages run in child processes; None means unlimited.
+
+    The memory cap is enforced where /proc is available (Linux); on other
+    systems the stages still run isolated, with only the timeout.
+    """
+    memory_bytes: int | None = None
+    timeout: float | None = None
+
+
+class StageFailed(RuntimeError):
+    """A stage run in a child process failed, used too much memory or timed out.
+
+    Attributes:
+        stage: Name of the stage.
+        reason: ERROR (the stage raised), MEMORY, TIMEOUT or CRASHED (the
+            child died without reporting, e.g. killed by the OS).
+        details: The child's traceback for ERROR, else None.
+        peak_memory_bytes: Highest resident memory seen (0 where unknown).
+        seconds: How long the stage ran.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        reason: str,
+        message: str,
+        details: str | None = None,
+        peak_memory_bytes: int = 0,
+        seconds: float = 0.0,
+    ):
+        super().__init__(f"{stage} stage {message}")
+        self.stage = stage
+        self.reason = reason
+        self.details = details
+        self.peak_memory_bytes = peak_memory_bytes
+        self.seconds = seconds
+
+
+def describe_failure(error: BaseException) -> str:
+    """An exception's message and traceback, for logs and reports.
+
+    For a StageFailed caused by an exception in the child, the traceback
+    is the child's, which shows where the stage really failed.
+    """
+    if isinstance(error, StageFailed) and error.details:
+        details = error.details
+    else:
+        details = "".join(traceback.format_exception(error))
+    return f"{error}\n{details}"
+
+
+def process_tree_memory(pid: int) -> int | None:
+    """Resident memory in bytes of a process and all its descendants.
+
+    Returns None if it cannot be measured (no /proc, or the process is gone).
+    """
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+    total = 0
+    todo = [pid]
+    while todo:
+        current = todo.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            if current == pid:
+                return None
+            continue  # a descendant exited in the meantime
+        with contextlib.suppress(OSError):
+            for task in os.listdir(f"/proc/{current}/task"):
+                with contextlib.suppress(OSError, ValueError):
+                    with open(f"/proc/{current}/task/{task}/children") as f:
+                        todo.extend(int(child) for child in f.read().split())
+    return total
+
+
+class _PipeWriter(io.TextIOBase):
+    """stdout replacement in the child, sending everything written to the caller."""
+
+    def __init__(self, send: Callable[[tuple], None]):
+        self._send = send
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # Tells click this is a text stream, not a binary one
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self._send(("output", text))
+        return len(text)
+
+
+def _child_main(
+    conn,
+    fn: Callable,
+    args: tuple,
+    kwargs: dict,
+    forward_progress: bool,
+    forward_log: bool,
+) -> None:
+    """Entry point of the child process: run fn and send back what happened."""
+    # Its own process group, so a kill also reaches ffmpeg and other helpers
+    if hasattr(os, "setsid"):
+        os.setsid()
+    lock = threading.Lock()
+
+    def send(message: tuple) -> None:
+        with lock:
+            conn.send(message)
+
+    if forward_progress:
+        def progress(processed: float, total: float, **counters) -> None:
+            send(("progress", processed, total, counters))
+        kwargs = {**kwargs, "progress": progress}
+    if forward_log:
+        def log(text: str) -> None:
+            send(("log", text))
+        kwargs = {**kwargs, "log": log}
+
+    try:
+        with contextlib.redirect_stdout(_PipeWriter(send)):
+            result = fn(*args, **kwargs)
+        send(("done", result))
+    except BaseException as e:
+        with contextlib.suppress(Exception):
+            send(("error", type(e).__name__, str(e), traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _kill(process) -> None:
+    """Kill a child process together with the processes it started."""
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            process.kill()
+    process.join()
+
+
+def _exit_description(exitcode: int | None) -> str:
+    if exitcode is not None and exitcode < 0:
+        with contextlib.suppress(ValueError):
+            return f"killed by {signal.Signals(-exitcode).name}"
+    return f"exit code {exitcode}"
+
+
+def run_isolated(
+    stage: str,
+    limits: StageLimits | None,
+    fn: Callable[..., Any],
+    /,
+    *args,
+    **kwargs,
+) -> Any:
+    """Call fn(*args, **kwargs) in a child process, within limits.
+
+    fn must be importable by the child (a module-level function), and its
+    arguments and return value picklable. Progress and log keyword
+    arguments are not sent to the child: the child gets stand-ins whose
+    reports are passed to them here, in the calling thread.
+
+    Args:
+        stage: Stage name used in errors and the child's process name.
+        limits: Memory cap and timeout (default: none, only isolation).
+
+    Returns:
+        fn's return value.
+
+    Raises:
+        StageFailed: If fn raised, the memory cap or timeout was exceeded,
+            or the child died.
+    """
+    limits = limits or StageLimits()
+    progress = kwargs.pop("progress", None)
+    log = kwargs.pop("log", None)
+    # spawn keeps CUDA and the model libraries of this process out of the child
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_child_main,
+        args=(sender, fn, args, kwargs, progress is not None, log is not None),
+        name=f"meeting-tool-{stage}",
+    )
+    start = time.monotonic()
+    process.start()
+    sender.close()
+
+    peak = 0
+    last_check = 0.0
+
+    def failed(reason: str, message: str, details: str | None = None) -> StageFailed:
+        return StageFailed(stage, reason, message, details, peak, time.monotonic() - start)
+
+    try:
+        while True:
+            if receiver.poll(POLL_SECONDS):
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    process.join()
+                    raise failed(CRASHED, f"process died ({_exit_description(process.exitcode)})")
+                kind = message[0]
+                if kind == "done":
+                    return message[1]
+                if kind == "error":
+                    _, error_type, text, details = message
+                    raise failed(ERROR, f"failed: {error_type}: {text}", details)
+                if kind == "output":
+                    sys.stdout.write(message[1])
+                elif kind == "progress" and progress is not None:
+                    progress(message[1], message[2], **message[3])
+                elif kind == "log" and log is not None:
+                    log(message[1])
+
+            now = time.monotonic()
+            if now - last_check < POLL_SECONDS:
+                continue
+            last_check = now
+            memory = process_tree_memory(process.pid)
+            if memory is not None:
+                peak = max(peak, memory)
+                if limits.memory_bytes is not None and memory > limits.memory_bytes:
+                    _kill(process)
+                    raise failed(MEMORY, f"used {memory / 2**20:.0f} MB, over its "
+                                         f"{limits.memory_bytes / 2**20:.0f} MB cap, and was stopped")
+            if limits.timeout is not None and now - start > limits.timeout:
+                _kill(process)
+                raise failed(TIMEOUT, f"did not finish within {limits.timeout:.0f}s and was stopped")
+    finally:
+        receiver.close()
+        process.join(timeout=POLL_SECONDS * 5)
+        _kill(process)
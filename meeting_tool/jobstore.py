@@ -0,0 +1,187 @@
+"""SQLite-backed job queue for the serve command."""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    input_path TEXT NOT NULL,
+    output_path TEXT,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    result_path TEXT,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+@dataclass
+class Job:
+    """A queued, running or finished processing job."""
+    id: int
+    input_path: str
+    output_path: str | None
+    status: str
+    submitted_at: float
+    options: dict = field(default_factory=dict)
+    worker: str | None = None
+    result_path: str | None = None
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    """Convert a jobs table row to a Job."""
+    data = dict(row)
+    data["options"] = json.loads(data["options"])
+    return Job(**data)
+
+
+class JobStore:
+    """Persistent job queue shared by the HTTP server and worker processes.
+
+    Every operation opens its own short-lived connection, so one JobStore
+    can be used from several threads, and separate processes can each
+    create their own for the same database file.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open an autocommit connection and always close it."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, input_path: str, output_path: str | None = None,
+               options: dict | None = None) -> Job:
+        """Add a job to the queue and return it."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (input_path, output_path, options, status, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (input_path, output_path, json.dumps(options or {}), QUEUED, time.time()),
+            )
+            job_id = cursor.lastrowid
+        return self.get(job_id)
+
+    def claim(self, worker: str) -> Job | None:
+        """Atomically take the oldest queued job, or return None if the queue is empty."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ? WHERE id = ?",
+                (RUNNING, worker, time.time(), row["id"]),
+            )
+            conn.execute("COMMIT")
+        return self.get(row["id"])
+
+    def complete(self, job_id: int, result_path: str) -> None:
+        """Mark a job as finished successfully."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result_path = ?, finished_at = ? WHERE id = ?",
+                (DONE, result_path, time.time(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Mark a job as failed with an error message."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id),
+            )
+
+    def requeue_running(self) -> int:
+        """Put jobs left running by a previous server back in the queue.
+
+        Returns:
+            Number of jobs requeued.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, started_at = NULL WHERE status = ?",
+                (QUEUED, RUNNING),
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Job | None:
+        """Look up a job by id."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def list_jobs(self, status: str | None = None, limit: int = 100) -> list[Job]:
+        """List the most recent jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY id DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(query, params + (limit,)).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def stats(self, window_seconds: float = 3600.0) -> dict:
+        """Queue depth and throughput figures.
+
+        Args:
+            window_seconds: Look-back window for throughput figures.
+
+        Returns:
+            Dictionary with per-status counts, jobs finished in the window,
+            jobs per hour and mean processing time of those jobs.
+        """
+        since = time.time() - window_seconds
+        with self._connect() as conn:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall())
+            finished, mean_seconds = conn.execute(
+                "SELECT COUNT(*), AVG(finished_at - started_at) FROM jobs "
+                "WHERE status = ? AND finished_at >= ?",
+                (DONE, since),
+            ).fetchone()
+
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "window_seconds": window_seconds,
+            "finished_in_window": finished,
+            "jobs_per_hour": finished * 3600.0 / window_seconds,
+            "mean_processing_seconds": mean_seconds,
+        }
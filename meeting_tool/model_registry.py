@@ -0,0 +1,201 @@
+"""Process-wide registry of loaded models with LRU eviction under a memory budget."""
+
+import gc
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import click
+
+# Environment variable for the registry's memory budget, e.g. "6GB"
+MEMORY_BUDGET_ENV_VAR = "MEETING_TOOL_MODEL_MEMORY"
+
+# Approximate parameter counts of the Whisper model sizes
+WHISPER_PARAMETERS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large-v1": 1_550_000_000,
+    "large-v2": 1_550_000_000,
+    "large-v3": 1_550_000_000,
+    "large": 1_550_000_000,
+}
+
+# Resident size of the pyannote diarization pipeline (segmentation + embedding models)
+DIARIZATION_PIPELINE_BYTES = 150 * 1024 ** 2
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """Identifies one loaded model instance."""
+    name: str
+    size: str | None
+    device: str
+    compute_type: str | None = None
+    threads: int = 0
+
+
+@dataclass
+class _Entry:
+    """A loaded model and its estimated memory footprint."""
+    model: Any
+    size_bytes: int
+
+
+def parse_memory_size(value: str) -> int:
+    """Parse a memory size such as "512MB", "4GB" or "1073741824" into bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?B?)\s*", value.upper())
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (examples: 512MB, 4GB)")
+    number, unit = match.groups()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def estimate_whisper_bytes(model_size: str, compute_type: str) -> int:
+    """Estimate the resident size of a Whisper model from its parameter count."""
+    parameters = WHISPER_PARAMETERS.get(model_size, WHISPER_PARAMETERS["large-v3"])
+    if compute_type.startswith("int8"):
+        bytes_per_parameter = 1
+    elif compute_type in ("float16", "bfloat16"):
+        bytes_per_parameter = 2
+    else:
+        bytes_per_parameter = 4
+    # Headroom for activations and runtime buffers
+    return int(parameters * bytes_per_parameter * 1.2)
+
+
+def _release_memory() -> None:
+    """Free memory held by dropped models, including torch's CUDA cache."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+class ModelRegistry:
+    """Keeps loaded models for reuse, evicting least recently used ones.
+
+    get() returns the cached instance for a key or calls the loader. When
+    the estimated total size would exceed the memory budget, the least
+    recently used models are dropped first. A model larger than the whole
+    budget is still loaded, on its own.
+    """
+
+    def __init__(self, memory_budget: int | None = None):
+        self.memory_budget = memory_budget
+        self._entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def memory_used(self) -> int:
+        """Estimated bytes held by loaded models."""
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def loaded(self) -> list[ModelKey]:
+        """Keys of loaded models, least recently used first."""
+        return list(self._entries)
+
+    def get(self, key: ModelKey, loader: Callable[[], Any], size_bytes: int) -> Any:
+        """Return the model for key, loading it with loader() if needed.
+
+        Args:
+            key: Identity of the model.
+            loader: Called with no arguments to load the model on a miss.
+            size_bytes: Estimated resident size of the model.
+
+        Returns:
+            The loaded model.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.model
+
+            self._make_room(size_bytes)
+            model = loader()
+            self._entries[key] = _Entry(model=model, size_bytes=size_bytes)
+            return model
+
+    def _make_room(self, size_bytes: int) -> None:
+        """Evict least recently used models until size_bytes more would fit."""
+        if self.memory_budget is None:
+            return
+        while self._entries and self.memory_used + size_bytes > self.memory_budget:
+            key, _ = self._entries.popitem(last=False)
+            click.echo(f"  Unloading {key.name} ({key.size or 'default'}, {key.device}) "
+                       "to stay within the model memory budget")
+            _release_memory()
+
+    def evict(self, key: ModelKey) -> bool:
+        """Drop one model. Returns False if it was not loaded."""
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+        _release_memory()
+        return True
+
+    def clear(self) -> None:
+        """Drop all loaded models."""
+        with self._lock:
+            self._entries.clear()
+        _release_memory()
+
+
+_registry: ModelRegistry | None = None
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide registry, created on first use.
+
+    Its memory budget comes from MEETING_TOOL_MODEL_MEMORY (unlimited if unset).
+    """
+    global _registry
+    if _registry is None:
+        budget = os.getenv(MEMORY_BUDGET_ENV_VAR, "").strip()
+        _registry = ModelRegistry(parse_memory_size(budget) if budget else None)
+    return _registry
+
+
+def set_memory_budget(memory_budget: int | str | None) -> None:
+    """Change the process-wide memory budget (bytes, a size string, or None for unlimited)."""
+    if isinstance(memory_budget, str):
+        memory_budget = parse_memory_size(memory_budget)
+    registry = get_registry()
+    with registry._lock:
+        registry.memory_budget = memory_budget
+        registry._make_room(0)
+
+
+def preload(
+    whisper_models: list[str] | tuple[str, ...] = (),
+    diarization: bool = True,
+    device: str = "cpu",
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+) -> None:
+    """Load models ahead of time so the first job doesn't pay for it.
+
+    Args:
+        whisper_models: Whisper model sizes to load.
+        diarization: Also load the diarization pipeline.
+        device: Device to load onto ("cpu" or "cuda").
+        compute_type: CTranslate2 compute type (default depends on device).
+        cpu_threads: Whisper CPU threads; must match what jobs will request.
+    """
+    if diarization:
+        from .diarization import load_diarization_pipeline
+        load_diarization_pipeline(device)
+    if whisper_models:
+        from .transcription import load_whisper_model
+        for model_size in whisper_models:
+            load_whisper_model(model_size, device, compute_type, cpu_threads)
@@ -18,6 +18,8 @@ class TranscriptionWord:
     start: float
     end: float
     text: str
+    # Whisper's probability for the word (1.0 when unknown)
+    probability: float = 1.0
 
 
 @dataclass
@@ -27,6 +29,9 @@ class TranscriptionSegment:
     end: float
     text: str
     words: list[TranscriptionWord]
+    # Whisper's average token log probability and probability of no speech
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
 
 
 @dataclass
@@ -0,0 +1,145 @@
+"""Per-participant audio tracks: transcribe each speaker's recording separately.
+
+Zoom's "Record a separate audio file for each participant" option writes one
+file per participant, e.g. "Audio Record/audioAliceSmith11234567890.m4a".
+Each file already identifies its speaker, so no diarization is needed.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import click
+
+from .audio import SUPPORTED_EXTENSIONS, get_audio_duration, prepare_audio
+from .model_registry import preload
+from .models import TranscriptionSegment
+
+# Zoom names participant tracks "audio" + display name + numeric id
+_ZOOM_TRACK_NAME = re.compile(r"^audio(?P<name>.+?)\d{6,}$")
+
+
+def collect_tracks(sources: list[Path]) -> list[Path]:
+    """Expand directories into the audio files they contain.
+
+    Args:
+        sources: Track files and/or directories holding track files.
+
+    Returns:
+        Sorted list of track files.
+    """
+    tracks = set()
+    for source in sources:
+        if source.is_dir():
+            tracks.update(
+                path for path in source.iterdir()
+                if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+            )
+        else:
+            tracks.add(source)
+    return sorted(tracks)
+
+
+def track_name(track_path: Path) -> str:
+    """Participant name for a track, from Zoom's file naming if it matches.
+
+    "audioAliceSmith11234567890.m4a" becomes "Alice Smith"; other files
+    are named after their file name.
+    """
+    match = _ZOOM_TRACK_NAME.match(track_path.stem)
+    if not match:
+        return track_path.stem
+    # Zoom drops the spaces of display names: split CamelCase back into words
+    return re.sub(r"(?<=[a-z])(?=[A-Z])", " ", match.group("name")).strip()
+
+
+def _init_worker(options: dict) -> None:
+    """Pool initializer: load the Whisper model once per worker process."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        preload(
+            whisper_models=[options["model_size"]],
+            diarization=False,
+            device=options["device"],
+            compute_type=options.get("compute_type"),
+            cpu_threads=options["cpu_threads"],
+        )
+
+
+def transcribe_track(
+    track_path: Path,
+    options: dict,
+    ffmpeg_threads: int = 0,
+) -> tuple[list[TranscriptionSegment], float]:
+    """Decode and transcribe one track.
+
+    Args:
+        track_path: Audio file of one participant.
+        options: run_transcription keyword arguments.
+        ffmpeg_threads: Decoder threads for ffmpeg.
+
+    Returns:
+        (transcription segments, track duration in seconds).
+    """
+    from .transcription import run_transcription
+
+    with tempfile.TemporaryDirectory(prefix="meeting_tool_track_") as tmp:
+        audio_path = prepare_audio(
+            track_path, Path(tmp) / f"{track_path.stem}.wav", threads=ffmpeg_threads
+        )
+        duration = get_audio_duration(audio_path)
+        segments = run_transcription(audio_path, **options)
+    return segments, duration
+
+
+def _transcribe_quietly(track_path: Path, options: dict, ffmpeg_threads: int):
+    """transcribe_track for a worker process, without its console output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return transcribe_track(track_path, options, ffmpeg_threads)
+
+
+def transcribe_tracks(
+    tracks: list[Path],
+    options: dict,
+    workers: int = 1,
+    ffmpeg_threads: int = 0,
+) -> list[tuple[list[TranscriptionSegment], float]]:
+    """Transcribe tracks, several at a time in separate worker processes.
+
+    Each worker loads Whisper once and transcribes whole tracks, so the
+    work scales with the number of workers until cores run out.
+
+    Args:
+        tracks: Track files.
+        options: run_transcription keyword arguments (model_size, device, ...).
+        workers: Number of tracks transcribed at the same time.
+        ffmpeg_threads: Decoder threads for ffmpeg in each worker.
+
+    Returns:
+        (segments, duration) per track, in the order of tracks.
+    """
+    if workers == 1 or len(tracks) == 1:
+        return [transcribe_track(track, options, ffmpeg_threads) for track in tracks]
+
+    # spawn keeps CUDA and the model libraries out of the parent process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tracks)),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(options,),
+    ) as executor:
+        futures = [
+            executor.submit(_transcribe_quietly, track, options, ffmpeg_threads)
+            for track in tracks
+        ]
+        results = []
+        for track, future in zip(tracks, futures):
+            segments, duration = future.result()
+            words = sum(len(s.words) for s in segments)
+            click.echo(f"  {track.name}: {len(segments)} segments, {words} words")
+            results.append((segments, duration))
+    return results
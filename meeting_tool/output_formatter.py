@@ -1,7 +1,10 @@
 """Markdown output generation for meeting minutes."""
 
+import os
+import re
 from datetime import date
 from pathlib import Path
+from typing import Callable
 
 import click
 
@@ -18,7 +21,7 @@ def _format_duration(seconds: float) -> str:
     return f"{minutes}m"
 
 
-def _format_timestamp(seconds: float) -> str:
+def format_timestamp(seconds: float) -> str:
     """Format seconds to HH:MM:SS timestamp."""
     total_seconds = int(seconds)
     hours = total_seconds // 3600
@@ -30,12 +33,15 @@ def _format_timestamp(seconds: float) -> str:
 def format_meeting_minutes(
     transcript: MeetingTranscript,
     summary: MeetingSummary | None = None,
+    note: str | None = None,
 ) -> str:
     """Format meeting transcript and summary into markdown.
 
     Args:
         transcript: The complete meeting transcript.
         summary: Optional AI-generated summary.
+        note: Optional notice shown as a quote under the header
+            (e.g. that the transcript is a draft).
 
     Returns:
         Formatted markdown string.
@@ -52,6 +58,9 @@ def format_meeting_minutes(
         f"**Participants:** {', '.join(participants)}",
         "",
     ]
+    if note:
+        lines.append(f"> {note}")
+        lines.append("")
 
     if summary:
         lines.append("---")
@@ -84,7 +93,7 @@ def format_meeting_minutes(
     lines.append("")
 
     for utt in transcript.utterances:
-        timestamp = _format_timestamp(utt.start)
+        timestamp = format_timestamp(utt.start)
         lines.append(f"**{utt.speaker_name}** ({timestamp}):")
         lines.append(utt.text)
         lines.append("")
@@ -92,19 +101,77 @@ def format_meeting_minutes(
     return "\n".join(lines)
 
 
+def carry_over_summary(old_content: str, new_content: str) -> str:
+    """Copy the Summary section of existing minutes into regenerated minutes.
+
+    Used when the transcript is regenerated (e.g. after re-clustering
+    speakers) so a summary pasted in by the user is not lost.
+
+    Args:
+        old_content: Markdown of the existing minutes.
+        new_content: Freshly formatted markdown without a summary.
+
+    Returns:
+        new_content with the old Summary section inserted before the transcript.
+    """
+    summary_marker = "---\n## Summary\n"
+    transcript_marker = "---\n## Full Transcript\n"
+    summary_start = old_content.find(summary_marker)
+    summary_end = old_content.find(transcript_marker, summary_start)
+    insert_at = new_content.find(transcript_marker)
+    if summary_start == -1 or summary_end == -1 or insert_at == -1:
+        return new_content
+    if summary_marker in new_content:
+        return new_content
+    summary_block = old_content[summary_start:summary_end]
+    return new_content[:insert_at] + summary_block + new_content[insert_at:]
+
+
+def retarget_minutes(content: str, duration_seconds: float, note: str) -> str:
+    """Adapt minutes copied from another recording of the same meeting.
+
+    The header gets today's date and the new recording's duration, and
+    note is shown under it as in format_meeting_minutes.
+
+    Args:
+        content: Markdown of the copied minutes.
+        duration_seconds: Length of the new recording.
+        note: Notice naming the recording the minutes were made from.
+
+    Returns:
+        The adapted markdown.
+    """
+    header = (f"**Date:** {date.today().isoformat()}  |  "
+              f"**Duration:** {_format_duration(duration_seconds)}  |  ")
+    content, count = re.subn(r"^\*\*Date:\*\* .*?  \|  \*\*Duration:\*\* .*?  \|  ",
+                             lambda _: header, content, count=1, flags=re.MULTILINE)
+    if count == 0:
+        return content
+    line_end = content.index("\n", content.index("**Date:**"))
+    return f"{content[:line_end]}\n\n> {note}{content[line_end:]}"
+
+
 def write_output(
     content: str,
     output_path: Path,
+    log: Callable[[str], None] = click.echo,
 ) -> Path:
     """Write formatted meeting minutes to a file.
 
+    The content is written to a temporary file next to output_path and
+    then renamed over it, so readers never see a half-written file (the
+    progressive mode replaces a draft while it may be open).
+
     Args:
         content: The formatted markdown content.
         output_path: Path to write the output file.
+        log: Receives the line reporting where the file is (e.g. EventEmitter.message).
 
     Returns:
         Path to the written file.
     """
-    output_path.write_text(content, encoding="utf-8")
-    click.echo(f"  Meeting minutes saved to: {output_path}")
+    temp_path = output_path.with_name(f".{output_path.name}.tmp")
+    temp_path.write_text(content, encoding="utf-8")
+    os.replace(temp_path, output_path)
+    log(f"  Meeting minutes saved to: {output_path}")
     return output_path
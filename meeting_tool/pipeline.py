@@ -1,21 +1,760 @@
 """Orchestrates the full meeting processing pipeline."""
 
+import json
+import shutil
+import sqlite3
+from dataclasses import dataclass, field, replace
+from datetime import date
 from pathlib import Path
+from typing import Callable
 
 import click
+import numpy as np
 
-from .audio import prepare_audio, get_audio_duration
-from .diarization import run_diarization
-from .transcription import run_transcription
-from .alignment import align_transcript
+from .archive import ARCHIVE_SUFFIX, archive_path_for, set_archive_source, write_archive
+from .audio import prepare_audio, get_audio_duration, range_label, validate_range
+from .alignment import align_transcript, merge_tracks, track_utterances
 from .speaker_mapping import (
     apply_speaker_names,
     interactive_speaker_naming,
     parse_speaker_string,
 )
 from .summarization import save_prompt_file, summarize_meeting
-from .output_formatter import format_meeting_minutes, write_output
-from .models import MeetingSummary, MeetingTranscript
+from .output_formatter import (
+    carry_over_summary,
+    format_meeting_minutes,
+    format_timestamp,
+    retarget_minutes,
+    write_output,
+)
+from .cache import (
+    cache_dir_for,
+    cache_inputs,
+    load_diarization_state,
+    load_meeting_info,
+    load_transcription,
+    reset_cache,
+    save_diarization,
+    save_meeting_info,
+    save_transcription,
+)
+from .events import EventEmitter
+from .fingerprint import FingerprintIndex, FingerprintMatch, compute_fingerprint
+from .isolation import StageLimits, run_isolated
+from .resources import ThreadAllocation, plan_threads
+from .turns import align_turns
+from .wav import PcmWav, SharedSamples, share_samples
+from .search_index import SearchIndex
+from .stage_graph import Stage, StageGraph, StageMemo, run_graph
+from .models import (
+    AlignedUtterance,
+    DiarizationSegment,
+    MeetingSummary,
+    MeetingTranscript,
+    TranscriptionSegment,
+)
+
+# Step headers of the pipeline stages
+TITLES = {
+    "decode": "Preparing audio",
+    "diarize": "Running speaker diarization",
+    "transcribe": "Transcribing audio",
+    "selective": "Re-transcribing low-confidence regions",
+    "align": "Aligning transcript with speakers",
+    "name_speakers": "Mapping speaker names",
+    "summarize": "Generating summary via API",
+    "prompt": "Saving prompt file for manual summarization",
+    "write": "Writing output",
+}
+
+# Values of process_meeting's only argument, and the graph value each stops at
+ONLY_TARGETS = {"minutes": "minutes_path", "prompt": "prompt_path"}
+
+# process_meeting options that shape the minutes, with their defaults. The
+# minutes of a duplicate recording are only reused if these all match
+MINUTES_SETTINGS = {
+    "speakers": None,
+    "num_speakers": None,
+    "whisper_model": "large-v3",
+    "compute_type": None,
+    "transcribe_mode": "sequential",
+    "diarization_window": None,
+    "diarization_overlap": 60.0,
+    "draft_model": None,
+    "selective": False,
+    "summary": False,
+}
+
+
+@dataclass
+class MeetingJob:
+    """One recording moving through the pipeline stages.
+
+    The job describes the recording (its paths, range, duration and
+    fingerprint) and owns its temporary files. The data the stages produce
+    (segments, utterances) is passed between them by the stage graph (see
+    meeting_graph), whether process_meeting runs it or the pipelined batch
+    executor overlaps it across recordings.
+    """
+    input_path: Path
+    output_path: Path
+    cache_dir: Path | None = None
+    # Part of the recording to process, in seconds (None: from the start / to
+    # the end). The stages see only that part, with times starting at 0
+    start: float | None = None
+    end: float | None = None
+    audio_path: Path | None = None
+    duration: float = 0.0
+    # Acoustic fingerprint of the audio, and the earlier recording it duplicates
+    fingerprint: np.ndarray | None = None
+    duplicate_of: FingerprintMatch | None = None
+    # The options that shape the minutes (see minutes_settings)
+    settings: str = ""
+    # Receives stage and progress events; prints the step headers by default
+    events: EventEmitter = field(default_factory=EventEmitter)
+    # Run decoding and the models in supervised child processes with these limits
+    isolation: StageLimits | None = None
+    # Convert the audio to float32 once, into a file the stages map instead
+    # of each converting (and copying into its process) the whole recording
+    share_samples: bool = False
+    samples: SharedSamples | None = None
+
+    @property
+    def needs_cleanup(self) -> bool:
+        """Whether audio_path is a temporary file created by the decode stage."""
+        return self.audio_path is not None and self.audio_path != self.input_path
+
+    @property
+    def offset(self) -> float:
+        """Seconds to add to stage times to get times in the whole recording."""
+        return self.start or 0.0
+
+    @property
+    def audio(self) -> Path | SharedSamples:
+        """What the models read: the shared samples if there are any, else the WAV file."""
+        return self.samples if self.samples is not None else self.audio_path
+
+
+def minutes_settings(options: dict) -> str:
+    """The MINUTES_SETTINGS among process_meeting options, as a key to compare runs by."""
+    return json.dumps({name: options.get(name, default)
+                       for name, default in MINUTES_SETTINGS.items()}, sort_keys=True)
+
+
+def start_job(
+    input_path: Path,
+    output_path: Path | None = None,
+    cache: bool = True,
+    events: EventEmitter | None = None,
+    isolation: StageLimits | None = None,
+    start: float | None = None,
+    end: float | None = None,
+) -> MeetingJob:
+    """Create a job for a recording and clear the cache next to its output if it is stale.
+
+    A cache made from the same recording and range is kept (see cache.reset_cache).
+
+    With a time range (start, end), the default output is named after the
+    range, so the minutes of the whole recording are not overwritten.
+    """
+    if output_path is None and (start is not None or end is not None):
+        output_path = input_path.with_name(f"{input_path.stem}_{range_label(start, end)}.md")
+    elif output_path is None:
+        output_path = input_path.with_suffix(".md")
+
+    cache_dir = cache_dir_for(output_path) if cache else None
+    if cache_dir is not None:
+        reset_cache(cache_dir, cache_inputs(input_path, start, end))
+    events = events or EventEmitter()
+    events.input_path = input_path
+    return MeetingJob(input_path=input_path, output_path=output_path,
+                      cache_dir=cache_dir, start=start, end=end, events=events,
+                      isolation=isolation, share_samples=isolation is not None)
+
+
+def _call(job: MeetingJob, stage: str, fn, *args, **kwargs):
+    """Call a decoder or model function, in a child process if the job is isolated."""
+    if job.isolation is None:
+        return fn(*args, **kwargs)
+    return run_isolated(stage, job.isolation, fn, *args, **kwargs)
+
+
+def _decode(job: MeetingJob, input_path: Path, threads: ThreadAllocation, dedup: bool) -> None:
+    """Convert the recording to 16kHz mono WAV and fill in the job's audio path and duration.
+
+    With dedup, the audio is also fingerprinted and looked up among the
+    recordings processed before; a match is stored in job.duplicate_of.
+    With job.share_samples, the float32 samples the later stages read are
+    written once too.
+    """
+    job.audio_path = _call(job, "decode", prepare_audio, input_path,
+                           threads=threads.ffmpeg_threads, start=job.start, end=job.end,
+                           log=job.events.message)
+    job.duration = get_audio_duration(job.audio_path)
+    if dedup:
+        _find_duplicate(job)
+    if job.share_samples and job.duplicate_of is None and job.samples is None:
+        job.samples = share_samples(PcmWav(job.audio_path))
+        job.events.message(f"  Samples shared between stages: "
+                           f"{job.samples.num_samples * 4 / 2**20:.0f} MB")
+
+
+def _find_duplicate(job: MeetingJob) -> None:
+    """Fingerprint the job's audio and look for an earlier recording of it."""
+    try:
+        job.fingerprint = compute_fingerprint(PcmWav(job.audio_path))
+        job.duplicate_of = FingerprintIndex().find_duplicate(
+            job.fingerprint, job.duration, exclude_output=job.output_path,
+            settings=job.settings,
+        )
+    except (ValueError, sqlite3.Error, OSError) as e:
+        job.events.message(f"  Warning: duplicate detection skipped: {e}")
+        return
+    if job.duplicate_of is not None:
+        match = job.duplicate_of
+        job.events.message(f"  Same audio as {Path(match.source_file).name} "
+                           f"(starting at {match.offset_seconds:.1f}s, "
+                           f"{match.bit_error_rate:.0%} fingerprint difference)")
+
+
+def reuse_duplicate(job: MeetingJob) -> Path:
+    """Copy the minutes of the recording job duplicates instead of processing it.
+
+    The copies are made to describe this recording: the minutes get its
+    duration and a note naming the recording they were made from, and the
+    archive its source file. Timestamps stay those of the earlier recording.
+
+    Returns:
+        Path to the output .md file.
+    """
+    match = job.duplicate_of
+    source = Path(match.output_path)
+    click.echo(f"\nSkipping diarization and transcription: reusing {source}")
+    if source.resolve() != job.output_path.resolve():
+        note = f"Transcript of {Path(match.source_file).name}, which has the same audio."
+        if match.offset_seconds >= 1.0:
+            note += (f" This recording starts {format_timestamp(match.offset_seconds)} "
+                     f"into it, so timestamps are {match.offset_seconds:.0f}s ahead.")
+        content = retarget_minutes(source.read_text(encoding="utf-8"), job.duration, note)
+        write_output(content, job.output_path)
+        if source.with_suffix(".prompt.txt").exists():
+            shutil.copyfile(source.with_suffix(".prompt.txt"), job.output_path.with_suffix(".prompt.txt"))
+        if source.with_suffix(ARCHIVE_SUFFIX).exists():
+            shutil.copyfile(source.with_suffix(ARCHIVE_SUFFIX), archive_path_for(job.output_path))
+            set_archive_source(archive_path_for(job.output_path), job.input_path, job.duration)
+    if match.offset_seconds >= 1.0:
+        click.echo(f"  Note: timestamps in the minutes are {match.offset_seconds:.0f}s "
+                   f"ahead of this recording, which starts later")
+    cleanup_job(job)
+    click.echo(f"\nDone! Meeting minutes saved to: {job.output_path}")
+    return job.output_path
+
+
+def _diarize(
+    job: MeetingJob,
+    audio: Path | SharedSamples,
+    threads: ThreadAllocation,
+    num_speakers: int | None,
+    device: str,
+    diarization_window: float | None,
+    diarization_overlap: float,
+    diarization_workers: int,
+) -> list[DiarizationSegment]:
+    """Find who spoke when in the job's audio."""
+    # Model libraries are imported by the stage that needs them, so importing
+    # this module (and the lightweight CLI commands) stays cheap
+    from .diarization import run_diarization
+    return _call(
+        job, "diarize", run_diarization,
+        audio,
+        num_speakers=num_speakers,
+        device=device,
+        num_threads=threads.torch_threads,
+        window_seconds=diarization_window,
+        window_overlap=diarization_overlap,
+        window_workers=diarization_workers,
+        state_dir=job.cache_dir,
+        progress=job.events.progress,
+        log=job.events.message,
+    )
+
+
+def _transcribe(
+    job: MeetingJob,
+    audio: Path | SharedSamples,
+    diarization_segments: list[DiarizationSegment] | None,
+    whisper_threads: int,
+    whisper_model: str,
+    device: str,
+    transcribe_mode: str,
+    batch_size: int,
+    compute_type: str | None,
+) -> tuple[list[TranscriptionSegment], list[str] | None]:
+    """Transcribe the job's audio with word timestamps.
+
+    Returns:
+        (segments, speaker of each segment in turns mode, else None).
+    """
+    if transcribe_mode == "turns":
+        from .transcription import run_turn_transcription
+        labeled = _call(
+            job, "transcribe", run_turn_transcription,
+            audio,
+            diarization_segments,
+            model_size=whisper_model,
+            device=device,
+            batch_size=batch_size,
+            compute_type=compute_type,
+            cpu_threads=whisper_threads,
+            progress=job.events.progress,
+            log=job.events.message,
+        )
+        labeled.sort(key=lambda pair: pair[1].start)
+        return [segment for _, segment in labeled], [speaker for speaker, _ in labeled]
+
+    from .transcription import run_transcription
+    segments = _call(
+        job, "transcribe", run_transcription,
+        audio,
+        model_size=whisper_model,
+        device=device,
+        mode=transcribe_mode,
+        batch_size=batch_size,
+        compute_type=compute_type,
+        cpu_threads=whisper_threads,
+        progress=job.events.progress,
+        log=job.events.message,
+    )
+    return segments, None
+
+
+def _shift(items: list, offset: float) -> list:
+    """Copies of segments or utterances (and their words) moved by offset seconds."""
+    if not offset:
+        return items
+    shifted = []
+    for item in items:
+        changes = {"start": item.start + offset, "end": item.end + offset}
+        if isinstance(item, TranscriptionSegment):
+            changes["words"] = _shift(item.words, offset)
+        shifted.append(replace(item, **changes))
+    return shifted
+
+
+def _align(
+    diarization_segments: list[DiarizationSegment],
+    transcription_segments: list[TranscriptionSegment],
+    turn_speakers: list[str] | None,
+) -> list[AlignedUtterance]:
+    """Attribute transcription segments to speakers."""
+    if turn_speakers is not None:
+        # Each segment already carries the speaker of the turn it was cut from
+        return align_turns(list(zip(turn_speakers, transcription_segments)))
+    return align_transcript(transcription_segments, diarization_segments)
+
+
+def _align_and_cache(
+    job: MeetingJob,
+    diarization_segments: list[DiarizationSegment],
+    transcription_segments: list[TranscriptionSegment],
+    turn_speakers: list[str] | None,
+) -> list[AlignedUtterance]:
+    """Align the transcript, caching the inference results first.
+
+    From here on, times are those of the whole recording (see MeetingJob.start).
+    """
+    if job.cache_dir is not None:
+        save_diarization(_shift(diarization_segments, job.offset), job.cache_dir)
+        save_transcription(_shift(transcription_segments, job.offset), job.cache_dir)
+    utterances = _shift(_align(diarization_segments, transcription_segments, turn_speakers),
+                        job.offset)
+    job.events.message(f"  Aligned {len(utterances)} utterances")
+    return utterances
+
+
+def _name_speakers(
+    utterances: list[AlignedUtterance],
+    speakers: str | None,
+    no_interactive: bool,
+) -> dict[str, str]:
+    """Get the speaker map from the CLI string, or by asking the user."""
+    if speakers:
+        return parse_speaker_string(speakers)
+    if no_interactive:
+        return {}
+    return interactive_speaker_naming(utterances)
+
+
+def _label(
+    job: MeetingJob,
+    utterances: list[AlignedUtterance],
+    speaker_map: dict[str, str],
+) -> list[AlignedUtterance]:
+    """Apply the speaker names and remember them in the cache."""
+    if job.cache_dir is not None:
+        save_meeting_info({
+            "source_file": str(job.input_path),
+            "duration_seconds": job.duration,
+            "offset_seconds": job.offset,
+            "speaker_map": speaker_map,
+        }, job.cache_dir)
+    return apply_speaker_names(utterances, speaker_map)
+
+
+def _refine_low_confidence(
+    job: MeetingJob,
+    audio: Path | SharedSamples,
+    draft_segments: list[TranscriptionSegment],
+    whisper_threads: int,
+    whisper_model: str,
+    device: str,
+    batch_size: int,
+    compute_type: str | None,
+) -> list[TranscriptionSegment]:
+    """Re-transcribe the low-confidence parts of a draft transcript with a larger model.
+
+    Returns:
+        The draft segments with the refined ones spliced in by timestamp
+        (see confidence.splice_segments).
+    """
+    from .confidence import find_low_confidence_spans, splice_segments
+
+    spans = find_low_confidence_spans(draft_segments)
+    if not spans:
+        job.events.message("  Every segment has high confidence; nothing to re-transcribe")
+        return draft_segments
+    covered = sum(end - start for start, end in spans)
+    share = covered / job.duration if job.duration else 0.0
+    job.events.message(f"  Re-transcribing {len(spans)} low-confidence regions "
+                       f"({covered:.0f}s, {share:.0%} of the recording) with {whisper_model}...")
+    refined = _transcribe_spans(job, audio, spans, whisper_threads, whisper_model, device,
+                                batch_size, compute_type)
+    return splice_segments(draft_segments, spans, refined)
+
+
+def _transcribe_spans(
+    job: MeetingJob,
+    audio: Path | SharedSamples,
+    spans: list[tuple[float, float]],
+    whisper_threads: int,
+    whisper_model: str,
+    device: str,
+    batch_size: int,
+    compute_type: str | None,
+) -> list[TranscriptionSegment]:
+    """Transcribe only the given spans of the job's audio."""
+    from .transcription import run_span_transcription
+    return _call(
+        job, "selective", run_span_transcription,
+        audio,
+        spans,
+        model_size=whisper_model,
+        device=device,
+        batch_size=batch_size,
+        compute_type=compute_type,
+        cpu_threads=whisper_threads,
+        progress=job.events.progress,
+        log=job.events.message,
+    )
+
+
+def write_minutes(
+    job: MeetingJob,
+    utterances: list[AlignedUtterance],
+    speaker_map: dict[str, str],
+    transcription_segments: list[TranscriptionSegment],
+    summary: bool = False,
+    index: bool = True,
+    first_step: int = 6,
+    total_steps: int = 7,
+) -> Path:
+    """Summarize (or save the prompt file), write the minutes and index them.
+
+    For pipelines that are not a stage graph (process_tracks).
+
+    Args:
+        job: The meeting being processed.
+        utterances: Speaker-labeled utterances with names applied.
+        speaker_map: Mapping of speaker labels to names.
+        transcription_segments: The segments the utterances were made
+            from, whose words go into the archive.
+        summary: Use Claude API for automatic summarization.
+        index: Add the utterances to the full-text search index.
+        first_step: Number of the summary step in the progress output.
+        total_steps: Total number of steps in the progress output.
+
+    Returns:
+        Path to the output .md file.
+    """
+    meeting_summary: MeetingSummary | None = None
+    if summary:
+        with job.events.stage("summarize", first_step, total_steps, TITLES["summarize"]):
+            meeting_summary = _summarize(job, utterances)
+    else:
+        with job.events.stage("prompt", first_step, total_steps, TITLES["prompt"]):
+            _save_prompt(job, utterances)
+
+    with job.events.stage("write", first_step + 1, total_steps, TITLES["write"]):
+        result_path = _write(job, utterances, speaker_map, meeting_summary,
+                             transcription_segments, index, None, False)
+    _report_done(job, result_path, summary, None)
+    return result_path
+
+
+def _summarize(job: MeetingJob, utterances: list[AlignedUtterance]) -> MeetingSummary:
+    """Summarize the meeting with the Claude API."""
+    meeting_summary = summarize_meeting(utterances, job.events.message)
+    job.events.message("  Summary generated")
+    return meeting_summary
+
+
+def _save_prompt(job: MeetingJob, utterances: list[AlignedUtterance]) -> Path:
+    """Write the .prompt.txt file for summarizing the meeting with any LLM."""
+    prompt_path = job.output_path.with_suffix(".prompt.txt")
+    save_prompt_file(utterances, prompt_path, job.events.message)
+    return prompt_path
+
+
+def _write(
+    job: MeetingJob,
+    utterances: list[AlignedUtterance],
+    speaker_map: dict[str, str],
+    meeting_summary: MeetingSummary | None,
+    transcription_segments: list[TranscriptionSegment],
+    index: bool,
+    note: str | None,
+    keep_summary: bool,
+) -> Path:
+    """Write the minutes, their archive and their search index entries.
+
+    Draft minutes (those with a note) get no archive and aren't offered for
+    reuse as a duplicate; the minutes replacing them get both.
+    """
+    draft = note is not None
+    if job.start is not None or job.end is not None:
+        end = format_timestamp(job.offset + job.duration)
+        covered = (f"Covers {format_timestamp(job.offset)} to {end} of the recording; "
+                   f"timestamps are those of the full recording.")
+        note = f"{note} {covered}" if note else covered
+    transcript = MeetingTranscript(
+        source_file=job.input_path,
+        duration_seconds=job.duration,
+        utterances=utterances,
+        speaker_map=speaker_map,
+    )
+    content = format_meeting_minutes(transcript, meeting_summary, note)
+    if keep_summary and meeting_summary is None and job.output_path.exists():
+        content = carry_over_summary(job.output_path.read_text(encoding="utf-8"), content)
+    result_path = write_output(content, job.output_path, job.events.message)
+    if not draft:
+        archive_meeting(result_path, transcript, _shift(transcription_segments, job.offset),
+                        job.events.message)
+    if index:
+        index_meeting(result_path, transcript, job.events.message)
+    if job.fingerprint is not None and not draft:
+        remember_fingerprint(job, result_path)
+    return result_path
+
+
+def _report_done(job: MeetingJob, result_path: Path, summary: bool, note: str | None) -> None:
+    """Print where the minutes are and what to do next."""
+    if note is not None:
+        click.echo(f"\nDraft minutes saved to: {result_path}")
+        return
+    click.echo(f"\nDone! Meeting minutes saved to: {result_path}")
+    if not summary:
+        click.echo(f"  To add a summary, paste {job.output_path.with_suffix('.prompt.txt').name} into any LLM.")
+
+
+def meeting_graph(
+    job: MeetingJob,
+    threads: ThreadAllocation,
+    whisper_threads: int,
+    speakers: str | None = None,
+    no_interactive: bool = False,
+    num_speakers: int | None = None,
+    device: str = "cpu",
+    whisper_model: str = "large-v3",
+    transcribe_mode: str = "sequential",
+    batch_size: int = 16,
+    compute_type: str | None = None,
+    diarization_window: float | None = None,
+    diarization_overlap: float = 60.0,
+    diarization_workers: int = 1,
+    summary: bool = False,
+    index: bool = True,
+    dedup: bool = True,
+    selective_model: str | None = None,
+    note: str | None = None,
+    keep_summary: bool = False,
+) -> StageGraph:
+    """The stages of process_meeting for one job, as a graph for run_graph.
+
+    Values passed between the stages:
+
+        input_path -> audio, duration, duplicate_of             (decode)
+        audio -> diarization_segments                           (diarize)
+        audio [+ diarization_segments in turns mode]
+              -> transcription_segments, turn_speakers          (transcribe)
+        ... -> aligned_utterances -> speaker_map -> utterances  (align, name_speakers, label)
+        utterances -> summary | prompt_path                     (summarize, prompt)
+        utterances, speaker_map, transcription_segments, summary | prompt_path
+              -> minutes_path                                   (write)
+
+    Stages work only on these values, so a stage taken from a StageMemo
+    gives the later stages exactly what running it would. The job holds
+    what describes the recording as a whole: its range, duration and
+    fingerprint (set by decode), and the temporary files cleanup_job removes.
+
+    Diarization and transcription are independent except in turns mode,
+    so run_graph can run them concurrently. With selective_model, the
+    transcription is a draft whose low-confidence regions the "selective"
+    stage re-transcribes with that model.
+    """
+    def decode(input_path):
+        _decode(job, input_path, threads, dedup)
+        return {"audio": job.audio, "duration": job.duration, "duplicate_of": job.duplicate_of}
+
+    def diarize(audio):
+        return {"diarization_segments": _diarize(
+            job, audio, threads, num_speakers, device, diarization_window,
+            diarization_overlap, diarization_workers,
+        )}
+
+    transcribed = "draft_segments" if selective_model else "transcription_segments"
+
+    def transcribe(audio, diarization_segments=None):
+        segments, turn_speakers = _transcribe(
+            job, audio, diarization_segments, whisper_threads, whisper_model, device,
+            transcribe_mode, batch_size, compute_type,
+        )
+        return {transcribed: segments, "turn_speakers": turn_speakers}
+
+    def selective(audio, draft_segments):
+        return {"transcription_segments": _refine_low_confidence(
+            job, audio, draft_segments, whisper_threads, selective_model, device,
+            batch_size, compute_type,
+        )}
+
+    def align(diarization_segments, transcription_segments, turn_speakers):
+        return {"aligned_utterances": _align_and_cache(
+            job, diarization_segments, transcription_segments, turn_speakers,
+        )}
+
+    def name_speakers(aligned_utterances):
+        return {"speaker_map": _name_speakers(aligned_utterances, speakers, no_interactive)}
+
+    def label(aligned_utterances, speaker_map):
+        return {"utterances": _label(job, aligned_utterances, speaker_map)}
+
+    def summarize(utterances):
+        return {"summary": _summarize(job, utterances)}
+
+    def prompt(utterances):
+        return {"prompt_path": _save_prompt(job, utterances)}
+
+    def write(utterances, speaker_map, transcription_segments, summary=None, prompt_path=None):
+        return {"minutes_path": _write(job, utterances, speaker_map, summary,
+                                       transcription_segments, index, note, keep_summary)}
+
+    transcribe_inputs = ("audio",)
+    if transcribe_mode == "turns":
+        transcribe_inputs += ("diarization_segments",)
+    stages = [
+        Stage("decode", decode, ("input_path",),
+              ("audio", "duration", "duplicate_of"), TITLES["decode"], key=dedup),
+        Stage("diarize", diarize, ("audio",), ("diarization_segments",),
+              TITLES["diarize"],
+              key=(num_speakers, device, diarization_window, diarization_overlap)),
+        Stage("transcribe", transcribe, transcribe_inputs, (transcribed, "turn_speakers"),
+              TITLES["transcribe"],
+              key=(whisper_model, device, transcribe_mode, batch_size, compute_type)),
+        Stage("align", align, ("diarization_segments", "transcription_segments", "turn_speakers"),
+              ("aligned_utterances",), TITLES["align"]),
+        Stage("name_speakers", name_speakers, ("aligned_utterances",), ("speaker_map",),
+              TITLES["name_speakers"], key=(speakers, no_interactive)),
+        Stage("label", label, ("aligned_utterances", "speaker_map"), ("utterances",)),
+        Stage("summarize", summarize, ("utterances",), ("summary",), TITLES["summarize"]),
+        Stage("prompt", prompt, ("utterances",), ("prompt_path",), TITLES["prompt"]),
+        Stage("write", write,
+              ("utterances", "speaker_map", "transcription_segments",
+               "summary" if summary else "prompt_path"),
+              ("minutes_path",), TITLES["write"], key=(index, note, keep_summary)),
+    ]
+    if selective_model:
+        stages.append(Stage(
+            "selective", selective, ("audio", "draft_segments"), ("transcription_segments",),
+            TITLES["selective"], key=(selective_model, device, batch_size, compute_type),
+        ))
+    return StageGraph(stages)
+
+
+def archive_meeting(
+    minutes_path: Path,
+    transcript: MeetingTranscript,
+    segments: list[TranscriptionSegment],
+    log: Callable[[str], None] = click.echo,
+) -> None:
+    """Write the meeting's transcript and words to the archive next to its minutes.
+
+    Like the search index, the archive is a by-product of the minutes, so
+    failing to write it is reported (to log) but doesn't fail the run.
+    """
+    words = [word for segment in segments for word in segment.words]
+    try:
+        write_archive(archive_path_for(minutes_path), transcript, words)
+    except OSError as e:
+        log(f"  Warning: could not write the transcript archive: {e}")
+
+
+def index_meeting(
+    minutes_path: Path,
+    transcript: MeetingTranscript,
+    log: Callable[[str], None] = click.echo,
+) -> None:
+    """Add a meeting to the search index, dated by the recording's modification time.
+
+    The minutes are already written at this point, so an index that can't
+    be updated is reported (to log) but doesn't fail the run.
+    """
+    try:
+        meeting_date = date.fromtimestamp(transcript.source_file.stat().st_mtime)
+    except OSError:
+        meeting_date = None
+    try:
+        count = SearchIndex().add_meeting(
+            minutes_path,
+            transcript.source_file,
+            transcript.duration_seconds,
+            transcript.utterances,
+            meeting_date,
+        )
+    except (sqlite3.Error, OSError) as e:
+        log(f"  Warning: could not update the search index: {e}")
+        return
+    log(f"  Indexed {count} utterances for search")
+
+
+def remember_fingerprint(job: MeetingJob, minutes_path: Path) -> None:
+    """Add the job's fingerprint to the index so later copies are recognised."""
+    try:
+        FingerprintIndex().add(minutes_path, job.input_path, job.duration, job.fingerprint,
+                               job.settings)
+    except (sqlite3.Error, OSError) as e:
+        job.events.message(f"  Warning: could not update the fingerprint index: {e}")
+
+
+def cleanup_job(job: MeetingJob) -> None:
+    """Delete the temporary wav file (only if we created it rather than using the input).
+
+    Shared samples are deleted too; cleanup runs once no stage reads them any more.
+    """
+    if job.samples is not None:
+        job.samples.release()
+        job.samples = None
+    if job.needs_cleanup and job.audio_path.exists():
+        job.audio_path.unlink()
+        click.echo(f"  Cleaned up temporary file: {job.audio_path.name}")
 
 
 def process_meeting(
@@ -27,9 +766,33 @@ def process_meeting(
     summary: bool = False,
     no_interactive: bool = False,
     device: str = "cpu",
+    transcribe_mode: str = "sequential",
+    batch_size: int = 16,
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+    cpus: int | None = None,
+    jobs_per_host: int | None = None,
+    diarization_window: float | None = None,
+    diarization_overlap: float = 60.0,
+    diarization_workers: int = 1,
+    cache: bool = True,
+    index: bool = True,
+    deadline: float | None = None,
+    speed_profile: Path | None = None,
+    draft_model: str | None = None,
+    selective: bool = False,
+    dedup: bool = True,
+    events: EventEmitter | None = None,
+    parallel_stages: bool = False,
+    only: str = "minutes",
+    isolation: StageLimits | None = None,
+    start: float | None = None,
+    end: float | None = None,
 ) -> Path:
     """Run the full meeting processing pipeline.
 
+    The steps are the stages of meeting_graph, run by stage_graph.run_graph.
+
     Args:
         input_path: Path to the input file (.m4a, .mp4, etc.).
         output_path: Path for the output .md file.
@@ -39,76 +802,337 @@ def process_meeting(
         summary: Use Claude API for automatic summarization.
         no_interactive: Skip interactive speaker naming.
         device: Device to run models on ("cpu" or "cuda").
+        transcribe_mode: Whisper inference mode ("sequential", "batched", or
+            "turns" to transcribe only the speaker turns found by diarization).
+        batch_size: Whisper batch size (batched and turns modes).
+        compute_type: CTranslate2 compute type (default depends on device).
+        cpu_threads: CPU threads for Whisper inference (0 = use the core budget).
+        cpus: Core budget for this host (default: MEETING_TOOL_CPUS or all CPUs).
+        jobs_per_host: Jobs sharing the budget (default: MEETING_TOOL_JOBS or 1).
+        diarization_window: Diarize in windows of this many seconds (default: whole file).
+        diarization_overlap: Overlap between diarization windows in seconds.
+        diarization_workers: Number of diarization windows processed in parallel.
+        cache: Keep intermediate results next to the output so the recluster
+            command can re-run speaker clustering without redoing inference.
+        index: Add the utterances to the full-text search index.
+        deadline: Seconds the run may take. The Whisper model (and compute
+            type, unless given) is then chosen from the host's speed profile
+            instead of whisper_model; see the calibrate command.
+        speed_profile: Speed profile file used with deadline (default:
+            MEETING_TOOL_SPEED_PROFILE or ~/.meeting_tool/speed_profile.json).
+        draft_model: Progressive mode: first write draft minutes transcribed
+            with this fast model (e.g. "base"), then re-transcribe with
+            whisper_model and replace them. Diarization runs only once.
+        selective: With draft_model, re-transcribe only the regions the
+            draft model was unsure about with whisper_model and write the
+            minutes once (not supported in turns mode).
+        dedup: Fingerprint the audio and, if the same recording was
+            processed before, copy its minutes instead of processing it.
+        events: Receives stage and progress events (default: print the
+            step headers, as the CLI does); see the events module.
+        parallel_stages: Run diarization and transcription at the same
+            time, splitting the core budget between them (not in turns mode,
+            where transcription needs the diarization).
+        only: "minutes" for the full run, or "prompt" to stop once the
+            .prompt.txt file is written (no minutes, archive or index entry).
+        isolation: Run decoding, diarization and transcription each in a
+            supervised child process with these limits; a stage that fails,
+            runs out of memory or times out raises isolation.StageFailed.
+            The models are then loaded by each child.
+        start: Process the recording from this many seconds on. Only the
+            range from start to end is decoded, diarized and transcribed;
+            the minutes, prompt file, archive and search index still use
+            the timestamps of the whole recording. The default output is
+            named after the range, and duplicate detection is skipped.
+        end: Process the recording up to this many seconds.
+
+    Returns:
+        Path to the output .md file (the .prompt.txt file with only="prompt").
+    """
+    if selective and draft_model is None:
+        raise ValueError("Selective re-transcription needs a draft model for the first pass")
+    if selective and transcribe_mode == "turns":
+        raise ValueError("Selective re-transcription is not supported in turns mode")
+    if only not in ONLY_TARGETS:
+        raise ValueError(f"Unknown output: {only} (expected one of {', '.join(ONLY_TARGETS)})")
+    validate_range(start, end)
+    if start is not None or end is not None:
+        # A fingerprint of part of a recording is not comparable to whole ones
+        dedup = False
+    progressive = draft_model is not None and not selective
+    if progressive and only != "minutes":
+        raise ValueError("Progressive mode always writes the minutes; drop --draft-model")
+
+    if deadline is not None:
+        whisper_model, compute_type = select_model_for_deadline(
+            input_path, deadline, device, transcribe_mode, compute_type, start, end,
+            speed_profile,
+        )
+
+    job = start_job(input_path, output_path, cache, events, isolation, start, end)
+    job.settings = minutes_settings(dict(
+        speakers=speakers, num_speakers=num_speakers, whisper_model=whisper_model,
+        compute_type=compute_type, transcribe_mode=transcribe_mode,
+        diarization_window=diarization_window, diarization_overlap=diarization_overlap,
+        draft_model=draft_model if selective else None, selective=selective, summary=summary,
+    ))
+    # Diarization and transcription running side by side read the same samples
+    job.share_samples = job.share_samples or parallel_stages
+
+    threads = plan_threads(cpus, jobs_per_host, concurrent_stages=parallel_stages)
+    whisper_threads = cpu_threads or threads.whisper_threads
+    click.echo(f"\nThread budget: torch={threads.torch_threads}, "
+               f"whisper={whisper_threads}, ffmpeg={threads.ffmpeg_threads}")
+
+    def graph(**overrides) -> StageGraph:
+        settings = dict(
+            speakers=speakers, no_interactive=no_interactive, num_speakers=num_speakers,
+            device=device, whisper_model=whisper_model, transcribe_mode=transcribe_mode,
+            batch_size=batch_size, compute_type=compute_type,
+            diarization_window=diarization_window, diarization_overlap=diarization_overlap,
+            diarization_workers=diarization_workers, summary=summary, index=index, dedup=dedup,
+        )
+        settings.update(overrides)
+        return meeting_graph(job, threads, whisper_threads, **settings)
+
+    target = ONLY_TARGETS[only]
+    memo = StageMemo()
+    workers = 2 if parallel_stages else 1
+    try:
+        if progressive:
+            first = graph(
+                whisper_model=draft_model, summary=False,
+                note=f"Draft transcript ({draft_model} model). This file is replaced "
+                     f"by the {whisper_model} transcript when it is ready.",
+            )
+        else:
+            first = graph(whisper_model=draft_model or whisper_model,
+                          selective_model=whisper_model if selective else None)
+        values = run_graph(first, [target], {"input_path": job.input_path}, memo, workers,
+                           job.events, halt=lambda v: v.get("duplicate_of") is not None)
+        if job.duplicate_of is not None:
+            return reuse_duplicate(job)
+        if only == "prompt":
+            click.echo(f"\nDone! Prompt file saved to: {values['prompt_path']}")
+            return values["prompt_path"]
+        if not progressive:
+            _report_done(job, values["minutes_path"], summary, None)
+            return values["minutes_path"]
+
+        click.echo(f"\nDraft minutes saved to: {values['minutes_path']}")
+        click.echo(f"\nRefining: re-transcribing with {whisper_model}...")
+        try:
+            # Decoding and diarization come from the memo, and the names
+            # given in the first pass are kept
+            refined = run_graph(
+                graph(keep_summary=True),
+                ["minutes_path"],
+                {"input_path": values["input_path"], "speaker_map": values["speaker_map"]},
+                memo, workers, job.events,
+            )
+        except Exception:
+            click.echo(f"\n  Refinement failed; the draft minutes remain at {job.output_path}")
+            raise
+        _report_done(job, refined["minutes_path"], summary, None)
+        return refined["minutes_path"]
+    finally:
+        cleanup_job(job)
+
+
+def select_model_for_deadline(
+    input_path: Path,
+    deadline: float,
+    device: str = "cpu",
+    transcribe_mode: str = "sequential",
+    compute_type: str | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    profile_path: Path | None = None,
+) -> tuple[str, str]:
+    """Choose the most accurate Whisper model that processes the recording in time.
+
+    With start or end, only that part of the recording is counted. The
+    speeds come from the profile at profile_path (default: see
+    speed_profile.default_profile_path).
+
+    Returns:
+        (whisper model size, compute type).
+
+    Raises:
+        ValueError: If the host has not been calibrated for the device and mode.
+    """
+    from .speed_profile import SpeedProfile, choose_model
+
+    duration = get_audio_duration(input_path)
+    duration = max(0.0, min(duration, end if end is not None else duration) - (start or 0.0))
+    choice = choose_model(SpeedProfile(profile_path), duration, deadline, device, transcribe_mode, compute_type)
+    click.echo(f"Deadline {deadline / 60:.1f} min for {duration / 60:.1f} min of audio: "
+               f"using {choice.model} ({choice.compute_type}), "
+               f"estimated {choice.estimated_seconds / 60:.1f} min")
+    if not choice.fits:
+        click.echo("  Warning: no calibrated model is fast enough; using the fastest one")
+    return choice.model, choice.compute_type
+
+
+def process_tracks(
+    tracks: list[Path],
+    output_path: Path,
+    speakers: str | None = None,
+    whisper_model: str = "large-v3",
+    summary: bool = False,
+    device: str = "cpu",
+    transcribe_mode: str = "sequential",
+    batch_size: int = 16,
+    compute_type: str | None = None,
+    cpus: int | None = None,
+    workers: int = 1,
+    index: bool = True,
+    events: EventEmitter | None = None,
+) -> Path:
+    """Produce meeting minutes from one audio track per participant.
+
+    Each track is transcribed on its own (several at a time with workers)
+    and labeled with its participant, so diarization is skipped entirely.
+    The per-track utterances are then merged into one timeline.
+
+    Args:
+        tracks: Audio files, one per participant (e.g. Zoom's "Audio Record" files).
+        output_path: Path for the output .md file.
+        speakers: Speaker mapping string overriding the names taken from
+            the file names, e.g. "SPEAKER_00=Alice".
+        whisper_model: Whisper model size to use.
+        summary: Use Claude API for automatic summarization.
+        device: Device to run models on ("cpu" or "cuda").
+        transcribe_mode: Whisper inference mode ("sequential" or "batched").
+        batch_size: Whisper batch size (batched mode only).
+        compute_type: CTranslate2 compute type (default depends on device).
+        cpus: Core budget for this host (default: MEETING_TOOL_CPUS or all CPUs).
+        workers: Number of tracks transcribed at the same time.
+        index: Add the utterances to the full-text search index.
+        events: Receives stage events (default: print the step headers).
 
     Returns:
         Path to the output .md file.
     """
-    if output_path is None:
-        output_path = input_path.with_suffix(".md")
+    from .multitrack import track_name, transcribe_tracks
+
+    if not tracks:
+        raise ValueError("No audio tracks given")
+
+    # Each worker gets an equal share of the core budget
+    threads = plan_threads(cpus, jobs=min(workers, len(tracks)))
+    labels = [f"SPEAKER_{i:02d}" for i in range(len(tracks))]
+    events = events or EventEmitter()
+    events.input_path = tracks[0].parent if len({t.parent for t in tracks}) == 1 else tracks[0]
 
-    # Step 1: Prepare audio
-    click.echo("\n[1/7] Preparing audio...")
-    needs_cleanup = input_path.suffix.lower() != ".wav"
-    audio_path = prepare_audio(input_path)
-    duration = get_audio_duration(audio_path)
+    with events.stage("transcribe", 1, 5,
+                      f"Transcribing {len(tracks)} tracks with {workers} worker(s)"):
+        results = transcribe_tracks(
+            tracks,
+            {
+                "model_size": whisper_model,
+                "device": device,
+                "mode": transcribe_mode,
+                "batch_size": batch_size,
+                "compute_type": compute_type,
+                "cpu_threads": threads.whisper_threads,
+            },
+            workers=workers,
+            ffmpeg_threads=threads.ffmpeg_threads,
+        )
 
-    # Step 2: Diarize speakers
-    click.echo("\n[2/7] Running speaker diarization...")
-    diarization_segments = run_diarization(
-        audio_path, num_speakers=num_speakers, device=device
+    with events.stage("merge", 2, 5, "Merging tracks"):
+        utterances = merge_tracks([
+            track_utterances(segments, label)
+            for (segments, _), label in zip(results, labels)
+        ])
+        click.echo(f"  Merged {len(utterances)} utterances")
+
+    with events.stage("name_speakers", 3, 5, "Mapping speaker names"):
+        speaker_map = {label: track_name(track) for label, track in zip(labels, tracks)}
+        if speakers:
+            speaker_map.update(parse_speaker_string(speakers))
+        for label, track in zip(labels, tracks):
+            click.echo(f"  {label} -> {speaker_map[label]} ({track.name})")
+        utterances = apply_speaker_names(utterances, speaker_map)
+
+    job = MeetingJob(
+        input_path=events.input_path,
+        output_path=output_path,
+        duration=max(duration for _, duration in results),
+        events=events,
     )
+    segments = [segment for track_segments, _ in results for segment in track_segments]
+    return write_minutes(job, utterances, speaker_map, segments, summary, index,
+                         first_step=4, total_steps=5)
 
-    # Step 3: Transcribe audio
-    click.echo("\n[3/7] Transcribing audio...")
-    transcription_segments = run_transcription(
-        audio_path, model_size=whisper_model, device=device
+
+def recluster_meeting(
+    markdown_path: Path,
+    num_speakers: int | None = None,
+    threshold: float | None = None,
+    speakers: str | None = None,
+    device: str = "cpu",
+) -> Path:
+    """Regenerate meeting minutes with a different speaker clustering.
+
+    Uses the cache written by process_meeting: the cached segmentation and
+    embeddings are re-clustered, and the cached transcription is re-aligned
+    against the new speaker segments. No audio is decoded and neither
+    Whisper nor the embedding model is run.
+
+    Args:
+        markdown_path: Path to the .md file generated by process_meeting.
+        num_speakers: Expected number of speakers.
+        threshold: Clustering distance threshold (lower = more speakers).
+        speakers: CLI speaker mapping string for the new labels.
+        device: Device to run on ("cpu" or "cuda").
+
+    Returns:
+        Path to the rewritten .md file.
+    """
+    from .diarization import recluster_diarization
+
+    cache_dir = cache_dir_for(markdown_path)
+    info = load_meeting_info(cache_dir)
+    state = load_diarization_state(cache_dir)
+    transcription_segments = load_transcription(cache_dir)
+
+    click.echo("\n[1/3] Re-clustering speakers from cached embeddings...")
+    diarization_segments = recluster_diarization(
+        state, num_speakers=num_speakers, threshold=threshold, device=device
     )
+    # The cached embeddings are in the times of the processed range
+    diarization_segments = _shift(diarization_segments, info.get("offset_seconds", 0.0))
+    save_diarization(diarization_segments, cache_dir)
 
-    # Step 4: Align transcription with diarization
-    click.echo("\n[4/7] Aligning transcript with speakers...")
+    click.echo("\n[2/3] Aligning cached transcript with new speakers...")
     utterances = align_transcript(transcription_segments, diarization_segments)
     click.echo(f"  Aligned {len(utterances)} utterances")
 
-    # Step 5: Name speakers
-    click.echo("\n[5/7] Mapping speaker names...")
-    if speakers:
-        speaker_map = parse_speaker_string(speakers)
-    elif no_interactive:
-        speaker_map = {}
-    else:
-        speaker_map = interactive_speaker_naming(utterances)
-
+    # Old names belonged to the old labels, so only an explicit mapping applies
+    speaker_map = parse_speaker_string(speakers) if speakers else {}
     utterances = apply_speaker_names(utterances, speaker_map)
+    info["speaker_map"] = speaker_map
+    save_meeting_info(info, cache_dir)
 
-    # Step 6: Summarize
-    meeting_summary: MeetingSummary | None = None
-    if summary:
-        click.echo("\n[6/7] Generating summary via API...")
-        meeting_summary = summarize_meeting(utterances)
-        click.echo("  Summary generated")
-    else:
-        click.echo("\n[6/7] Saving prompt file for manual summarization...")
-        prompt_path = output_path.with_suffix(".prompt.txt")
+    click.echo("\n[3/3] Writing output...")
+    prompt_path = markdown_path.with_suffix(".prompt.txt")
+    if prompt_path.exists():
         save_prompt_file(utterances, prompt_path)
 
-    # Step 7: Format and write output
-    click.echo("\n[7/7] Writing output...")
     transcript = MeetingTranscript(
-        source_file=input_path,
-        duration_seconds=duration,
+        source_file=Path(info["source_file"]),
+        duration_seconds=info["duration_seconds"],
         utterances=utterances,
         speaker_map=speaker_map,
     )
-    content = format_meeting_minutes(transcript, meeting_summary)
-    result_path = write_output(content, output_path)
-
-    click.echo(f"\nDone! Meeting minutes saved to: {result_path}")
-    if not summary:
-        click.echo(f"  To add a summary, paste {output_path.with_suffix('.prompt.txt').name} into any LLM.")
-
-    # Clean up temporary wav file (only if we created it from a non-wav source)
-    if needs_cleanup and audio_path.exists() and audio_path.suffix == ".wav":
-        audio_path.unlink()
-        click.echo(f"  Cleaned up temporary file: {audio_path.name}")
+    content = format_meeting_minutes(transcript)
+    if markdown_path.exists():
+        content = carry_over_summary(markdown_path.read_text(encoding="utf-8"), content)
+    result_path = write_output(content, markdown_path)
+    archive_meeting(result_path, transcript, transcription_segments)
+    index_meeting(result_path, transcript)
 
+    click.echo(f"\nDone! Re-clustered minutes saved to: {result_path}")
     return result_path
@@ -0,0 +1,117 @@
+"""CPU core budgeting shared by torch, CTranslate2 and ffmpeg."""
+
+import os
+from dataclasses import dataclass
+
+# Environment variables that set the budget when no CLI option is given
+CPUS_ENV_VAR = "MEETING_TOOL_CPUS"
+JOBS_ENV_VAR = "MEETING_TOOL_JOBS"
+
+
+@dataclass
+class ThreadAllocation:
+    """Thread counts handed to each library for one job."""
+    torch_threads: int
+    whisper_threads: int
+    ffmpeg_threads: int
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _read_positive_int(name: str) -> int | None:
+    """Read a positive integer from an environment variable, if set."""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a positive integer, got: {value!r}")
+    if number < 1:
+        raise ValueError(f"{name} must be a positive integer, got: {value!r}")
+    return number
+
+
+def resolve_cpu_budget(cpus: int | None = None) -> int:
+    """Resolve the total core budget for this host.
+
+    Order of precedence: the explicit argument, the MEETING_TOOL_CPUS
+    environment variable, then every CPU available to the process.
+    """
+    if cpus is None:
+        cpus = _read_positive_int(CPUS_ENV_VAR)
+    if cpus is None:
+        cpus = available_cpus()
+    if cpus < 1:
+        raise ValueError(f"CPU budget must be at least 1, got: {cpus}")
+    return cpus
+
+
+def resolve_jobs_per_host(jobs: int | None = None) -> int:
+    """Resolve how many jobs share the budget (argument, then MEETING_TOOL_JOBS, then 1)."""
+    if jobs is None:
+        jobs = _read_positive_int(JOBS_ENV_VAR)
+    if jobs is None:
+        jobs = 1
+    if jobs < 1:
+        raise ValueError(f"Jobs per host must be at least 1, got: {jobs}")
+    return jobs
+
+
+def allocate_threads(
+    budget: int,
+    jobs: int = 1,
+    concurrent_stages: bool = False,
+) -> ThreadAllocation:
+    """Split a core budget into per-library thread counts for one job.
+
+    With one job per host the job gets the whole budget. With several jobs
+    per host each job gets an equal share, so the sum never exceeds the
+    budget. Within a job, stages that run one after another can each use
+    the full share; when diarization (torch) and transcription (CTranslate2)
+    run concurrently the share is split between them instead.
+
+    Args:
+        budget: Total number of cores available on the host.
+        jobs: Number of jobs running side by side on the host.
+        concurrent_stages: Whether diarization and transcription overlap.
+
+    Returns:
+        ThreadAllocation for a single job.
+    """
+    if budget < 1:
+        raise ValueError(f"CPU budget must be at least 1, got: {budget}")
+    if jobs < 1:
+        raise ValueError(f"Jobs per host must be at least 1, got: {jobs}")
+
+    per_job = max(1, budget // jobs)
+    if concurrent_stages:
+        torch_threads = max(1, per_job // 2)
+        whisper_threads = max(1, per_job - torch_threads)
+    else:
+        torch_threads = per_job
+        whisper_threads = per_job
+
+    return ThreadAllocation(
+        torch_threads=torch_threads,
+        whisper_threads=whisper_threads,
+        ffmpeg_threads=per_job,
+    )
+
+
+def plan_threads(
+    cpus: int | None = None,
+    jobs: int | None = None,
+    concurrent_stages: bool = False,
+) -> ThreadAllocation:
+    """Resolve the budget and job count, then allocate threads for one job."""
+    return allocate_threads(
+        resolve_cpu_budget(cpus),
+        jobs=resolve_jobs_per_host(jobs),
+        concurrent_stages=concurrent_stages,
+    )
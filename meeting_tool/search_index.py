@@ -0,0 +1,223 @@
+"""Full-text search over processed meetings, backed by SQLite FTS5."""
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from .models import AlignedUtterance
+from .sqlite_store import DATA_DIR, SqliteStore, path_from_env
+
+# Environment variable that moves the index away from the default location
+INDEX_PATH_ENV_VAR = "MEETING_TOOL_INDEX"
+
+DEFAULT_INDEX_PATH = DATA_DIR / "search.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    minutes_path TEXT NOT NULL UNIQUE,
+    source_file TEXT NOT NULL,
+    meeting_date TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+    speaker_label TEXT NOT NULL,
+    speaker_name TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS utterances_meeting ON utterances (meeting_id, start);
+CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(
+    text, content='utterances', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS utterances_ai AFTER INSERT ON utterances BEGIN
+    INSERT INTO utterances_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS utterances_ad AFTER DELETE ON utterances BEGIN
+    INSERT INTO utterances_fts (utterances_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+@dataclass
+class SearchHit:
+    """One utterance matching a search query."""
+    minutes_path: str
+    meeting_date: str
+    speaker_name: str
+    start: float
+    end: float
+    text: str
+    snippet: str
+
+
+def default_index_path() -> Path:
+    """Index location: MEETING_TOOL_INDEX if set, else ~/.meeting_tool/search.db."""
+    return path_from_env(INDEX_PATH_ENV_VAR, DEFAULT_INDEX_PATH)
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse "SS", "MM:SS" or "HH:MM:SS" (seconds may have decimals) into seconds."""
+    if not re.fullmatch(r"\d+(:\d{1,2}){0,2}(\.\d+)?", value.strip()):
+        raise ValueError(f"Invalid timestamp: {value!r} (expected HH:MM:SS, MM:SS or seconds)")
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+class SearchIndex(SqliteStore):
+    """Inverted index of utterances from every processed meeting.
+
+    Each meeting is keyed by the path of its minutes file. Indexing a
+    meeting again replaces only that meeting's utterances, so the index is
+    kept up to date incrementally as meetings are processed, renamed or
+    re-clustered.
+    """
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, db_path: Path | None = None):
+        super().__init__(db_path or default_index_path())
+
+    def _setup_connection(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    def add_meeting(
+        self,
+        minutes_path: Path,
+        source_file: Path,
+        duration_seconds: float,
+        utterances: list[AlignedUtterance],
+        meeting_date: date | None = None,
+    ) -> int:
+        """Index a meeting, replacing any earlier version of it.
+
+        Args:
+            minutes_path: Path of the .md file; identifies the meeting.
+            source_file: Recording the minutes were generated from.
+            duration_seconds: Length of the recording.
+            utterances: Speaker-labeled utterances of the meeting.
+            meeting_date: Date of the meeting (default: today).
+
+        Returns:
+            Number of utterances indexed.
+        """
+        meeting_date = meeting_date or date.today()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM meetings WHERE minutes_path = ?",
+                         (str(minutes_path.resolve()),))
+            meeting_id = conn.execute(
+                "INSERT INTO meetings "
+                "(minutes_path, source_file, meeting_date, duration_seconds, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(minutes_path.resolve()), str(source_file), meeting_date.isoformat(),
+                 duration_seconds, time.time()),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO utterances "
+                "(meeting_id, speaker_label, speaker_name, start, end, text) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(meeting_id, u.speaker_label, u.speaker_name, u.start, u.end, u.text)
+                 for u in utterances],
+            )
+        return len(utterances)
+
+    def rename_speakers(self, minutes_path: Path, speaker_map: dict[str, str]) -> int:
+        """Update speaker names of an indexed meeting.
+
+        Returns:
+            Number of utterances updated.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM meetings WHERE minutes_path = ?",
+                               (str(minutes_path.resolve()),)).fetchone()
+            if row is None:
+                return 0
+            updated = 0
+            for label, name in speaker_map.items():
+                updated += conn.execute(
+                    "UPDATE utterances SET speaker_name = ? "
+                    "WHERE meeting_id = ? AND speaker_label = ?",
+                    (name, row["id"], label),
+                ).rowcount
+        return updated
+
+    def remove_meeting(self, minutes_path: Path) -> bool:
+        """Drop a meeting from the index. Returns False if it was not indexed."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM meetings WHERE minutes_path = ?",
+                                (str(minutes_path.resolve()),)).rowcount > 0
+
+    def search(
+        self,
+        query: str,
+        speaker: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Find utterances matching a full-text query, best matches first.
+
+        Args:
+            query: FTS5 query: words (all must match), "quoted phrases",
+                OR, NOT and prefix* searches.
+            speaker: Only utterances by this speaker name or label (case-insensitive).
+            since: Only meetings on or after this date.
+            until: Only meetings on or before this date.
+            start: Only utterances ending after this many seconds into the meeting.
+            end: Only utterances starting before this many seconds into the meeting.
+            limit: Maximum number of hits.
+
+        Returns:
+            Matching utterances with a highlighted snippet.
+        """
+        sql = (
+            "SELECT m.minutes_path, m.meeting_date, u.speaker_name, u.start, u.end, u.text, "
+            "snippet(utterances_fts, 0, '[', ']', '...', 16) AS snippet "
+            "FROM utterances_fts "
+            "JOIN utterances u ON u.id = utterances_fts.rowid "
+            "JOIN meetings m ON m.id = u.meeting_id "
+            "WHERE utterances_fts MATCH ?"
+        )
+        params: list = [query]
+        if speaker is not None:
+            sql += " AND (u.speaker_name = ? COLLATE NOCASE OR u.speaker_label = ? COLLATE NOCASE)"
+            params += [speaker, speaker]
+        if since is not None:
+            sql += " AND m.meeting_date >= ?"
+            params.append(since.isoformat())
+        if until is not None:
+            sql += " AND m.meeting_date <= ?"
+            params.append(until.isoformat())
+        if start is not None:
+            sql += " AND u.end > ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND u.start < ?"
+            params.append(end)
+        sql += " ORDER BY bm25(utterances_fts), m.meeting_date DESC, u.start LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}")
+        return [SearchHit(**dict(row)) for row in rows]
+
+    def stats(self) -> dict:
+        """Number of indexed meetings and utterances."""
+        with self._connect() as conn:
+            meetings = conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+            utterances = conn.execute("SELECT COUNT(*) FROM utterances").fetchone()[0]
+        return {"meetings": meetings, "utterances": utterances}
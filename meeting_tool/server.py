@@ -0,0 +1,385 @@
+"""Long-running server: warm model workers fed from a persistent job queue.
+
+The HTTP API (over TCP or a Unix socket) only touches the SQLite job store,
+so submitting a job returns immediately. Worker processes load the models
+once at start-up, then claim queued jobs one at a time and run the normal
+pipeline with those warm models.
+
+Endpoints:
+    POST /jobs        Submit {"input_path": ..., "output_path": ..., "options": {...}}
+    GET  /jobs        List recent jobs (?status=queued|running|done|failed)
+    GET  /jobs/<id>   Job status and result
+    GET  /stats       Queue depth, throughput and live worker count
+    GET  /health      Liveness check
+"""
+
+import json
+import multiprocessing
+import socketserver
+import stat
+import traceback
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import click
+
+from .jobstore import JobStore
+from .model_registry import preload, set_memory_budget
+from .resources import plan_threads
+
+DEFAULT_DB_PATH = Path.home() / ".meeting_tool" / "jobs.db"
+DEFAULT_PORT = 8765
+
+# Seconds an idle worker waits before checking the queue again
+POLL_INTERVAL_SECONDS = 1.0
+
+# Whisper inference modes process_meeting accepts
+TRANSCRIBE_MODES = ("sequential", "batched", "turns")
+
+# process_meeting keyword arguments a client may set per job: the type of
+# their value, or the values allowed. Options whose default is None may be null
+JOB_OPTIONS = {
+    "speakers": str,
+    "num_speakers": int,
+    "whisper_model": str,
+    "summary": bool,
+    "transcribe_mode": TRANSCRIBE_MODES,
+    "batch_size": int,
+    "compute_type": str,
+    "diarization_window": float,
+    "diarization_overlap": float,
+    "diarization_workers": int,
+    "cache": bool,
+    "index": bool,
+    "dedup": bool,
+}
+_NULLABLE_OPTIONS = {"speakers", "num_speakers", "compute_type", "diarization_window"}
+
+# Options that count something, so must be at least 1
+_COUNT_OPTIONS = {"num_speakers", "batch_size", "diarization_workers"}
+
+# How errors name the expected type of an option
+_TYPE_NAMES = {str: "a string", int: "an integer", float: "a number", bool: "true or false"}
+
+
+def validate_options(options: dict) -> None:
+    """Check the job options a client sent, so bad ones fail at submit time.
+
+    Raises:
+        ValueError: If an option is unknown or its value has the wrong type
+            or is out of range.
+    """
+    unknown = set(options) - JOB_OPTIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+    for name, value in options.items():
+        expected = JOB_OPTIONS[name]
+        if value is None and name in _NULLABLE_OPTIONS:
+            continue
+        if isinstance(expected, tuple):
+            if value not in expected:
+                raise ValueError(f"{name} must be one of {', '.join(expected)}, got {value!r}")
+            continue
+        # JSON has one number type; bools are ints to Python but not to clients
+        if expected is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif expected is int:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, expected)
+        if not valid:
+            raise ValueError(f"{name} must be {_TYPE_NAMES[expected]}, got {value!r}")
+        if name in _COUNT_OPTIONS and value < 1:
+            raise ValueError(f"{name} must be at least 1, got {value}")
+        if expected is float and value < 0:
+            raise ValueError(f"{name} must not be negative, got {value}")
+
+
+
+@dataclass
+class WorkerConfig:
+    """Settings shared by all worker processes of one server."""
+    db_path: Path
+    device: str
+    whisper_model: str
+    compute_type: str | None
+    transcribe_mode: str
+    cpus: int | None
+    workers: int
+    model_memory: int | None = None
+
+    def job_defaults(self) -> dict:
+        """process_meeting arguments used unless a job overrides them."""
+        return {
+            "device": self.device,
+            "whisper_model": self.whisper_model,
+            "compute_type": self.compute_type,
+            "transcribe_mode": self.transcribe_mode,
+            "cpus": self.cpus,
+            "jobs_per_host": self.workers,
+        }
+
+
+def _preload_models(config: WorkerConfig) -> None:
+    """Load the models every job needs, with the settings jobs will ask for."""
+    if config.model_memory is not None:
+        set_memory_budget(config.model_memory)
+    threads = plan_threads(config.cpus, config.workers)
+    preload(
+        whisper_models=[config.whisper_model],
+        device=config.device,
+        compute_type=config.compute_type,
+        cpu_threads=threads.whisper_threads,
+    )
+
+
+def _worker_main(config: WorkerConfig, name: str, stop_event) -> None:
+    """Worker process: warm up models, then process queued jobs until stopped."""
+    from .pipeline import process_meeting
+
+    store = JobStore(config.db_path)
+    try:
+        click.echo(f"[{name}] Loading models...")
+        _preload_models(config)
+        click.echo(f"[{name}] Ready")
+
+        while not stop_event.is_set():
+            job = store.claim(name)
+            if job is None:
+                stop_event.wait(POLL_INTERVAL_SECONDS)
+                continue
+
+            click.echo(f"[{name}] Job {job.id}: {job.input_path}")
+            try:
+                result_path = process_meeting(
+                    input_path=Path(job.input_path),
+                    output_path=Path(job.output_path) if job.output_path else None,
+                    no_interactive=True,
+                    **{**config.job_defaults(), **job.options},
+                )
+            except Exception as e:
+                store.fail(job.id, f"{e}\n{traceback.format_exc()}")
+                click.echo(f"[{name}] Job {job.id} failed: {e}")
+            else:
+                store.complete(job.id, str(result_path))
+                click.echo(f"[{name}] Job {job.id} done: {result_path}")
+    except KeyboardInterrupt:
+        pass
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the job store."""
+
+    server_version = "MeetingTool"
+
+    def _send_json(self, status: int, data) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        """Send a JSON error response."""
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        """Serve health, stats and job lookups."""
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        store: JobStore = self.server.store
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok"})
+        elif parts == ["stats"]:
+            stats = store.stats()
+            stats["workers_alive"] = sum(p.is_alive() for p in self.server.worker_processes)
+            self._send_json(200, stats)
+        elif parts == ["jobs"]:
+            query = parse_qs(url.query)
+            status = query.get("status", [None])[0]
+            try:
+                limit = int(query.get("limit", ["100"])[0])
+            except ValueError:
+                self._send_error(400, "limit must be an integer")
+                return
+            self._send_json(200, [asdict(j) for j in store.list_jobs(status, limit)])
+        elif len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = store.get(int(parts[1]))
+            if job is None:
+                self._send_error(404, f"No job with id {parts[1]}")
+            else:
+                self._send_json(200, asdict(job))
+        else:
+            self._send_error(404, f"Unknown path: {url.path}")
+
+    def do_POST(self):
+        """Validate and queue a new job."""
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send_error(404, f"Unknown path: {self.path}")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            request = None
+        if not isinstance(request, dict):
+            self._send_error(400, "Request body must be a JSON object")
+            return
+
+        input_path = request.get("input_path")
+        if not input_path:
+            self._send_error(400, "input_path is required")
+            return
+        input_path = Path(input_path).expanduser().resolve()
+        if not input_path.exists():
+            self._send_error(400, f"File not found: {input_path}")
+            return
+
+        options = request.get("options") or {}
+        if not isinstance(options, dict):
+            self._send_error(400, "options must be a JSON object")
+            return
+        try:
+            validate_options(options)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+
+        output_path = request.get("output_path")
+        if output_path:
+            output_path = str(Path(output_path).expanduser().resolve())
+
+        job = self.server.store.submit(str(input_path), output_path, options)
+        self._send_json(202, asdict(job))
+
+    def log_message(self, format, *args):
+        """Log requests through click instead of raw stderr."""
+        click.echo(f"[http] {format % args}")
+
+
+def _is_socket(path: Path) -> bool:
+    """Whether path exists and is a Unix socket."""
+    try:
+        return stat.S_ISSOCK(path.stat().st_mode)
+    except OSError:
+        return False
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    """Delete a socket left behind by an earlier server so a new one can bind the path.
+
+    Raises:
+        FileExistsError: If something other than a socket exists at the path.
+    """
+    if _is_socket(socket_path):
+        socket_path.unlink()
+    elif socket_path.exists() or socket_path.is_symlink():
+        raise FileExistsError(f"{socket_path} exists and is not a socket; "
+                              f"choose another path for the server's socket")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ("local", 0)
+
+
+def create_server(
+    store: JobStore,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+    worker_processes: list | None = None,
+):
+    """Create the HTTP API server (not yet serving).
+
+    Args:
+        store: Job store the API reads and writes.
+        host: Interface to bind for TCP.
+        port: TCP port (0 = pick a free port).
+        socket_path: Listen on this Unix socket instead of TCP. A socket
+            already at the path is replaced; any other file is left alone.
+        worker_processes: Worker processes reported by /stats.
+
+    Returns:
+        A socketserver instance; call serve_forever() to run it.
+
+    Raises:
+        FileExistsError: If socket_path exists and is not a socket.
+    """
+    if socket_path is not None:
+        remove_stale_socket(socket_path)
+        server = _UnixHTTPServer(str(socket_path), _JobRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _JobRequestHandler)
+    server.store = store
+    server.worker_processes = worker_processes or []
+    return server
+
+
+def serve(
+    config: WorkerConfig,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+) -> None:
+    """Start worker processes and serve the job API until interrupted.
+
+    Args:
+        config: Worker settings (database, device, models, core budget).
+        host: Interface to bind for TCP.
+        port: TCP port.
+        socket_path: Listen on this Unix socket instead of TCP.
+
+    Raises:
+        FileExistsError: If socket_path exists and is not a socket.
+    """
+    if socket_path is not None:
+        # Before any worker starts, so a bad path fails at once
+        remove_stale_socket(socket_path)
+    store = JobStore(config.db_path)
+    requeued = store.requeue_running()
+    if requeued:
+        click.echo(f"Requeued {requeued} job(s) left running by a previous server")
+
+    # spawn keeps CUDA and the model libraries out of the parent process
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    workers = [
+        context.Process(
+            target=_worker_main,
+            args=(config, f"worker-{i}", stop_event),
+            name=f"meeting-tool-worker-{i}",
+            daemon=True,
+        )
+        for i in range(config.workers)
+    ]
+    for process in workers:
+        process.start()
+
+    server = create_server(store, host, port, socket_path, workers)
+    where = socket_path if socket_path is not None else f"http://{host}:{server.server_address[1]}"
+    click.echo(f"Serving on {where} with {config.workers} worker(s), jobs in {config.db_path}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\nShutting down...")
+    finally:
+        server.server_close()
+        stop_event.set()
+        for process in workers:
+            process.join(timeout=10)
+        if socket_path is not None and _is_socket(socket_path):
+            socket_path.unlink()
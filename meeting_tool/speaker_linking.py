@@ -0,0 +1,277 @@
+"""Windowed diarization helpers: window planning, cross-window speaker linking and stitching."""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from .models import DiarizationSegment
+
+# Minimum cosine similarity for a window-local speaker to join a global speaker.
+# Roughly matches pyannote 3.1's clustering threshold (euclidean distance 0.7045
+# between unit-length embeddings).
+LINK_SIMILARITY_THRESHOLD = 0.75
+
+# Same-speaker segments closer than this after stitching are joined
+STITCH_GAP_SECONDS = 0.05
+
+
+@dataclass
+class DiarizationWindow:
+    """A slice of the recording diarized on its own.
+
+    Segments are kept only inside [own_start, own_end), so each instant of
+    the recording is owned by exactly one window even where windows overlap.
+    """
+    start: float
+    end: float
+    own_start: float
+    own_end: float
+
+
+def plan_windows(
+    duration: float,
+    window_seconds: float,
+    overlap_seconds: float,
+) -> list[DiarizationWindow]:
+    """Split a recording into fixed-length overlapping windows.
+
+    Args:
+        duration: Recording length in seconds.
+        window_seconds: Length of each window.
+        overlap_seconds: Overlap between consecutive windows.
+
+    Returns:
+        Windows covering [0, duration], in order.
+    """
+    if window_seconds <= 0:
+        raise ValueError(f"Window length must be positive, got: {window_seconds}")
+    if not 0 <= overlap_seconds < window_seconds:
+        raise ValueError(
+            f"Window overlap must be between 0 and the window length, got: {overlap_seconds}"
+        )
+
+    if duration <= window_seconds:
+        return [DiarizationWindow(start=0.0, end=duration, own_start=0.0, own_end=duration)]
+
+    step = window_seconds - overlap_seconds
+    starts = [0.0]
+    while starts[-1] + window_seconds < duration:
+        starts.append(starts[-1] + step)
+
+    windows = []
+    for i, start in enumerate(starts):
+        end = min(start + window_seconds, duration)
+        # Ownership switches halfway through each overlap
+        own_start = 0.0 if i == 0 else windows[-1].own_end
+        own_end = duration if i == len(starts) - 1 else starts[i + 1] + overlap_seconds / 2
+        windows.append(DiarizationWindow(start=start, end=end, own_start=own_start, own_end=own_end))
+    return windows
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length."""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def link_speakers(
+    window_embeddings: list[dict[str, np.ndarray]],
+    num_speakers: int | None = None,
+    threshold: float = LINK_SIMILARITY_THRESHOLD,
+    speaker_times: list[dict[str, float]] | None = None,
+) -> list[dict[str, str]]:
+    """Link window-local speakers to global SPEAKER_xx labels by embedding similarity.
+
+    Windows are visited in order. Each local speaker joins the most similar
+    global speaker (cosine similarity of centroids) if it clears the
+    threshold and no other local speaker of the same window took it;
+    otherwise it starts a new global speaker. Global centroids are running
+    means of their members. If num_speakers is given, the closest global
+    speakers are then merged until only that many remain, and speakers
+    without a usable embedding join the speaker nearest to them in time
+    (or the one with the most members, without speaker_times).
+
+    Args:
+        window_embeddings: Per window, a mapping of local label to embedding.
+        num_speakers: Expected total number of speakers (optional).
+        threshold: Minimum cosine similarity to link two speakers.
+        speaker_times: Per window, the middle of each local speaker's speech
+            in recording time (optional).
+
+    Returns:
+        Per window, a mapping of local label to global label.
+    """
+    centroids: list[np.ndarray | None] = []
+    counts: list[int] = []
+    assignments: list[dict[str, int]] = []
+
+    for embeddings in window_embeddings:
+        assignment: dict[str, int] = {}
+        local_vectors = {
+            label: _normalize(np.asarray(emb, dtype=np.float64))
+            for label, emb in embeddings.items()
+            if np.all(np.isfinite(emb))
+        }
+
+        # Greedy one-to-one matching, most similar pairs first
+        candidates = []
+        for label, vector in local_vectors.items():
+            for idx, centroid in enumerate(centroids):
+                if centroid is None:
+                    continue
+                similarity = float(np.dot(vector, _normalize(centroid)))
+                if similarity >= threshold:
+                    candidates.append((similarity, label, idx))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        taken: set[int] = set()
+        for _, label, idx in candidates:
+            if label in assignment or idx in taken:
+                continue
+            assignment[label] = idx
+            taken.add(idx)
+
+        for label in embeddings:
+            if label in assignment:
+                continue
+            # Speakers without a usable embedding (too little speech) stay on their own
+            centroids.append(None)
+            counts.append(0)
+            assignment[label] = len(centroids) - 1
+
+        for label, idx in assignment.items():
+            if label not in local_vectors:
+                continue
+            counts[idx] += 1
+            if centroids[idx] is None:
+                centroids[idx] = local_vectors[label].copy()
+            else:
+                centroids[idx] = centroids[idx] + (local_vectors[label] - centroids[idx]) / counts[idx]
+        assignments.append(assignment)
+
+    # Collapse to the expected number of speakers by merging closest centroids
+    parent = list(range(len(centroids)))
+    if num_speakers is not None:
+        active = [i for i in range(len(centroids)) if centroids[i] is not None]
+        while len(active) > max(num_speakers, 1):
+            best = None
+            for a_pos, a in enumerate(active):
+                for b in active[a_pos + 1:]:
+                    similarity = float(np.dot(_normalize(centroids[a]), _normalize(centroids[b])))
+                    if best is None or similarity > best[0]:
+                        best = (similarity, a, b)
+            _, keep, drop = best
+            total = counts[keep] + counts[drop]
+            centroids[keep] = (centroids[keep] * counts[keep] + centroids[drop] * counts[drop]) / total
+            counts[keep] = total
+            parent[drop] = keep
+            active.remove(drop)
+
+    def root(idx: int) -> int:
+        while parent[idx] != idx:
+            idx = parent[idx]
+        return idx
+
+    if num_speakers is not None:
+        _attach_unembedded(centroids, counts, assignments, speaker_times, parent, root)
+
+    # Number global speakers in order of first appearance
+    labels: dict[int, str] = {}
+    result = []
+    for assignment in assignments:
+        mapping = {}
+        for local_label, idx in assignment.items():
+            global_idx = root(idx)
+            if global_idx not in labels:
+                labels[global_idx] = f"SPEAKER_{len(labels):02d}"
+            mapping[local_label] = labels[global_idx]
+        result.append(mapping)
+    return result
+
+
+def _attach_unembedded(
+    centroids: list[np.ndarray | None],
+    counts: list[int],
+    assignments: list[dict[str, int]],
+    speaker_times: list[dict[str, float]] | None,
+    parent: list[int],
+    root: Callable[[int], int],
+) -> None:
+    """Merge each speaker without a centroid into the nearest speaker that has one.
+
+    Nearest is the speaker whose members talk closest in time to it; without
+    speaker_times, the speaker with the most members.
+    """
+    clustered = {root(i) for i in range(len(centroids)) if centroids[i] is not None}
+    if not clustered:
+        return
+    times: dict[int, list[float]] = {}
+    if speaker_times is not None:
+        for assignment, window_times in zip(assignments, speaker_times):
+            for label, idx in assignment.items():
+                if label in window_times:
+                    times.setdefault(idx, []).append(window_times[label])
+
+    for idx in range(len(centroids)):
+        if centroids[idx] is not None or parent[idx] != idx:
+            continue
+
+        def distance(target: int) -> float:
+            if not times.get(idx):
+                return float("inf")
+            member_times = [t for member, ts in times.items()
+                            if centroids[member] is not None and root(member) == target
+                            for t in ts]
+            return min((abs(a - b) for a in times[idx] for b in member_times),
+                       default=float("inf"))
+
+        parent[idx] = min(clustered, key=lambda target: (distance(target), -counts[target]))
+
+
+def stitch_segments(
+    windows: list[DiarizationWindow],
+    window_segments: list[list[DiarizationSegment]],
+    speaker_maps: list[dict[str, str]],
+) -> list[DiarizationSegment]:
+    """Combine per-window segments into one global timeline.
+
+    Window segments use window-relative times and local labels. They are
+    shifted to recording time, clipped to the window's owned range,
+    relabelled with global speakers, and same-speaker segments that were
+    cut at a window boundary are joined back together.
+
+    Args:
+        windows: The windows that were diarized.
+        window_segments: Segments returned for each window.
+        speaker_maps: Local-to-global label mapping for each window.
+
+    Returns:
+        List of DiarizationSegment sorted by start time.
+    """
+    stitched: list[DiarizationSegment] = []
+    for window, segments, speaker_map in zip(windows, window_segments, speaker_maps):
+        for seg in segments:
+            start = max(seg.start + window.start, window.own_start)
+            end = min(seg.end + window.start, window.own_end)
+            if end <= start:
+                continue
+            stitched.append(DiarizationSegment(
+                start=start,
+                end=end,
+                speaker_label=speaker_map.get(seg.speaker_label, seg.speaker_label),
+            ))
+
+    stitched.sort(key=lambda s: (s.start, s.end))
+
+    # Join same-speaker pieces that were split at an ownership boundary
+    merged: list[DiarizationSegment] = []
+    last_by_speaker: dict[str, DiarizationSegment] = {}
+    for seg in stitched:
+        prev = last_by_speaker.get(seg.speaker_label)
+        if prev is not None and seg.start - prev.end <= STITCH_GAP_SECONDS:
+            prev.end = max(prev.end, seg.end)
+            continue
+        merged.append(seg)
+        last_by_speaker[seg.speaker_label] = seg
+    return merged
@@ -0,0 +1,299 @@
+"""Measured transcription speed per Whisper model, and deadline-driven model choice.
+
+The calibrate command times each model size and compute type on this host
+and stores the real-time factors (RTF: processing seconds per second of
+audio) in a JSON profile. With --deadline, process picks the most accurate
+model whose estimated processing time fits in the deadline.
+"""
+
+import json
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import click
+
+from .sqlite_store import DATA_DIR, path_from_env
+
+# Environment variable that moves the profile away from the default location
+PROFILE_PATH_ENV_VAR = "MEETING_TOOL_SPEED_PROFILE"
+
+DEFAULT_PROFILE_PATH = DATA_DIR / "speed_profile.json"
+
+# Whisper model sizes from least to most accurate
+MODEL_ACCURACY_ORDER = ("tiny", "base", "small", "medium", "large-v3")
+
+# Compute types from least to most precise (more precise is slightly more accurate)
+COMPUTE_TYPE_ORDER = ("int8", "int8_float16", "int8_bfloat16", "bfloat16", "float16", "float32")
+
+# Share of the deadline planned for diarization and transcription; the rest
+# is left for decoding, alignment and writing the minutes
+DEADLINE_SAFETY_FACTOR = 0.9
+
+# Model name recorded for the diarization measurement
+DIARIZATION = "diarization"
+
+
+@dataclass
+class SpeedMeasurement:
+    """Measured speed of one model configuration on this host."""
+    model: str
+    device: str
+    compute_type: str | None
+    transcribe_mode: str | None
+    rtf: float
+    threads: int
+    audio_seconds: float
+    measured_at: float
+    # Seconds it took to load the model, paid once per run on top of the RTF
+    load_seconds: float = 0.0
+
+    def matches(self, other: "SpeedMeasurement") -> bool:
+        """True if both measure the same configuration."""
+        return (self.model, self.device, self.compute_type, self.transcribe_mode) == (
+            other.model, other.device, other.compute_type, other.transcribe_mode
+        )
+
+
+@dataclass
+class ModelChoice:
+    """The configuration picked for a deadline and its estimated processing time."""
+    model: str
+    compute_type: str
+    estimated_seconds: float
+    fits: bool
+
+
+def default_profile_path() -> Path:
+    """Profile location: MEETING_TOOL_SPEED_PROFILE if set, else ~/.meeting_tool/speed_profile.json."""
+    return path_from_env(PROFILE_PATH_ENV_VAR, DEFAULT_PROFILE_PATH)
+
+
+class SpeedProfile:
+    """Speed measurements for one host, stored as JSON.
+
+    Measurements are keyed by model, device, compute type and transcribe
+    mode; measuring a configuration again replaces the earlier result.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or default_profile_path()
+        self.host = platform.node()
+        self.measurements: list[SpeedMeasurement] = []
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.host = data.get("host", self.host)
+            self.measurements = [SpeedMeasurement(**m) for m in data.get("measurements", [])]
+
+    def add(self, measurement: SpeedMeasurement) -> None:
+        """Record a measurement, replacing any earlier one of the same configuration."""
+        self.measurements = [m for m in self.measurements if not m.matches(measurement)]
+        self.measurements.append(measurement)
+
+    def save(self) -> None:
+        """Write the profile to its JSON file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "host": platform.node(),
+            "measurements": [asdict(m) for m in self.measurements],
+        }
+        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+    def diarization(self, device: str) -> SpeedMeasurement | None:
+        """The diarization measurement for a device, if calibrated."""
+        for m in self.measurements:
+            if m.model == DIARIZATION and m.device == device:
+                return m
+        return None
+
+    def diarization_rtf(self, device: str) -> float | None:
+        """Measured diarization RTF on a device, if calibrated."""
+        diarization = self.diarization(device)
+        return diarization.rtf if diarization is not None else None
+
+    def whisper_measurements(self, device: str, transcribe_mode: str) -> list[SpeedMeasurement]:
+        """Whisper measurements for a device and transcribe mode."""
+        return [
+            m for m in self.measurements
+            if m.model != DIARIZATION and m.device == device and m.transcribe_mode == transcribe_mode
+        ]
+
+
+def _accuracy_rank(measurement: SpeedMeasurement) -> tuple[int, int]:
+    """Sort key ranking configurations from least to most accurate."""
+    def rank(order: tuple[str, ...], value: str | None) -> int:
+        return order.index(value) if value in order else -1
+    return (
+        rank(MODEL_ACCURACY_ORDER, measurement.model),
+        rank(COMPUTE_TYPE_ORDER, measurement.compute_type),
+    )
+
+
+def choose_model(
+    profile: SpeedProfile,
+    audio_seconds: float,
+    deadline_seconds: float,
+    device: str = "cpu",
+    transcribe_mode: str = "sequential",
+    compute_type: str | None = None,
+) -> ModelChoice:
+    """Pick the most accurate Whisper configuration that finishes before the deadline.
+
+    The estimate is the time to load both models plus (diarization RTF +
+    Whisper RTF) * audio length, and it must fit in DEADLINE_SAFETY_FACTOR
+    of the deadline. If nothing fits, the fastest configuration is returned
+    with fits=False.
+
+    Turns mode runs the batched pipeline on the speech turns only, so
+    without turns measurements the batched ones are used as an upper bound.
+
+    Args:
+        profile: Measurements for this host.
+        audio_seconds: Length of the recording.
+        deadline_seconds: Time allowed for processing the recording.
+        device: Device the models will run on.
+        transcribe_mode: Whisper inference mode that will be used.
+        compute_type: Only consider this compute type (default: any measured).
+
+    Raises:
+        ValueError: If the profile has no measurements for the device and mode.
+    """
+    candidates = profile.whisper_measurements(device, transcribe_mode)
+    if not candidates and transcribe_mode == "turns":
+        candidates = profile.whisper_measurements(device, "batched")
+    if compute_type is not None:
+        candidates = [m for m in candidates if m.compute_type == compute_type]
+    if not candidates:
+        wanted = f"{device}, {transcribe_mode} mode" + (f", {compute_type}" if compute_type else "")
+        raise ValueError(
+            f"No speed measurements for {wanted} in {profile.path}.\n"
+            f"Run: python main.py calibrate --device {device} --transcribe-mode {transcribe_mode}"
+        )
+
+    diarization = profile.diarization(device)
+    diarization_rtf = diarization.rtf if diarization is not None else 0.0
+    diarization_load = diarization.load_seconds if diarization is not None else 0.0
+    budget = deadline_seconds * DEADLINE_SAFETY_FACTOR
+
+    def estimate(m: SpeedMeasurement) -> float:
+        return diarization_load + m.load_seconds + (diarization_rtf + m.rtf) * audio_seconds
+
+    fitting = [m for m in candidates if estimate(m) <= budget]
+    if fitting:
+        best = max(fitting, key=lambda m: (_accuracy_rank(m), -m.rtf))
+    else:
+        best = min(candidates, key=estimate)
+    return ModelChoice(
+        model=best.model,
+        compute_type=best.compute_type,
+        estimated_seconds=estimate(best),
+        fits=bool(fitting),
+    )
+
+
+def calibrate(
+    audio_path: Path,
+    models: list[str],
+    compute_types: list[str],
+    device: str = "cpu",
+    transcribe_mode: str = "sequential",
+    batch_size: int = 16,
+    cpus: int | None = None,
+    diarization: bool = True,
+    profile: SpeedProfile | None = None,
+) -> SpeedProfile:
+    """Measure the RTF of each model and compute type on a sample recording.
+
+    Each model is loaded before the clock starts, so the RTF covers only
+    inference; the loading time is recorded separately (load_seconds). The
+    model is unloaded again afterwards to keep memory use flat, so every
+    load is a cold one.
+
+    Args:
+        audio_path: Sample recording (a few minutes of speech is enough).
+        models: Whisper model sizes to measure.
+        compute_types: CTranslate2 compute types to measure for each model.
+        device: Device to run the models on.
+        transcribe_mode: Whisper inference mode to measure ("sequential",
+            "batched" or "turns"; turns mode diarizes the sample first).
+        batch_size: Whisper batch size (batched mode).
+        cpus: Core budget, as for process (default: MEETING_TOOL_CPUS or all CPUs).
+        diarization: Also measure the diarization pipeline.
+        profile: Profile to add the measurements to (default: the stored profile).
+
+    Returns:
+        The updated profile (not yet saved).
+    """
+    from .audio import get_audio_duration, prepare_audio
+    from .model_registry import get_registry
+    from .resources import plan_threads
+    from .transcription import load_whisper_model, run_transcription, run_turn_transcription
+
+    profile = profile or SpeedProfile()
+    threads = plan_threads(cpus)
+    audio = prepare_audio(audio_path, threads=threads.ffmpeg_threads)
+    try:
+        duration = get_audio_duration(audio)
+        turns = None
+        if diarization or transcribe_mode == "turns":
+            from .diarization import load_diarization_pipeline, run_diarization
+            click.echo("\nMeasuring diarization..." if diarization
+                       else "\nDiarizing the sample for turns mode...")
+            start = time.perf_counter()
+            load_diarization_pipeline(device)
+            diarization_load = time.perf_counter() - start
+            start = time.perf_counter()
+            turns = run_diarization(audio, device=device, num_threads=threads.torch_threads)
+            elapsed = time.perf_counter() - start
+            get_registry().clear()
+        if diarization:
+            profile.add(SpeedMeasurement(
+                model=DIARIZATION, device=device, compute_type=None, transcribe_mode=None,
+                rtf=elapsed / duration, threads=threads.torch_threads,
+                audio_seconds=duration, measured_at=time.time(), load_seconds=diarization_load,
+            ))
+            click.echo(f"  diarization: RTF {elapsed / duration:.3f}, "
+                       f"loaded in {diarization_load:.1f}s")
+
+        for model in models:
+            for compute_type in compute_types:
+                click.echo(f"\nMeasuring {model} ({compute_type}, {transcribe_mode})...")
+                start = time.perf_counter()
+                load_whisper_model(model, device, compute_type, threads.whisper_threads)
+                load_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                if transcribe_mode == "turns":
+                    run_turn_transcription(
+                        audio,
+                        turns,
+                        model_size=model,
+                        device=device,
+                        batch_size=batch_size,
+                        compute_type=compute_type,
+                        cpu_threads=threads.whisper_threads,
+                    )
+                else:
+                    run_transcription(
+                        audio,
+                        model_size=model,
+                        device=device,
+                        mode=transcribe_mode,
+                        batch_size=batch_size,
+                        compute_type=compute_type,
+                        cpu_threads=threads.whisper_threads,
+                    )
+                elapsed = time.perf_counter() - start
+                profile.add(SpeedMeasurement(
+                    model=model, device=device, compute_type=compute_type,
+                    transcribe_mode=transcribe_mode, rtf=elapsed / duration,
+                    threads=threads.whisper_threads, audio_seconds=duration,
+                    measured_at=time.time(), load_seconds=load_seconds,
+                ))
+                click.echo(f"  {model} ({compute_type}): RTF {elapsed / duration:.3f}, "
+                           f"loaded in {load_seconds:.1f}s")
+                get_registry().clear()
+    finally:
+        if audio != audio_path and audio.exists():
+            audio.unlink()
+    return profile
@@ -0,0 +1,51 @@
+"""Shared plumbing for the SQLite databases kept under ~/.meeting_tool."""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+# Directory holding the tool's databases unless an environment variable moves them
+DATA_DIR = Path.home() / ".meeting_tool"
+
+
+def path_from_env(env_var: str, default: Path) -> Path:
+    """The path in env_var if it is set, else default."""
+    value = os.getenv(env_var, "").strip()
+    return Path(value).expanduser() if value else default
+
+
+class SqliteStore:
+    """A SQLite database in WAL mode whose schema is created on first use.
+
+    Subclasses set SCHEMA and may override _setup_connection for per-connection
+    pragmas, or _migrate to upgrade databases created by older versions.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            self._migrate(conn)
+
+    def _setup_connection(self, conn: sqlite3.Connection) -> None:
+        """Prepare a freshly opened connection."""
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring an existing database up to date with SCHEMA."""
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and always closes."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        self._setup_connection(conn)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
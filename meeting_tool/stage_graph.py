@@ -0,0 +1,253 @@
+"""Run a pipeline declared as a graph of stages with named inputs and outputs.
+
+A stage is a function that takes some named values and returns others.
+The executor works out from the requested outputs which stages are
+needed, runs each stage once its inputs exist (independent stages
+concurrently, given workers), and can remember stage outputs so a later
+run with the same settings and inputs reuses them instead of re-running.
+
+    graph = StageGraph([
+        Stage("decode", decode, inputs=("input_path",), outputs=("audio_path",)),
+        Stage("transcribe", transcribe, inputs=("audio_path",), outputs=("segments",)),
+    ])
+    values = run_graph(graph, ["segments"], {"input_path": path})
+"""
+
+import contextlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from .events import EventEmitter
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a pipeline.
+
+    run is called with the input values as keyword arguments and returns a
+    dict with (at least) the output values. Stages with a title are the
+    numbered steps reported to the event emitter; untitled ones run quietly.
+    key holds the settings that change the outputs, so memoized outputs
+    are only reused for the same settings.
+    """
+    name: str
+    run: Callable[..., dict[str, Any]]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    title: str | None = None
+    key: Hashable = None
+
+
+class StageGraph:
+    """A set of stages connected by the names of the values they pass on."""
+
+    def __init__(self, stages: list[Stage]):
+        self.stages = list(stages)
+        self._producers: dict[str, Stage] = {}
+        names = set()
+        for stage in self.stages:
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            names.add(stage.name)
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"{output!r} is produced by both "
+                                     f"{self._producers[output].name} and {stage.name}")
+                self._producers[output] = stage
+
+    def producer(self, value: str) -> Stage | None:
+        """The stage that produces a value, or None for values given from outside."""
+        return self._producers.get(value)
+
+    def plan(self, targets: list[str], known: set[str] | None = None) -> list[Stage]:
+        """The stages needed to produce targets, in an order that respects their inputs.
+
+        Values in known are taken as given: their producers (and whatever
+        only those producers need) are left out.
+
+        Raises:
+            ValueError: If a needed value has no producer and is not known,
+                or if stages depend on each other in a cycle.
+        """
+        known = known or set()
+        order: list[Stage] = []
+        done: set[str] = set()
+        visiting: set[str] = set()
+
+        def need(value: str) -> None:
+            if value in known:
+                return
+            stage = self._producers.get(value)
+            if stage is None:
+                raise ValueError(f"No stage produces {value!r} and it was not given")
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Stage {stage.name} depends on its own output")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                need(name)
+            visiting.discard(stage.name)
+            done.add(stage.name)
+            order.append(stage)
+
+        for target in targets:
+            need(target)
+        return order
+
+
+class _InlineExecutor:
+    """Executor running each task at once in the calling thread.
+
+    With one worker the stages run in the caller's thread, so interactive
+    prompts and Ctrl+C behave as in a plain function call.
+    """
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        pass
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+@dataclass
+class _MemoEntry:
+    outputs: dict[str, Any]
+    # The input values are kept alive so their ids in memo keys stay unique
+    inputs: tuple[Any, ...]
+
+
+class StageMemo:
+    """Stage outputs remembered between runs, keyed by stage, settings and inputs."""
+
+    def __init__(self):
+        self._entries: dict[Hashable, _MemoEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        return entry.outputs if entry is not None else None
+
+    def put(self, key: Hashable, outputs: dict[str, Any], inputs: tuple[Any, ...]) -> None:
+        self._entries[key] = _MemoEntry(outputs, inputs)
+
+
+def run_graph(
+    graph: StageGraph,
+    targets: list[str],
+    values: dict[str, Any] | None = None,
+    memo: StageMemo | None = None,
+    workers: int = 1,
+    events: EventEmitter | None = None,
+    halt: Callable[[dict[str, Any]], bool] | None = None,
+    step_names: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run the stages needed for targets and return all values known afterwards.
+
+    Args:
+        graph: The stages.
+        targets: Names of the values wanted.
+        values: Values known beforehand; stages producing them are skipped.
+        memo: Outputs of earlier runs. A stage whose settings and inputs
+            match a remembered run is not run again; new outputs are added.
+        workers: Stages run at the same time when their inputs allow it.
+        events: Receives StageStarted/StageFinished for titled stages,
+            numbered in the order of the plan. If a stage fails while
+            others are running, the emitter is cancelled (see
+            EventEmitter.cancel) and the failure is raised without waiting
+            for them.
+        halt: Checked after every stage; once it returns True no further
+            stages are started (e.g. when the input turns out to be a
+            duplicate) and the values so far are returned.
+        step_names: Number the titled stages by their place in this list
+            instead, for callers running one plan a few stages at a time
+            (the pipelined batch executor).
+
+    Returns:
+        The given values plus the outputs of all stages that ran or were
+        taken from the memo.
+    """
+    values = dict(values or {})
+    plan = graph.plan(targets, set(values))
+
+    # Memo keys depend only on settings and where the inputs came from, so
+    # which stages will really run is known before any of them starts
+    versions: dict[str, Hashable] = {name: ("value", name, id(value)) for name, value in values.items()}
+    keys: dict[str, Hashable] = {}
+    to_run: list[Stage] = []
+    for stage in plan:
+        key = (stage.name, stage.key, tuple(versions[name] for name in stage.inputs))
+        keys[stage.name] = key
+        for output in stage.outputs:
+            versions[output] = (key, output)
+        if memo is None or memo.get(key) is None:
+            to_run.append(stage)
+    titled = [stage.name for stage in to_run if stage.title is not None]
+    steps = {name: i for i, name in enumerate(step_names or titled, start=1)}
+    total_steps = len(step_names or titled)
+
+    def execute(stage: Stage, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if stage.title is None or events is None:
+            header = contextlib.nullcontext()
+        else:
+            header = events.stage(stage.name, steps[stage.name], total_steps, stage.title)
+        with header:
+            outputs = stage.run(**kwargs)
+        missing = [name for name in stage.outputs if name not in (outputs or {})]
+        if missing:
+            raise ValueError(f"Stage {stage.name} did not produce {', '.join(missing)}")
+        return outputs
+
+    def finish(stage: Stage, outputs: dict[str, Any]) -> None:
+        for name in stage.outputs:
+            values[name] = outputs[name]
+        if memo is not None:
+            memo.put(keys[stage.name], {n: outputs[n] for n in stage.outputs},
+                     tuple(values[n] for n in stage.inputs))
+
+    pending = list(plan)
+    running: dict = {}
+    workers = max(1, workers)
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+    try:
+        while pending or running:
+            if halt is not None and halt(values):
+                pending.clear()
+            for stage in list(pending):
+                if len(running) >= workers:
+                    break
+                if not all(name in values for name in stage.inputs):
+                    continue
+                pending.remove(stage)
+                remembered = memo.get(keys[stage.name]) if memo is not None else None
+                if remembered is not None:
+                    values.update(remembered)
+                else:
+                    kwargs = {name: values[name] for name in stage.inputs}
+                    running[executor.submit(execute, stage, kwargs)] = stage
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    finish(stage, future.result())
+                except BaseException:
+                    # Stop the stages still running instead of waiting for them
+                    if running and events is not None:
+                        events.cancel()
+                    for other in running:
+                        other.cancel()
+                    raise
+    finally:
+        executor.shutdown(wait=not running, cancel_futures=True)
+    return values
@@ -2,6 +2,7 @@
 
 import json
 from pathlib import Path
+from typing import Callable
 
 import click
 
@@ -40,12 +41,17 @@ def _format_transcript_for_prompt(utterances: list[AlignedUtterance]) -> str:
     return "\n".join(lines)
 
 
-def save_prompt_file(utterances: list[AlignedUtterance], output_path: Path) -> Path:
+def save_prompt_file(
+    utterances: list[AlignedUtterance],
+    output_path: Path,
+    log: Callable[[str], None] = click.echo,
+) -> Path:
     """Save a ready-to-paste prompt file with the transcript for manual LLM summarization.
 
     Args:
         utterances: List of speaker-labeled utterances.
         output_path: Path for the prompt .txt file.
+        log: Receives the lines describing what is done (e.g. EventEmitter.message).
 
     Returns:
         Path to the saved prompt file.
@@ -61,18 +67,22 @@ Please summarize this meeting transcript:
 {transcript_text}"""
 
     output_path.write_text(content, encoding="utf-8")
-    click.echo(f"  Prompt file saved to: {output_path}")
-    click.echo("  -> Paste its contents into any LLM (ChatGPT, Claude, Gemini, etc.) to get your summary.")
+    log(f"  Prompt file saved to: {output_path}")
+    log("  -> Paste its contents into any LLM (ChatGPT, Claude, Gemini, etc.) to get your summary.")
     return output_path
 
 
-def summarize_meeting(utterances: list[AlignedUtterance]) -> MeetingSummary:
+def summarize_meeting(
+    utterances: list[AlignedUtterance],
+    log: Callable[[str], None] = click.echo,
+) -> MeetingSummary:
     """Send the transcript to Claude API and parse the structured summary.
 
     Requires the 'anthropic' package and ANTHROPIC_API_KEY in .env.
 
     Args:
         utterances: List of speaker-labeled utterances.
+        log: Receives the lines describing what is done (e.g. EventEmitter.message).
 
     Returns:
         MeetingSummary with overview, key points, action items, and decisions.
@@ -91,7 +101,7 @@ def summarize_meeting(utterances: list[AlignedUtterance]) -> MeetingSummary:
 
     transcript_text = _format_transcript_for_prompt(utterances)
 
-    click.echo("  Generating meeting summary with Claude...")
+    log("  Generating meeting summary with Claude...")
     message = client.messages.create(
         model="claude-sonnet-4-5-20250929",
         max_tokens=4096,
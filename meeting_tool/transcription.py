@@ -1,42 +1,178 @@
 """Speech-to-text transcription using faster-whisper."""
 
 from pathlib import Path
+from typing import Callable
 
 import click
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
-from .models import TranscriptionSegment, TranscriptionWord
+from .audio import TARGET_SAMPLE_RATE
+from .model_registry import ModelKey, estimate_whisper_bytes, get_registry
+from .models import DiarizationSegment, TranscriptionSegment, TranscriptionWord
+from .turns import assign_segments, plan_turns, split_into_lanes
+from .wav import SharedSamples, open_audio
+
+TRANSCRIBE_MODES = ("sequential", "batched", "turns")
+
+# Default number of 30s chunks decoded together in batched mode
+DEFAULT_BATCH_SIZE = 16
+
+# progress(processed_seconds, total_seconds, **counters), e.g. EventEmitter.progress
+ProgressCallback = Callable[..., None]
+
+# log(line) for the lines describing what is done, e.g. EventEmitter.message
+LogCallback = Callable[[str], None]
+
+
+def default_compute_type(device: str) -> str:
+    """Pick the CTranslate2 compute type used when none is given."""
+    return "float16" if device == "cuda" else "int8"
+
+
+def load_whisper_model(
+    model_size: str,
+    device: str = "cpu",
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+    log: LogCallback = click.echo,
+) -> WhisperModel:
+    """Load a Whisper model, reusing an already loaded one with the same settings.
+
+    Loading takes many seconds for the larger models, so loaded models are
+    kept in the process-wide model registry and reused by later calls.
+    """
+    if compute_type is None:
+        compute_type = default_compute_type(device)
+
+    def load() -> WhisperModel:
+        log(f"  Loading Whisper model ({model_size}, {compute_type})...")
+        return WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+        )
+
+    key = ModelKey(
+        name="whisper",
+        size=model_size,
+        device=device,
+        compute_type=compute_type,
+        threads=cpu_threads,
+    )
+    return get_registry().get(key, load, estimate_whisper_bytes(model_size, compute_type))
+
+
+def _whisper_audio(audio_path: Path | SharedSamples) -> np.ndarray | str:
+    """What to hand faster-whisper for a recording.
+
+    Whisper works on 16kHz samples. A 16kHz PCM file or SharedSamples are
+    read as float32 straight away, instead of having faster-whisper decode
+    and resample them again. Any other file is passed by path for
+    faster-whisper to decode and resample itself; SharedSamples at another
+    rate are resampled here.
+    """
+    try:
+        wav = open_audio(audio_path)
+    except ValueError:
+        return str(audio_path)
+    if wav.sample_rate == TARGET_SAMPLE_RATE:
+        return wav.float_window()
+    if not isinstance(wav, SharedSamples):
+        return str(audio_path)
+    samples = wav.float_window()
+    num_samples = round(len(samples) * TARGET_SAMPLE_RATE / wav.sample_rate)
+    times = np.arange(num_samples) / TARGET_SAMPLE_RATE
+    return np.interp(times, np.arange(len(samples)) / wav.sample_rate, samples).astype(np.float32)
 
 
 def run_transcription(
-    audio_path: Path,
+    audio_path: Path | SharedSamples,
     model_size: str = "large-v3",
     device: str = "cpu",
+    mode: str = "sequential",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+    progress: ProgressCallback | None = None,
+    log: LogCallback = click.echo,
 ) -> list[TranscriptionSegment]:
     """Transcribe audio using faster-whisper with word-level timestamps.
 
+    In "sequential" mode the audio is decoded one 30s window at a time. In
+    "batched" mode faster-whisper's BatchedInferencePipeline splits the audio
+    on voice activity and decodes batch_size chunks per forward pass, which
+    is much faster on long recordings.
+
     Args:
-        audio_path: Path to the .wav audio file.
+        audio_path: Path to the .wav audio file, or its SharedSamples.
         model_size: Whisper model size (e.g., "large-v3", "medium", "small").
         device: Device to run on ("cpu" or "cuda").
+        mode: Inference mode ("sequential" or "batched").
+        batch_size: Number of chunks per batch (batched mode only).
+        compute_type: CTranslate2 compute type (default: float16 on CUDA, int8 on CPU).
+        cpu_threads: Number of CPU threads for CTranslate2 (0 = library default).
+        progress: Called after each segment with the audio time reached,
+            the audio duration and the segment and word counts so far.
+        log: Receives the lines describing what is done.
 
     Returns:
         List of TranscriptionSegment with word-level timestamps.
     """
-    compute_type = "float16" if device == "cuda" else "int8"
+    if mode not in TRANSCRIBE_MODES:
+        raise ValueError(
+            f"Unknown transcription mode: {mode}\n"
+            f"Supported modes: {', '.join(TRANSCRIBE_MODES)}"
+        )
+    if mode == "turns":
+        raise ValueError("The turns mode needs diarization output: use run_turn_transcription")
+    model = load_whisper_model(model_size, device, compute_type, cpu_threads, log)
 
-    click.echo(f"  Loading Whisper model ({model_size})...")
-    model = WhisperModel(model_size, device=device, compute_type=compute_type)
+    audio = _whisper_audio(audio_path)
 
-    click.echo("  Transcribing audio...")
-    segments_iter, info = model.transcribe(
-        str(audio_path),
-        language="en",
-        word_timestamps=True,
-        vad_filter=True,
-    )
+    if mode == "batched":
+        log(f"  Transcribing audio (batched, batch size {batch_size})...")
+        batched_model = BatchedInferencePipeline(model=model)
+        segments_iter, info = batched_model.transcribe(
+            audio,
+            language="en",
+            word_timestamps=True,
+            vad_filter=True,
+            batch_size=batch_size,
+        )
+    else:
+        log("  Transcribing audio...")
+        segments_iter, info = model.transcribe(
+            audio,
+            language="en",
+            word_timestamps=True,
+            vad_filter=True,
+        )
+
+    report = None
+    if progress is not None:
+        def report(end: float, segments: int, words: int) -> None:
+            progress(end, info.duration, segments=segments, words=words)
+    segments = _convert_segments(segments_iter, report)
+
+    total_words = sum(len(s.words) for s in segments)
+    log(f"  Transcription complete: {len(segments)} segments, {total_words} words")
+    return segments
 
+
+def _convert_segments(
+    segments_iter,
+    report: Callable[[float, int, int], None] | None = None,
+) -> list[TranscriptionSegment]:
+    """Convert faster-whisper segments to TranscriptionSegment objects.
+
+    faster-whisper decodes lazily while the iterator is consumed, so report
+    (if given) is called with each segment's end time and the running
+    segment and word counts as the transcription advances.
+    """
     segments = []
+    words_so_far = 0
     for segment in segments_iter:
         words = []
         if segment.words:
@@ -45,6 +181,7 @@ def run_transcription(
                     start=word.start,
                     end=word.end,
                     text=word.word.strip(),
+                    probability=word.probability,
                 ))
 
         segments.append(TranscriptionSegment(
@@ -52,8 +189,146 @@ def run_transcription(
             end=segment.end,
             text=segment.text.strip(),
             words=words,
+            avg_logprob=segment.avg_logprob,
+            no_speech_prob=segment.no_speech_prob,
         ))
-
-    total_words = sum(len(s.words) for s in segments)
-    click.echo(f"  Transcription complete: {len(segments)} segments, {total_words} words")
+        if report is not None:
+            words_so_far += len(words)
+            report(segment.end, len(segments), words_so_far)
     return segments
+
+
+def _clip_seconds_before(clips: list[tuple[float, float]], time: float) -> float:
+    """Seconds of the (start, end) clips that lie before time."""
+    return sum(min(end, time) - start for start, end in clips if start < time)
+
+
+def run_turn_transcription(
+    audio_path: Path | SharedSamples,
+    diarization_segments: list[DiarizationSegment],
+    model_size: str = "large-v3",
+    device: str = "cpu",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+    progress: ProgressCallback | None = None,
+    log: LogCallback = click.echo,
+) -> list[tuple[str, TranscriptionSegment]]:
+    """Transcribe only the speaker turns found by diarization.
+
+    The turns (see turns.plan_turns) are handed to faster-whisper's batched
+    pipeline as clip timestamps, so batch_size turns are decoded per
+    forward pass and the silence between turns is never transcribed. Each
+    resulting segment inherits the speaker of its turn. Turns that overlap
+    in time (people talking over each other) go into separate passes so
+    every segment maps back to exactly one turn.
+
+    Args:
+        audio_path: Path to the .wav audio file, or its SharedSamples.
+        diarization_segments: Speaker segments from run_diarization.
+        model_size: Whisper model size (e.g., "large-v3", "medium", "small").
+        device: Device to run on ("cpu" or "cuda").
+        batch_size: Number of turns per batch.
+        compute_type: CTranslate2 compute type (default: float16 on CUDA, int8 on CPU).
+        cpu_threads: Number of CPU threads for CTranslate2 (0 = library default).
+        progress: Called after each segment with the seconds of speech
+            transcribed, the total speech and the counts so far.
+        log: Receives the lines describing what is done.
+
+    Returns:
+        (speaker_label, TranscriptionSegment) pairs with word-level timestamps.
+    """
+    turns = plan_turns(diarization_segments)
+    if not turns:
+        log("  No speaker turns to transcribe")
+        return []
+
+    model = load_whisper_model(model_size, device, compute_type, cpu_threads, log)
+    batched_model = BatchedInferencePipeline(model=model)
+    audio = _whisper_audio(audio_path)
+
+    lanes = split_into_lanes(turns)
+    speech = sum(turn.end - turn.start for turn in turns)
+    log(f"  Transcribing {len(turns)} speaker turns ({speech:.0f}s of speech, "
+               f"batch size {batch_size})...")
+
+    labeled = []
+    done_speech = 0.0
+    done_words = 0
+    for lane in lanes:
+        clips = [(turn.start, turn.end) for turn in lane]
+        segments_iter, info = batched_model.transcribe(
+            audio,
+            language="en",
+            word_timestamps=True,
+            vad_filter=False,
+            clip_timestamps=[{"start": start, "end": end} for start, end in clips],
+            batch_size=batch_size,
+        )
+        report = None
+        if progress is not None:
+            def report(end: float, segments: int, words: int, clips=clips,
+                       done_speech=done_speech, done_words=done_words) -> None:
+                progress(done_speech + _clip_seconds_before(clips, end), speech,
+                         segments=len(labeled) + segments, words=done_words + words)
+        lane_segments = _convert_segments(segments_iter, report)
+        labeled.extend(assign_segments(lane, lane_segments))
+        done_speech += sum(end - start for start, end in clips)
+        done_words += sum(len(seg.words) for seg in lane_segments)
+
+    total_words = sum(len(seg.words) for _, seg in labeled)
+    log(f"  Transcription complete: {len(labeled)} segments, {total_words} words")
+    return labeled
+
+
+def run_span_transcription(
+    audio_path: Path | SharedSamples,
+    spans: list[tuple[float, float]],
+    model_size: str = "large-v3",
+    device: str = "cpu",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compute_type: str | None = None,
+    cpu_threads: int = 0,
+    progress: ProgressCallback | None = None,
+    log: LogCallback = click.echo,
+) -> list[TranscriptionSegment]:
+    """Transcribe only the given time spans of a recording.
+
+    Used by selective mode to re-run the low-confidence parts of a fast
+    draft through a larger model. The spans are decoded as clips by the
+    batched pipeline, batch_size spans per forward pass.
+
+    Args:
+        audio_path: Path to the .wav audio file, or its SharedSamples.
+        spans: Non-overlapping (start, end) spans in seconds, each at most 30s.
+        model_size: Whisper model size (e.g., "large-v3", "medium", "small").
+        device: Device to run on ("cpu" or "cuda").
+        batch_size: Number of spans per batch.
+        compute_type: CTranslate2 compute type (default: float16 on CUDA, int8 on CPU).
+        cpu_threads: Number of CPU threads for CTranslate2 (0 = library default).
+        progress: Called after each segment with the seconds of the spans
+            transcribed, their total length and the counts so far.
+        log: Receives the lines describing what is done.
+
+    Returns:
+        List of TranscriptionSegment with absolute word-level timestamps.
+    """
+    if not spans:
+        return []
+    model = load_whisper_model(model_size, device, compute_type, cpu_threads, log)
+    batched_model = BatchedInferencePipeline(model=model)
+    segments_iter, info = batched_model.transcribe(
+        _whisper_audio(audio_path),
+        language="en",
+        word_timestamps=True,
+        vad_filter=False,
+        clip_timestamps=[{"start": start, "end": end} for start, end in spans],
+        batch_size=batch_size,
+    )
+    report = None
+    if progress is not None:
+        total = sum(end - start for start, end in spans)
+
+        def report(end: float, segments: int, words: int) -> None:
+            progress(_clip_seconds_before(spans, end), total, segments=segments, words=words)
+    return _convert_segments(segments_iter, report)
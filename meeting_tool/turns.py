@@ -0,0 +1,128 @@
+"""Speaker turns for turn-batched transcription.
+
+In "turns" mode Whisper transcribes only the speaker turns found by
+diarization instead of the whole file. Every transcribed segment inherits
+the speaker of its turn, so alignment reduces to ordering and merging.
+"""
+
+import bisect
+
+from .alignment import MERGE_GAP_SECONDS
+from .models import AlignedUtterance, DiarizationSegment, TranscriptionSegment
+
+# Whisper decodes at most 30 seconds of audio per window
+MAX_TURN_SECONDS = 30.0
+
+# Same-speaker segments closer than this are transcribed as one turn
+TURN_JOIN_GAP_SECONDS = 0.5
+
+# Turns shorter than this rarely contain a whole word
+MIN_TURN_SECONDS = 0.2
+
+
+def plan_turns(
+    diarization_segments: list[DiarizationSegment],
+    join_gap: float = TURN_JOIN_GAP_SECONDS,
+    max_length: float = MAX_TURN_SECONDS,
+    min_length: float = MIN_TURN_SECONDS,
+) -> list[DiarizationSegment]:
+    """Turn diarization segments into clips for Whisper.
+
+    Consecutive segments of the same speaker separated by less than
+    join_gap are joined, turns longer than max_length are split into equal
+    parts that each fit one Whisper window, and very short turns are dropped.
+
+    Returns:
+        Turns sorted by start time, each at most max_length long.
+    """
+    turns: list[DiarizationSegment] = []
+    for seg in sorted(diarization_segments, key=lambda s: s.start):
+        prev = turns[-1] if turns else None
+        if prev is not None and prev.speaker_label == seg.speaker_label and seg.start - prev.end < join_gap:
+            prev.end = max(prev.end, seg.end)
+        else:
+            turns.append(DiarizationSegment(seg.start, seg.end, seg.speaker_label))
+
+    clips: list[DiarizationSegment] = []
+    for turn in turns:
+        length = turn.end - turn.start
+        if length < min_length:
+            continue
+        parts = int(-(-length // max_length))  # ceiling division
+        step = length / parts
+        for i in range(parts):
+            clips.append(DiarizationSegment(
+                start=turn.start + i * step,
+                end=turn.start + (i + 1) * step if i < parts - 1 else turn.end,
+                speaker_label=turn.speaker_label,
+            ))
+    clips.sort(key=lambda t: t.start)
+    return clips
+
+
+def split_into_lanes(turns: list[DiarizationSegment]) -> list[list[DiarizationSegment]]:
+    """Split turns into groups with no overlap inside a group.
+
+    Overlapping speech yields turns that overlap in time. Transcribing each
+    lane separately lets every output segment be traced back to exactly
+    one turn by its timestamp. Usually nearly all turns land in lane 0.
+    """
+    lanes: list[list[DiarizationSegment]] = []
+    for turn in sorted(turns, key=lambda t: t.start):
+        for lane in lanes:
+            if lane[-1].end <= turn.start:
+                lane.append(turn)
+                break
+        else:
+            lanes.append([turn])
+    return lanes
+
+
+def assign_segments(
+    lane: list[DiarizationSegment],
+    segments: list[TranscriptionSegment],
+) -> list[tuple[str, TranscriptionSegment]]:
+    """Label each transcribed segment with the speaker of the turn it came from.
+
+    Args:
+        lane: Non-overlapping turns sorted by start time.
+        segments: Whisper output for those turns, with absolute timestamps.
+
+    Returns:
+        (speaker_label, segment) pairs.
+    """
+    if not lane:
+        return []
+    starts = [turn.start for turn in lane]
+    labeled = []
+    for seg in segments:
+        midpoint = (seg.start + seg.end) / 2
+        index = max(0, bisect.bisect_right(starts, midpoint) - 1)
+        labeled.append((lane[index].speaker_label, seg))
+    return labeled
+
+
+def align_turns(labeled_segments: list[tuple[str, TranscriptionSegment]]) -> list[AlignedUtterance]:
+    """Build utterances from turn-labeled segments.
+
+    Segments are ordered by start time, and consecutive segments of the
+    same speaker less than MERGE_GAP_SECONDS apart are merged, as in
+    align_transcript.
+    """
+    merged: list[AlignedUtterance] = []
+    for speaker, seg in sorted(labeled_segments, key=lambda pair: pair[1].start):
+        if not seg.text:
+            continue
+        prev = merged[-1] if merged else None
+        if prev is not None and prev.speaker_label == speaker and seg.start - prev.end < MERGE_GAP_SECONDS:
+            prev.end = max(prev.end, seg.end)
+            prev.text = prev.text + " " + seg.text
+        else:
+            merged.append(AlignedUtterance(
+                speaker_label=speaker,
+                speaker_name=speaker,
+                start=seg.start,
+                end=seg.end,
+                text=seg.text,
+            ))
+    return merged
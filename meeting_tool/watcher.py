@@ -0,0 +1,339 @@
+"""Watch a folder (such as Zoom's recording directory) and process new recordings."""
+
+import hashlib
+import multiprocessing
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+import click
+
+from .batch import (
+    DONE,
+    FAILED,
+    SKIPPED,
+    init_worker,
+    is_up_to_date,
+    output_path_for,
+    process_one,
+)
+
+DEFAULT_STATE_PATH = Path.home() / ".meeting_tool" / "watch.db"
+
+# Zoom writes audio as .m4a and video as .mp4
+DEFAULT_EXTENSIONS = (".m4a", ".mp4")
+
+# Seconds a file's size and mtime must stay unchanged before it is processed
+DEFAULT_SETTLE_SECONDS = 30.0
+
+# Seconds between scans of the watched directory
+DEFAULT_POLL_SECONDS = 5.0
+
+# Times a recording is processed when its worker process dies under it
+MAX_ATTEMPTS = 2
+
+QUEUED = "queued"
+DUPLICATE = "duplicate"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    output_path TEXT,
+    error TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_hash ON files (hash);
+"""
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchState:
+    """Persistent record of the files the watcher has already handled.
+
+    Files are keyed by path, with their size and mtime, so an unchanged file
+    is recognised after a restart without hashing it again. The content hash
+    catches copies of a recording that was already processed.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open an autocommit connection and always close it."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def is_known(self, path: Path, size: int, mtime: float) -> bool:
+        """True if this exact version of the file has been handled or queued."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM files WHERE path = ? AND size = ? AND mtime = ?",
+                (str(path), size, mtime),
+            ).fetchone()
+        return row is not None
+
+    def find_hash(self, digest: str) -> str | None:
+        """Path of another file with this content, if one was handled or queued."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT path FROM files WHERE hash = ? AND status NOT IN (?, ?) LIMIT 1",
+                (digest, FAILED, DUPLICATE),
+            ).fetchone()
+        return row["path"] if row is not None else None
+
+    def record(
+        self,
+        path: Path,
+        size: int,
+        mtime: float,
+        digest: str,
+        status: str,
+        output_path: Path | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Insert or replace the entry for a file."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files "
+                "(path, size, mtime, hash, status, output_path, error, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), size, mtime, digest, status,
+                 str(output_path) if output_path else None, error, time.time()),
+            )
+
+    def set_status(self, path: Path, status: str, error: str | None = None) -> None:
+        """Update the status of a queued file once it has been processed."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE files SET status = ?, error = ?, recorded_at = ? WHERE path = ?",
+                (status, error, time.time(), str(path)),
+            )
+
+    def forget_queued(self) -> int:
+        """Drop files left queued by a previous run so they are picked up again.
+
+        Returns:
+            Number of files forgotten.
+        """
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM files WHERE status = ?", (QUEUED,)).rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Number of files per status."""
+        with self._connect() as conn:
+            return dict(conn.execute(
+                "SELECT status, COUNT(*) FROM files GROUP BY status"
+            ).fetchall())
+
+
+class FolderWatcher:
+    """Finds new, fully written recordings under a directory tree.
+
+    A file is only handed out once its size and mtime have stayed the same
+    for settle_seconds, since Zoom keeps writing the file for a while after
+    the meeting ends. Files already in the state, copies of processed
+    content and recordings whose output is up to date are not handed out.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        state: WatchState,
+        output_dir: Path | None = None,
+        extensions: tuple[str, ...] = DEFAULT_EXTENSIONS,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.root = root
+        self.state = state
+        self.output_dir = output_dir
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+        # path -> ((size, mtime), time that signature was first seen)
+        self._pending: dict[Path, tuple[tuple[int, float], float]] = {}
+
+    def _candidates(self):
+        """Recordings under root with a watched extension."""
+        for path in self.root.rglob("*"):
+            if path.suffix.lower() in self.extensions and path.is_file():
+                yield path
+
+    def poll(self) -> list[tuple[Path, Path]]:
+        """Scan once and return (input, output) pairs ready to process.
+
+        Returned files are recorded as queued, so they are not returned again.
+        """
+        now = self.clock()
+        ready = []
+        seen = set()
+
+        for path in sorted(self._candidates()):
+            seen.add(path)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+
+            if self.state.is_known(path, *signature):
+                self._pending.pop(path, None)
+                continue
+
+            previous = self._pending.get(path)
+            if previous is None or previous[0] != signature:
+                self._pending[path] = (signature, now)
+                continue
+            if now - previous[1] < self.settle_seconds:
+                continue
+            del self._pending[path]
+
+            try:
+                digest = file_digest(path)
+            except OSError:
+                continue  # deleted or moved while settling; seen again if it comes back
+            output_path = output_path_for(path, self.output_dir)
+            original = self.state.find_hash(digest)
+            if original is not None and original != str(path):
+                self.state.record(path, *signature, digest, DUPLICATE,
+                                  error=f"same content as {original}")
+                click.echo(f"  Skipping {path.name}: same content as {original}")
+            elif is_up_to_date(path, output_path):
+                self.state.record(path, *signature, digest, SKIPPED, output_path)
+            else:
+                self.state.record(path, *signature, digest, QUEUED, output_path)
+                ready.append((path, output_path))
+
+        # Stop tracking files that were deleted or renamed before settling
+        for path in set(self._pending) - seen:
+            del self._pending[path]
+        return ready
+
+
+def watch(
+    root: Path,
+    options: dict,
+    state_path: Path = DEFAULT_STATE_PATH,
+    output_dir: Path | None = None,
+    workers: int = 1,
+    extensions: tuple[str, ...] = DEFAULT_EXTENSIONS,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+) -> None:
+    """Process new recordings under root until interrupted.
+
+    Recordings are processed by a pool of worker processes that load the
+    models once, so at most `workers` recordings are processed at a time.
+    If a worker process dies, the pool is replaced and the recordings it
+    took down are processed again (up to MAX_ATTEMPTS times in all).
+
+    Args:
+        root: Directory tree to watch.
+        options: process_meeting keyword arguments for every recording.
+        state_path: SQLite file recording which files were handled.
+        output_dir: Directory for the .md files (default: next to each recording).
+        workers: Number of recordings processed concurrently.
+        extensions: File extensions to pick up.
+        settle_seconds: Seconds a file must stay unchanged before processing.
+        poll_seconds: Seconds between scans.
+    """
+    state = WatchState(state_path)
+    forgotten = state.forget_queued()
+    if forgotten:
+        click.echo(f"Re-queueing {forgotten} recording(s) left unfinished by a previous run")
+
+    watcher = FolderWatcher(root, state, output_dir, extensions, settle_seconds)
+    options = {**options, "jobs_per_host": workers}
+
+    # spawn keeps CUDA and the model libraries out of the parent process
+    context = multiprocessing.get_context("spawn")
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(options,),
+        )
+
+    executor = new_pool()
+    # future -> (input path, output path, attempt)
+    in_flight = {}
+
+    def submit(input_path: Path, output_path: Path, attempt: int = 1) -> None:
+        nonlocal executor
+        try:
+            future = executor.submit(process_one, input_path, output_path, options)
+        except BrokenProcessPool:
+            # A worker process died (e.g. killed for using too much memory)
+            click.echo("  A worker process died; starting new workers")
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = new_pool()
+            future = executor.submit(process_one, input_path, output_path, options)
+        in_flight[future] = (input_path, output_path, attempt)
+
+    click.echo(f"Watching {root} for {', '.join(extensions)} files "
+               f"with {workers} worker(s), state in {state_path}")
+    try:
+        while True:
+            for input_path, output_path in watcher.poll():
+                click.echo(f"  Queued {input_path}")
+                submit(input_path, output_path)
+
+            for future in [f for f in in_flight if f.done()]:
+                input_path, output_path, attempt = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # Every recording in the pool fails when one worker dies
+                    if attempt < MAX_ATTEMPTS:
+                        click.echo(f"  Retrying {input_path.name}: its worker process died")
+                        submit(input_path, output_path, attempt + 1)
+                        continue
+                    state.set_status(input_path, FAILED, f"Worker crashed: {e}")
+                    click.echo(f"  failed  {input_path.name}: worker crashed: {e}")
+                    continue
+                except Exception as e:
+                    state.set_status(input_path, FAILED, f"Worker failed: {e}")
+                    click.echo(f"  failed  {input_path.name}: {e}")
+                    continue
+                state.set_status(input_path, result.status, result.error)
+                click.echo(f"  {result.status:<7} {input_path.name} ({result.seconds:.1f}s)")
+                if result.status == FAILED:
+                    click.echo(f"      {result.error.splitlines()[0]}")
+
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        click.echo("\nStopping; unfinished recordings will be picked up on the next run...")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        counts = state.counts()
+        click.echo(f"  {counts.get(DONE, 0)} done, {counts.get(FAILED, 0)} failed, "
+                   f"{counts.get(DUPLICATE, 0)} duplicates, {counts.get(QUEUED, 0)} unfinished")
@@ -0,0 +1,266 @@
+"""Memory-mapped access to the 16-bit PCM WAV files written by prepare_audio.
+
+Also float32 copies of them (SharedSamples) that several stages and
+processes read without converting or copying the audio again.
+"""
+
+import contextlib
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Sample rate the models take, and so the rate of prepared and shared audio
+TARGET_SAMPLE_RATE = 16000
+
+# WAVE format tags for plain PCM and WAVE_FORMAT_EXTENSIBLE
+_FORMAT_PCM = 1
+_FORMAT_EXTENSIBLE = 0xFFFE
+
+# ffmpeg writes this data size when it streams a WAV it cannot seek back into
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+# Samples converted at a time when writing shared float32 samples
+_CONVERT_CHUNK_SAMPLES = 1 << 20
+
+# Shared samples files are named after the process that created them, so
+# files left behind by a process that died can be told from those in use
+_SAMPLES_PREFIX = "meeting_tool_"
+_SAMPLES_SUFFIX = ".f32"
+
+
+def _sample_range(sample_rate: int, num_samples: int,
+                  start: float, end: float | None) -> tuple[int, int]:
+    """Clamp a time range in seconds to sample indices."""
+    first = min(max(0, int(start * sample_rate)), num_samples)
+    last = num_samples if end is None else int(end * sample_rate)
+    return first, min(max(first, last), num_samples)
+
+
+class PcmWav:
+    """A mono 16-bit PCM WAV file mapped into memory.
+
+    The samples are never read as a whole: window() returns a view of the
+    mapped file, and the operating system pages in only the parts that are
+    touched. Resident memory therefore scales with the windows being
+    processed, not with the length of the recording.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.sample_rate, data_offset, data_size = _parse_header(path)
+        self.num_samples = data_size // 2
+        if self.num_samples:
+            self.samples = np.memmap(path, dtype="<i2", mode="r",
+                                     offset=data_offset, shape=(self.num_samples,))
+        else:
+            self.samples = np.zeros(0, dtype="<i2")
+
+    @property
+    def duration(self) -> float:
+        """Length of the recording in seconds."""
+        return self.num_samples / self.sample_rate
+
+    def window(self, start: float = 0.0, end: float | None = None) -> np.ndarray:
+        """Zero-copy int16 view of the samples between start and end seconds."""
+        first, last = _sample_range(self.sample_rate, self.num_samples, start, end)
+        return self.samples[first:last]
+
+    def float_window(self, start: float = 0.0, end: float | None = None) -> np.ndarray:
+        """Samples between start and end seconds as float32 in [-1, 1).
+
+        This is the format the models take. Only the requested window is
+        converted, so memory use is proportional to its length.
+        """
+        samples = self.window(start, end)
+        result = np.empty(len(samples), dtype=np.float32)
+        np.multiply(samples, 1.0 / 32768.0, out=result, casting="unsafe")
+        return result
+
+
+@dataclass(frozen=True)
+class SharedSamples:
+    """Float32 samples of a recording in a file that any process can map.
+
+    Stages that each need the whole recording as float32 (diarization and
+    Whisper, possibly in other processes) read views of this file instead
+    of converting the WAV file themselves. Only this small handle is
+    passed between processes; the operating system keeps one copy of the
+    samples in its page cache however many processes map them.
+
+    Created by share_samples. The creator owns the file and deletes it
+    with release() once no stage reads it any more; files of a creator
+    that died first are deleted by remove_orphaned_samples.
+    """
+    path: Path
+    sample_rate: int
+    num_samples: int
+
+    @property
+    def duration(self) -> float:
+        """Length of the recording in seconds."""
+        return self.num_samples / self.sample_rate
+
+    def float_window(self, start: float = 0.0, end: float | None = None) -> np.ndarray:
+        """Zero-copy float32 view of the samples between start and end seconds.
+
+        Only the requested range is mapped. The view is copy-on-write: a
+        consumer that modifies it gets private pages and never changes the
+        samples other processes see.
+        """
+        first, last = _sample_range(self.sample_rate, self.num_samples, start, end)
+        if first == last:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(self.path, dtype="<f4", mode="c",
+                         offset=first * 4, shape=(last - first,))
+
+    def release(self) -> None:
+        """Delete the samples file.
+
+        Views that are still mapped stay readable on POSIX systems; on
+        Windows the file is left behind if a view is still open.
+        """
+        with contextlib.suppress(OSError):
+            self.path.unlink(missing_ok=True)
+
+
+def share_samples(wav: PcmWav, directory: Path | None = None) -> SharedSamples:
+    """Convert a WAV file to float32 once, into a file other processes can map.
+
+    The conversion runs in chunks, so it needs little memory of its own.
+    Files that processes which died left in the directory are removed first.
+
+    Args:
+        wav: The recording, at TARGET_SAMPLE_RATE.
+        directory: Where to create the samples file (default: the system temp dir).
+
+    Returns:
+        Handle of the samples; release() it when done.
+
+    Raises:
+        ValueError: If the recording is not at TARGET_SAMPLE_RATE.
+    """
+    if wav.sample_rate != TARGET_SAMPLE_RATE:
+        raise ValueError(f"Shared samples must be {TARGET_SAMPLE_RATE} Hz, the rate the models "
+                         f"take; {wav.path.name} is {wav.sample_rate} Hz")
+    remove_orphaned_samples(directory)
+    fd, name = tempfile.mkstemp(prefix=f"{_SAMPLES_PREFIX}{os.getpid()}_",
+                                suffix=_SAMPLES_SUFFIX, dir=directory)
+    os.close(fd)
+    shared = SharedSamples(Path(name), wav.sample_rate, wav.num_samples)
+    if not wav.num_samples:
+        return shared
+    try:
+        out = np.memmap(shared.path, dtype="<f4", mode="w+", shape=(wav.num_samples,))
+        for first in range(0, wav.num_samples, _CONVERT_CHUNK_SAMPLES):
+            last = min(first + _CONVERT_CHUNK_SAMPLES, wav.num_samples)
+            np.multiply(wav.samples[first:last], 1.0 / 32768.0, out=out[first:last],
+                        casting="unsafe")
+        out.flush()
+        del out
+    except BaseException:
+        shared.release()
+        raise
+    return shared
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this id exists (always True where that can't be checked)."""
+    if os.name != "posix":
+        # os.kill would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def remove_orphaned_samples(directory: Path | None = None) -> int:
+    """Delete shared samples files whose creating process is no longer running.
+
+    A process that is killed (e.g. a batch worker over its memory limit)
+    never releases its samples. The next share_samples call removes them,
+    and supervisors call this once they notice a worker died.
+
+    Args:
+        directory: Where the samples files are (default: the system temp dir).
+
+    Returns:
+        Number of files deleted.
+    """
+    removed = 0
+    directory = Path(directory or tempfile.gettempdir())
+    for path in directory.glob(f"{_SAMPLES_PREFIX}*_*{_SAMPLES_SUFFIX}"):
+        pid = path.name[len(_SAMPLES_PREFIX):].split("_", 1)[0]
+        if not pid.isdigit() or _process_alive(int(pid)):
+            continue
+        with contextlib.suppress(OSError):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def open_audio(source: Path | SharedSamples) -> PcmWav | SharedSamples:
+    """The samples of a prepared WAV file, or already shared samples as they are.
+
+    Both have sample_rate, duration and float_window(), which is all the
+    models need.
+    """
+    if isinstance(source, SharedSamples):
+        return source
+    return PcmWav(Path(source))
+
+
+def _parse_header(path: Path) -> tuple[int, int, int]:
+    """Find the sample rate and the data chunk of a mono 16-bit PCM WAV file.
+
+    Returns:
+        (sample_rate, data_offset, data_size) with offset and size in bytes.
+
+    Raises:
+        ValueError: If the file is not a mono 16-bit PCM WAV file.
+    """
+    file_size = path.stat().st_size
+    sample_rate = None
+    with path.open("rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path.name}")
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No audio data in WAV file: {path.name}")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if len(fmt) < 16:
+                    raise ValueError(f"Truncated WAV format chunk: {path.name}")
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                if format_tag == _FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    format_tag = struct.unpack("<H", fmt[24:26])[0]
+                if format_tag != _FORMAT_PCM or bits != 16 or channels != 1:
+                    raise ValueError(
+                        f"{path.name} is not mono 16-bit PCM "
+                        f"(format {format_tag}, {channels} channels, {bits} bits)"
+                    )
+            elif chunk_id == b"data":
+                if sample_rate is None:
+                    raise ValueError(f"WAV file has no format chunk before its data: {path.name}")
+                data_offset = f.tell()
+                available = file_size - data_offset
+                data_size = available if chunk_size == _UNKNOWN_SIZE else min(chunk_size, available)
+                return sample_rate, data_offset, data_size
+            else:
+                f.seek(chunk_size, 1)
+
+            # Chunks are padded to an even number of bytes
+            if chunk_size % 2:
+                f.seek(1, 1)
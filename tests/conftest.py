@@ -1,7 +1,9 @@
-"""Shared test fixtures."""
+"""Shared test fixtures and helpers."""
 
+import wave
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from meeting_tool.models import (
@@ -14,6 +16,25 @@ from meeting_tool.models import (
 )
 
 
+def write_wav(path, samples=None, seconds=1, sample_rate=16000, channels=1, width=2):
+    """Write a PCM WAV file and return its path.
+
+    samples are written as given (clipped to the sample width), interleaved
+    if there are several channels; without them, the file holds seconds of
+    silence.
+    """
+    if samples is None:
+        samples = np.zeros(int(sample_rate * seconds) * channels)
+    limits = np.iinfo(f"<i{width}")
+    frames = np.clip(np.asarray(samples), limits.min, limits.max).astype(f"<i{width}")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(width)
+        f.setframerate(sample_rate)
+        f.writeframes(frames.tobytes())
+    return path
+
+
 @pytest.fixture
 def sample_diarization_segments():
     """Sample diarization segments for testing."""
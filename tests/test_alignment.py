@@ -1,7 +1,14 @@
 """Tests for the alignment module."""
 
-from meeting_tool.alignment import align_transcript, _compute_overlap, MERGE_GAP_SECONDS
+from meeting_tool.alignment import (
+    MERGE_GAP_SECONDS,
+    _compute_overlap,
+    align_transcript,
+    merge_tracks,
+    track_utterances,
+)
 from meeting_tool.models import (
+    AlignedUtterance,
     DiarizationSegment,
     TranscriptionSegment,
     TranscriptionWord,
@@ -111,3 +118,42 @@ def test_no_merge_across_speakers():
     assert len(result) == 2
     assert result[0].speaker_label == "SPEAKER_00"
     assert result[1].speaker_label == "SPEAKER_01"
+
+
+def _segment(*words):
+    """Transcription segment from (start, end, text) word tuples."""
+    words = [TranscriptionWord(start=s, end=e, text=t) for s, e, t in words]
+    return TranscriptionSegment(start=words[0].start, end=words[-1].end,
+                                text=" ".join(w.text for w in words), words=words)
+
+
+def test_track_utterances_split_on_pauses():
+    segments = [
+        _segment((0.0, 0.5, "Hello"), (0.6, 1.0, "there")),
+        _segment((1.5, 2.0, "again")),
+        _segment((2.0 + MERGE_GAP_SECONDS, 4.0, "Later")),
+    ]
+
+    result = track_utterances(segments, "SPEAKER_01")
+
+    assert [u.text for u in result] == ["Hello there again", "Later"]
+    assert (result[0].start, result[0].end) == (0.0, 2.0)
+    assert all(u.speaker_label == "SPEAKER_01" for u in result)
+
+
+def test_track_utterances_empty():
+    assert track_utterances([], "SPEAKER_00") == []
+
+
+def test_merge_tracks_orders_by_start():
+    def utt(label, start):
+        return AlignedUtterance(label, label, start, start + 1.0, f"{label}@{start}")
+
+    alice = [utt("A", 0.0), utt("A", 5.0), utt("A", 9.0)]
+    bob = [utt("B", 2.0), utt("B", 6.0)]
+    carol = [utt("C", 5.5)]
+
+    result = merge_tracks([alice, bob, carol])
+
+    assert [u.start for u in result] == [0.0, 2.0, 5.0, 5.5, 6.0, 9.0]
+    assert merge_tracks([]) == []
@@ -0,0 +1,154 @@
+"""Tests for the archive module."""
+
+from pathlib import Path
+
+import pytest
+
+from meeting_tool import archive
+from meeting_tool.archive import (
+    MeetingArchive,
+    archive_path_for,
+    load_archives,
+    rename_archive_speakers,
+    set_archive_source,
+    write_archive,
+)
+from meeting_tool.models import AlignedUtterance, MeetingTranscript, TranscriptionWord
+
+
+def _transcript(minutes=10):
+    """A meeting with one utterance every 30 seconds, alternating speakers."""
+    utterances = [
+        AlignedUtterance(
+            speaker_label=f"SPEAKER_0{i % 2}",
+            speaker_name="Alice" if i % 2 == 0 else "SPEAKER_01",
+            start=i * 30.0,
+            end=i * 30.0 + 20.0,
+            text=f"Utterance number {i}, with ünïcode and\nnewlines.",
+        )
+        for i in range(minutes * 2)
+    ]
+    return MeetingTranscript(
+        source_file=Path("meeting.m4a"),
+        duration_seconds=minutes * 60.0,
+        utterances=utterances,
+        speaker_map={"SPEAKER_00": "Alice"},
+    )
+
+
+def _words(transcript):
+    return [
+        TranscriptionWord(u.start + k, u.start + k + 0.5, f"w{j}", probability=0.8)
+        for j, u in enumerate(transcript.utterances)
+        for k in range(3)
+    ]
+
+
+def test_archive_path_for(tmp_path):
+    assert archive_path_for(tmp_path / "meeting.md") == tmp_path / "meeting.transcript.bin"
+
+
+def test_round_trip(tmp_path):
+    transcript = _transcript()
+    words = _words(transcript)
+    path = write_archive(tmp_path / "meeting.transcript.bin", transcript, words)
+
+    loaded = MeetingArchive(path)
+
+    assert loaded.source_file == Path("meeting.m4a")
+    assert loaded.duration_seconds == 600.0
+    assert loaded.speaker_map == {"SPEAKER_00": "Alice"}
+    assert loaded.num_utterances == 20 and loaded.num_words == 60
+    assert loaded.transcript().utterances == transcript.utterances
+    restored = loaded.words()
+    assert [(w.start, w.end, w.text) for w in restored] == [(w.start, w.end, w.text) for w in words]
+    assert restored[0].probability == pytest.approx(0.8, abs=0.01)
+
+
+def test_speakers_are_interned(tmp_path):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript())
+
+    loaded = MeetingArchive(path)
+
+    assert loaded.speakers == [("SPEAKER_00", "Alice"), ("SPEAKER_01", "SPEAKER_01")]
+    assert set(loaded.utterance_speaker.tolist()) == {0, 1}
+
+
+def test_time_range_reads_only_covering_blocks(tmp_path, monkeypatch):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript(minutes=60), block_seconds=60.0)
+    loaded = MeetingArchive(path)
+    decompressed = []
+    real_decompress = archive.zlib.decompress
+    monkeypatch.setattr(archive.zlib, "decompress",
+                        lambda data: decompressed.append(data) or real_decompress(data))
+
+    utterances = loaded.utterances(42 * 60, 47 * 60)
+
+    assert [u.start for u in utterances] == [i * 30.0 for i in range(84, 94)]
+    assert len(decompressed) == 5
+
+
+def test_time_range_includes_utterance_started_earlier(tmp_path):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript())
+
+    utterances = MeetingArchive(path).utterances(65.0, 70.0)
+
+    assert [u.start for u in utterances] == [60.0]
+
+
+def test_speaker_seconds(tmp_path):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript())
+
+    assert MeetingArchive(path).speaker_seconds() == {"Alice": 200.0, "SPEAKER_01": 200.0}
+
+
+def test_empty_transcript(tmp_path):
+    transcript = MeetingTranscript(Path("empty.m4a"), 5.0, [])
+    path = write_archive(tmp_path / "m.transcript.bin", transcript)
+
+    loaded = MeetingArchive(path)
+
+    assert loaded.utterances() == [] and loaded.words() == []
+    assert loaded.speaker_seconds() == {}
+
+
+def test_load_archives_keeps_order(tmp_path):
+    paths = [
+        write_archive(tmp_path / f"{i}.transcript.bin", _transcript(minutes=i + 1))
+        for i in range(5)
+    ]
+
+    loaded = load_archives(paths, workers=3)
+
+    assert [a.path for a in loaded] == paths
+    assert [a.duration_seconds for a in loaded] == [60.0, 120.0, 180.0, 240.0, 300.0]
+
+
+def test_rename_archive_speakers(tmp_path):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript())
+
+    assert rename_archive_speakers(path, {"SPEAKER_01": "Bob"})
+    loaded = MeetingArchive(path)
+
+    assert {u.speaker_name for u in loaded.utterances()} == {"Alice", "Bob"}
+    assert loaded.speaker_map == {"SPEAKER_00": "Alice", "SPEAKER_01": "Bob"}
+    assert not rename_archive_speakers(tmp_path / "missing.transcript.bin", {})
+
+
+def test_set_archive_source(tmp_path):
+    path = write_archive(tmp_path / "m.transcript.bin", _transcript(), _words(_transcript()))
+
+    assert set_archive_source(path, Path("copy.mp4"), 570.0)
+    loaded = MeetingArchive(path)
+
+    assert loaded.source_file == Path("copy.mp4")
+    assert loaded.duration_seconds == 570.0
+    assert len(loaded.utterances()) == 20 and len(loaded.words()) == 60
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "m.transcript.bin"
+    path.write_bytes(b"not an archive at all")
+
+    with pytest.raises(ValueError, match="not a meeting archive"):
+        MeetingArchive(path)
@@ -0,0 +1,137 @@
+"""Tests for the audio module."""
+
+import pytest
+
+from meeting_tool.audio import (
+    MediaInfo,
+    _parse_probe_output,
+    conversion_command,
+    get_audio_duration,
+    is_model_ready,
+    prepare_audio,
+    range_label,
+    validate_range,
+)
+from meeting_tool.wav import PcmWav
+
+from .conftest import write_wav
+
+ZOOM_MP4_PROBE = {
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264"},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "32000",
+         "channels": 1, "duration": "7200.02"},
+    ],
+    "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "7200.050000"},
+}
+
+
+def _info(**overrides):
+    values = dict(duration=10.0, codec="aac", sample_rate=32000, channels=1,
+                  format_name="mov,mp4,m4a,3gp,3g2,mj2")
+    values.update(overrides)
+    return MediaInfo(**values)
+
+
+def test_parse_probe_output_zoom_mp4():
+    info = _parse_probe_output(ZOOM_MP4_PROBE, "zoom.mp4")
+    assert info.duration == 7200.05
+    assert (info.codec, info.sample_rate, info.channels) == ("aac", 32000, 1)
+    assert info.has_video
+
+
+def test_parse_probe_output_falls_back_to_stream_duration():
+    data = {"streams": [{"codec_type": "audio", "codec_name": "opus",
+                         "sample_rate": "48000", "channels": 2, "duration": "12.5"}],
+            "format": {"format_name": "webm"}}
+    assert _parse_probe_output(data, "a.webm").duration == 12.5
+
+
+def test_parse_probe_output_without_audio():
+    with pytest.raises(ValueError, match="No audio stream"):
+        _parse_probe_output({"streams": [{"codec_type": "video"}], "format": {}}, "screen.mp4")
+
+
+def test_is_model_ready():
+    assert is_model_ready(_info(codec="pcm_s16le", sample_rate=16000))
+    assert not is_model_ready(_info(codec="pcm_s16le", sample_rate=44100))
+    assert not is_model_ready(_info(codec="pcm_s16le", sample_rate=16000, channels=2))
+    assert not is_model_ready(_info(sample_rate=16000))
+
+
+def test_conversion_command_reads_only_the_audio_stream(tmp_path):
+    command = conversion_command(tmp_path / "zoom.mp4", tmp_path / "zoom.wav", _info(), threads=4)
+    assert command[command.index("-map") + 1] == "0:a:0"
+    assert "-vn" in command
+    assert command[command.index("-ar") + 1] == "16000"
+    assert command[command.index("-threads") + 1] == "4"
+
+
+def test_conversion_command_copies_ready_audio(tmp_path):
+    info = _info(codec="pcm_s16le", sample_rate=16000, format_name="matroska,webm")
+    command = conversion_command(tmp_path / "a.webm", tmp_path / "a.wav", info)
+    assert command[command.index("-c:a") + 1] == "copy"
+    assert "-ar" not in command
+
+
+def test_conversion_command_seeks_before_decoding(tmp_path):
+    command = conversion_command(tmp_path / "zoom.mp4", tmp_path / "zoom.wav", _info(),
+                                 start=1800.0, end=4500.0)
+
+    # -ss before -i seeks in the input instead of decoding and discarding
+    assert command.index("-ss") < command.index("-i")
+    assert command[command.index("-ss") + 1] == "1800.000"
+    assert command[command.index("-t") + 1] == "2700.000"
+    assert "-ss" not in conversion_command(tmp_path / "a.mp4", tmp_path / "a.wav", _info())
+
+
+def test_range_label():
+    assert range_label(1800, 4500) == "1800-4500s"
+    assert range_label(1800, None) == "1800s-end"
+    assert range_label(None, 60) == "0-60s"
+
+
+@pytest.mark.parametrize("start, end", [(None, None), (0.0, None), (None, 30.0), (10.0, 10.5)])
+def test_validate_range_accepts(start, end):
+    validate_range(start, end)
+
+
+@pytest.mark.parametrize("start, end, message", [
+    (-0.5, None, "must not be negative"),
+    (None, 0.0, r"end of the range \(0.0s\) must come after its start \(0.0s\)"),
+    (60.0, 30.0, "must come after its start"),
+])
+def test_validate_range_rejects(start, end, message):
+    with pytest.raises(ValueError, match=message):
+        validate_range(start, end)
+
+
+def test_prepare_audio_copies_range_of_ready_wav(tmp_path):
+    path = write_wav(tmp_path / "meeting.wav", seconds=10)
+
+    part = prepare_audio(path, start=2.5, end=6.0)
+
+    assert part == tmp_path / "meeting_2-6s.wav"
+    assert PcmWav(part).duration == 3.5
+    assert PcmWav(prepare_audio(path, start=8.0)).duration == 2.0
+
+
+@pytest.mark.parametrize("start, end, message", [
+    (20.0, None, "after the end of meeting.wav"),
+    (5.0, 5.0, "must come after its start"),
+    (-1.0, None, "must not be negative"),
+])
+def test_prepare_audio_rejects_bad_ranges(tmp_path, start, end, message):
+    path = write_wav(tmp_path / "meeting.wav", seconds=10)
+
+    with pytest.raises(ValueError, match=message):
+        prepare_audio(path, start=start, end=end)
+
+
+def test_prepare_audio_uses_ready_wav_directly(tmp_path):
+    path = write_wav(tmp_path / "meeting.wav")
+    assert prepare_audio(path) == path
+
+
+def test_get_audio_duration_reads_wav_header(tmp_path):
+    assert get_audio_duration(write_wav(tmp_path / "a.wav", seconds=3)) == 3.0
@@ -0,0 +1,261 @@
+"""Tests for the batch module."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import click
+
+from meeting_tool import batch, pipeline
+from meeting_tool.batch import (
+    DONE,
+    FAILED,
+    SKIPPED,
+    BatchResult,
+    collect_inputs,
+    is_up_to_date,
+    output_path_for,
+    plan_batch,
+    run_batch,
+    run_pipelined,
+    write_report,
+)
+from meeting_tool.fingerprint import FingerprintMatch
+
+
+def _touch(path, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_collect_inputs_directory(tmp_path):
+    _touch(tmp_path / "b.m4a")
+    _touch(tmp_path / "a.wav")
+    _touch(tmp_path / "a.16k.wav")
+    _touch(tmp_path / "notes.txt")
+    _touch(tmp_path / "sub" / "c.mp3")
+
+    assert collect_inputs(str(tmp_path)) == [tmp_path / "a.wav", tmp_path / "b.m4a"]
+    assert tmp_path / "sub" / "c.mp3" in collect_inputs(str(tmp_path), recursive=True)
+
+
+def test_collect_inputs_glob(tmp_path):
+    _touch(tmp_path / "x" / "one.m4a")
+    _touch(tmp_path / "y" / "two.m4a")
+    _touch(tmp_path / "y" / "three.mp4")
+
+    found = collect_inputs(str(tmp_path / "**" / "*.m4a"))
+
+    assert found == [tmp_path / "x" / "one.m4a", tmp_path / "y" / "two.m4a"]
+
+
+def test_output_path_for(tmp_path):
+    recording = tmp_path / "rec" / "meeting.m4a"
+    assert output_path_for(recording) == tmp_path / "rec" / "meeting.md"
+    assert output_path_for(recording, tmp_path / "out") == tmp_path / "out" / "meeting.md"
+
+
+def test_is_up_to_date(tmp_path):
+    recording = _touch(tmp_path / "meeting.m4a", mtime=1000)
+    output = tmp_path / "meeting.md"
+    assert not is_up_to_date(recording, output)
+
+    _touch(output, mtime=900)
+    assert not is_up_to_date(recording, output)
+
+    _touch(output, mtime=1100)
+    assert is_up_to_date(recording, output)
+
+
+def test_plan_batch_skips_up_to_date(tmp_path):
+    fresh = _touch(tmp_path / "fresh.m4a", mtime=1000)
+    _touch(tmp_path / "fresh.md", mtime=1100)
+    stale = _touch(tmp_path / "stale.m4a", mtime=1000)
+
+    todo, skipped = plan_batch([fresh, stale])
+
+    assert todo == [(stale, tmp_path / "stale.md")]
+    assert [r.input_path for r in skipped] == [str(fresh)]
+    assert skipped[0].status == SKIPPED
+
+    todo, skipped = plan_batch([fresh, stale], force=True)
+    assert len(todo) == 2
+    assert skipped == []
+
+
+def test_plan_batch_duplicate_outputs(tmp_path):
+    audio = _touch(tmp_path / "meeting.m4a")
+    video = _touch(tmp_path / "meeting.mp4")
+
+    todo, skipped = plan_batch([audio, video])
+
+    assert todo == [(audio, tmp_path / "meeting.md")]
+    assert skipped[0].input_path == str(video)
+    assert "same output" in skipped[0].error
+
+
+def test_write_report(tmp_path):
+    results = [
+        BatchResult("a.m4a", "a.md", DONE, seconds=30.0, audio_seconds=600.0),
+        BatchResult("b.m4a", "b.md", FAILED, seconds=2.0, error="boom"),
+        BatchResult("c.m4a", "c.md", SKIPPED),
+    ]
+
+    path = write_report(results, tmp_path / "reports" / "batch.json")
+    report = json.loads(path.read_text())
+
+    assert report["total"] == 3
+    assert (report["done"], report["failed"], report["skipped"]) == (1, 1, 1)
+    assert report["processing_seconds"] == 32.0
+    assert report["audio_seconds"] == 600.0
+    assert report["files"][1]["error"] == "boom"
+
+
+def _no_preload(options):
+    pass
+
+
+def _process_or_crash(input_path, output_path, options):
+    # Module-level, so the spawned worker processes can import it
+    if input_path.name == "crash.m4a":
+        os._exit(1)
+    return BatchResult(str(input_path), str(output_path), DONE)
+
+
+def test_run_batch_retries_recordings_of_a_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "init_worker", _no_preload)
+    monkeypatch.setattr(batch, "process_one", _process_or_crash)
+    todo = [(tmp_path / f"{name}.m4a", tmp_path / f"{name}.md") for name in ("a", "crash", "b")]
+
+    results = run_batch(todo, {}, workers=2)
+
+    statuses = {Path(r.input_path).name: r.status for r in results}
+    assert statuses == {"a.m4a": DONE, "crash.m4a": FAILED, "b.m4a": DONE}
+    assert len(results) == 3
+
+
+def _fake_stages(monkeypatch, log, fail_on=None, duplicate=None):
+    """Replace the model stages and the write-out with fakes that record what ran."""
+    def decode(job, input_path, threads, dedup):
+        log.append(("decode", job.input_path.name))
+        job.audio_path = job.input_path
+        job.duration = 60.0
+        if dedup and job.input_path.name == duplicate:
+            job.duplicate_of = FingerprintMatch("a.wav", "a.md", 0.0, 0.05, 1.0)
+
+    def diarize(job, audio, *args):
+        log.append(("diarize", job.input_path.name))
+        if job.input_path.name == fail_on:
+            raise RuntimeError("diarization failed")
+        return []
+
+    def transcribe(job, audio, diarization_segments, *args):
+        log.append(("transcribe", job.input_path.name))
+        return [], None
+
+    def write(job, *args):
+        log.append(("write", job.input_path.name))
+        return job.output_path
+
+    def reuse(job):
+        log.append(("reuse", job.input_path.name))
+        return job.output_path
+
+    monkeypatch.setattr(pipeline, "_decode", decode)
+    monkeypatch.setattr(pipeline, "_diarize", diarize)
+    monkeypatch.setattr(pipeline, "_transcribe", transcribe)
+    monkeypatch.setattr(pipeline, "_save_prompt", lambda job, utterances: None)
+    monkeypatch.setattr(pipeline, "_write", write)
+    monkeypatch.setattr(batch, "reuse_duplicate", reuse)
+
+
+def test_run_pipelined_runs_every_stage_in_order(tmp_path, monkeypatch):
+    log = []
+    _fake_stages(monkeypatch, log)
+    todo = [(tmp_path / f"{name}.wav", tmp_path / f"{name}.md") for name in "abc"]
+
+    results = run_pipelined(todo, {"cpus": 4, "cache": False})
+
+    assert [Path(r.input_path).name for r in results] == ["a.wav", "b.wav", "c.wav"]
+    assert all(r.status == DONE and r.audio_seconds == 60.0 for r in results)
+    for name in ("a.wav", "b.wav", "c.wav"):
+        steps = [stage for stage, file in log if file == name]
+        assert steps == ["decode", "diarize", "transcribe", "write"]
+
+
+def test_run_pipelined_failure_skips_later_stages(tmp_path, monkeypatch):
+    log = []
+    _fake_stages(monkeypatch, log, fail_on="b.wav")
+    todo = [(tmp_path / f"{name}.wav", tmp_path / f"{name}.md") for name in "abc"]
+
+    results = run_pipelined(todo, {"cpus": 4, "cache": False})
+
+    assert [r.status for r in results] == [DONE, FAILED, DONE]
+    assert "diarization failed" in results[1].error
+    assert ("transcribe", "b.wav") not in log
+
+
+def test_run_pipelined_writes_a_log_per_recording(tmp_path, monkeypatch, capsys):
+    log = []
+    _fake_stages(monkeypatch, log, fail_on="b.wav")
+
+    def transcribe(job, audio, diarization_segments, *args):
+        click.echo(f"  Transcribed {job.input_path.name}")
+        return [], None
+
+    monkeypatch.setattr(pipeline, "_transcribe", transcribe)
+    todo = [(tmp_path / f"{name}.wav", tmp_path / f"{name}.md") for name in "ab"]
+
+    results = run_pipelined(todo, {"cpus": 4, "cache": False})
+
+    assert results[0].log_path == str(tmp_path / "a.log")
+    a_log = (tmp_path / "a.log").read_text(encoding="utf-8")
+    assert "[3/7] Transcribing audio...\n  Transcribed a.wav\n" in a_log
+    assert "diarization failed" in (tmp_path / "b.log").read_text(encoding="utf-8")
+    assert "Transcribed" not in capsys.readouterr().out
+
+
+def test_run_pipelined_reuses_duplicates(tmp_path, monkeypatch):
+    log = []
+    _fake_stages(monkeypatch, log, duplicate="b.wav")
+    todo = [(tmp_path / f"{name}.wav", tmp_path / f"{name}.md") for name in "ab"]
+
+    results = run_pipelined(todo, {"cpus": 4, "cache": False})
+
+    assert [r.status for r in results] == [DONE, DONE]
+    assert [stage for stage, file in log if file == "b.wav"] == ["decode", "reuse"]
+
+    log.clear()
+    run_pipelined(todo, {"cpus": 4, "cache": False, "dedup": False})
+    assert [stage for stage, file in log if file == "b.wav"] == [
+        "decode", "diarize", "transcribe", "write",
+    ]
+
+
+def test_run_pipelined_overlaps_stages(tmp_path, monkeypatch):
+    log = []
+    _fake_stages(monkeypatch, log)
+    second_decoded = threading.Event()
+
+    def decode(job, input_path, threads, dedup):
+        job.audio_path = input_path
+        if job.input_path.name == "b.wav":
+            second_decoded.set()
+
+    def diarize(job, audio, *args):
+        # Recording a is still in diarization when recording b is decoded
+        if job.input_path.name == "a.wav":
+            assert second_decoded.wait(timeout=5)
+        return []
+
+    monkeypatch.setattr(pipeline, "_decode", decode)
+    monkeypatch.setattr(pipeline, "_diarize", diarize)
+    todo = [(tmp_path / f"{name}.wav", tmp_path / f"{name}.md") for name in "ab"]
+
+    results = run_pipelined(todo, {"cpus": 4, "cache": False})
+
+    assert [r.status for r in results] == [DONE, DONE]
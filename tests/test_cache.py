@@ -0,0 +1,128 @@
+"""Tests for the cache module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from meeting_tool.cache import (
+    DiarizationState,
+    WindowedDiarizationState,
+    cache_dir_for,
+    cache_inputs,
+    load_diarization,
+    load_diarization_state,
+    load_meeting_info,
+    load_transcription,
+    reset_cache,
+    save_diarization,
+    save_diarization_state,
+    save_meeting_info,
+    save_transcription,
+    save_windowed_state,
+)
+from meeting_tool.models import DiarizationSegment
+
+
+def test_cache_dir_for():
+    assert cache_dir_for(Path("minutes/meeting.md")) == Path("minutes/meeting.cache")
+
+
+def test_transcription_round_trip(tmp_path, sample_transcription_segments):
+    save_transcription(sample_transcription_segments, tmp_path)
+    assert load_transcription(tmp_path) == sample_transcription_segments
+
+
+def test_load_transcription_without_confidence(tmp_path):
+    # Caches written before confidence was recorded
+    (tmp_path / "transcription.json").write_text(
+        '[{"start": 0.0, "end": 1.0, "text": "Hi", '
+        '"words": [{"start": 0.0, "end": 1.0, "text": "Hi"}]}]',
+        encoding="utf-8",
+    )
+
+    [segment] = load_transcription(tmp_path)
+
+    assert segment.avg_logprob == 0.0
+    assert segment.words[0].probability == 1.0
+
+
+def test_diarization_round_trip(tmp_path, sample_diarization_segments):
+    save_diarization(sample_diarization_segments, tmp_path)
+    assert load_diarization(tmp_path) == sample_diarization_segments
+
+
+def test_meeting_info_round_trip(tmp_path):
+    info = {"source_file": "a.m4a", "duration_seconds": 12.5, "speaker_map": {"SPEAKER_00": "Alice"}}
+    save_meeting_info(info, tmp_path)
+    assert load_meeting_info(tmp_path) == info
+
+
+def test_diarization_state_round_trip(tmp_path):
+    state = DiarizationState(
+        segmentations=np.random.rand(4, 10, 3).astype(np.float32),
+        segmentation_window=(0.0, 10.0, 1.0),
+        count=np.ones((50, 1), dtype=np.int8),
+        count_window=(0.0, 0.017, 0.017),
+        embeddings=np.random.rand(4, 3, 8).astype(np.float32),
+    )
+    save_diarization_state(state, tmp_path)
+    loaded = load_diarization_state(tmp_path)
+
+    np.testing.assert_array_equal(loaded.segmentations, state.segmentations)
+    np.testing.assert_array_equal(loaded.count, state.count)
+    np.testing.assert_array_equal(loaded.embeddings, state.embeddings)
+    assert loaded.segmentation_window == state.segmentation_window
+    assert loaded.count_window == state.count_window
+
+
+def test_load_diarization_state_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_diarization_state(tmp_path)
+
+
+def test_windowed_state_round_trip_replaces_whole_file_state(tmp_path):
+    save_diarization_state(DiarizationState(
+        segmentations=np.zeros((1, 2, 3), dtype=np.float32),
+        segmentation_window=(0.0, 10.0, 1.0),
+        count=np.zeros((2, 1), dtype=np.int8),
+        count_window=(0.0, 0.017, 0.017),
+        embeddings=np.zeros((1, 3, 8), dtype=np.float32),
+    ), tmp_path)
+    state = WindowedDiarizationState(
+        windows=[(0.0, 100.0, 0.0, 90.0), (80.0, 150.0, 90.0, 150.0)],
+        segments=[
+            [DiarizationSegment(start=1.0, end=5.0, speaker_label="SPEAKER_00")],
+            [DiarizationSegment(start=2.0, end=3.0, speaker_label="SPEAKER_01")],
+        ],
+        embeddings=[{"SPEAKER_00": np.array([1.0, 0.0])},
+                    {"SPEAKER_01": np.array([np.nan, np.nan])}],
+    )
+
+    save_windowed_state(state, tmp_path)
+    loaded = load_diarization_state(tmp_path)
+
+    assert isinstance(loaded, WindowedDiarizationState)
+    assert loaded.windows == state.windows
+    assert loaded.segments == state.segments
+    np.testing.assert_array_equal(loaded.embeddings[0]["SPEAKER_00"], [1.0, 0.0])
+    assert np.isnan(loaded.embeddings[1]["SPEAKER_01"]).all()
+
+
+def test_reset_cache_keeps_cache_of_same_inputs(tmp_path):
+    recording = tmp_path / "standup.m4a"
+    recording.write_bytes(b"audio")
+    cache_dir = tmp_path / "standup.cache"
+
+    assert not reset_cache(cache_dir, cache_inputs(recording))
+    save_meeting_info({"speaker_map": {}}, cache_dir)
+    assert not reset_cache(cache_dir, cache_inputs(recording))
+    assert load_meeting_info(cache_dir) == {"speaker_map": {}}
+
+    # Another range of the recording, or a changed recording, starts over
+    assert reset_cache(cache_dir, cache_inputs(recording, start=60.0))
+    assert not (cache_dir / "meeting.json").exists()
+    save_meeting_info({"speaker_map": {}}, cache_dir)
+    recording.write_bytes(b"other audio")
+    assert reset_cache(cache_dir, cache_inputs(recording, start=60.0))
+    assert not (cache_dir / "meeting.json").exists()
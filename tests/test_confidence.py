@@ -0,0 +1,65 @@
+"""Tests for the confidence module."""
+
+from meeting_tool.confidence import (
+    find_low_confidence_spans,
+    is_low_confidence,
+    splice_segments,
+)
+from meeting_tool.models import TranscriptionSegment, TranscriptionWord
+
+
+def _segment(start, end, text, probability=0.9, avg_logprob=-0.2, no_speech_prob=0.0):
+    words = text.split()
+    step = (end - start) / len(words)
+    return TranscriptionSegment(
+        start=start, end=end, text=text,
+        words=[
+            TranscriptionWord(start + i * step, start + (i + 1) * step, word, probability)
+            for i, word in enumerate(words)
+        ],
+        avg_logprob=avg_logprob,
+        no_speech_prob=no_speech_prob,
+    )
+
+
+def test_is_low_confidence():
+    assert not is_low_confidence(_segment(0.0, 2.0, "all good"))
+    assert is_low_confidence(_segment(0.0, 2.0, "mumbled words", avg_logprob=-1.2))
+    assert is_low_confidence(_segment(0.0, 2.0, "unsure words", probability=0.3))
+    # Confident words over what is probably silence: a likely hallucination
+    assert is_low_confidence(_segment(0.0, 2.0, "thank you", no_speech_prob=0.8))
+
+
+def test_find_spans_joins_neighbours():
+    segments = [
+        _segment(0.0, 4.0, "clear start"),
+        _segment(4.0, 8.0, "garbled bit", probability=0.2),
+        _segment(8.5, 12.0, "more garble", probability=0.2),
+        _segment(12.0, 16.0, "clear middle"),
+        _segment(16.0, 20.0, "noisy end", avg_logprob=-1.5),
+    ]
+
+    assert find_low_confidence_spans(segments) == [(4.0, 12.0), (16.0, 20.0)]
+
+
+def test_find_spans_stay_within_one_window():
+    segments = [_segment(i * 10.0, i * 10.0 + 9.5, "low", probability=0.1) for i in range(4)]
+
+    spans = find_low_confidence_spans(segments)
+
+    assert spans == [(0.0, 29.5), (30.0, 39.5)]
+
+
+def test_splice_replaces_draft_segments_in_spans():
+    draft = [
+        _segment(0.0, 4.0, "clear start"),
+        _segment(4.0, 8.0, "garbled bit", probability=0.2),
+        _segment(8.0, 12.0, "clear end"),
+    ]
+    # The accurate model also picked up a word just outside the span
+    refined = [_segment(3.0, 8.0, "start the budget review")]
+
+    result = splice_segments(draft, [(4.0, 8.0)], refined)
+
+    assert [seg.text for seg in result] == ["clear start", "the budget review", "clear end"]
+    assert result[1].start >= 4.0
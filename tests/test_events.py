@@ -0,0 +1,154 @@
+"""Tests for the events module."""
+
+import pytest
+
+from meeting_tool import events
+from meeting_tool.events import (
+    EventEmitter,
+    StageFinished,
+    StageMessage,
+    StageProgress,
+    StageStarted,
+    print_event,
+)
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(events.time, "monotonic", clock)
+    return clock
+
+
+def test_stage_emits_started_and_finished(clock, tmp_path):
+    received = []
+    emitter = EventEmitter([received.append], input_path=tmp_path / "a.m4a")
+
+    with emitter.stage("decode", 1, 7, "Preparing audio"):
+        clock.now += 2.5
+
+    assert received == [
+        StageStarted("decode", 1, 7, "Preparing audio", tmp_path / "a.m4a"),
+        StageFinished("decode", 1, 7, 2.5, tmp_path / "a.m4a"),
+    ]
+
+
+def test_failed_stage_emits_no_finished_event():
+    received = []
+    emitter = EventEmitter([received.append])
+
+    with pytest.raises(RuntimeError):
+        with emitter.stage("diarize", 2, 7, "Running speaker diarization"):
+            raise RuntimeError("boom")
+
+    assert [type(e) for e in received] == [StageStarted]
+
+
+def test_progress_is_throttled_and_reports_eta(clock):
+    received = []
+    emitter = EventEmitter([received.append], progress_interval=1.0)
+
+    with emitter.stage("transcribe", 3, 7, "Transcribing audio"):
+        clock.now += 10.0
+        emitter.progress(150.0, 600.0, segments=4)
+        clock.now += 0.5
+        emitter.progress(200.0, 600.0, segments=6)  # within the interval: dropped
+        clock.now += 0.5
+        emitter.progress(300.0, 600.0, segments=9)
+
+    progress = [e for e in received if isinstance(e, StageProgress)]
+    assert [e.fraction for e in progress] == [0.25, 0.5]
+    assert progress[0].stage == "transcribe"
+    assert progress[0].eta_seconds == pytest.approx(30.0)
+    assert progress[1].eta_seconds == pytest.approx(11.0)
+    assert progress[1].counters == {"segments": 9}
+
+
+def test_progress_never_goes_backwards_and_completes_once(clock):
+    received = []
+    emitter = EventEmitter([received.append], progress_interval=0.0)
+
+    with emitter.stage("transcribe", 3, 7, "Transcribing audio"):
+        clock.now += 1.0
+        emitter.progress(300.0, 600.0)
+        clock.now += 1.0
+        emitter.progress(100.0, 600.0)
+        emitter.progress(700.0, 600.0)
+        emitter.progress(600.0, 600.0)
+
+    fractions = [e.fraction for e in received if isinstance(e, StageProgress)]
+    assert fractions == [0.5, 1.0]
+
+
+def test_final_progress_bypasses_throttle(clock):
+    received = []
+    emitter = EventEmitter([received.append], progress_interval=60.0)
+
+    with emitter.stage("diarize", 2, 7, "Running speaker diarization"):
+        clock.now += 1.0
+        emitter.progress(10.0, 600.0)
+        emitter.progress(600.0, 600.0)
+
+    assert [e.fraction for e in received if isinstance(e, StageProgress)] == [
+        pytest.approx(10 / 600), 1.0,
+    ]
+
+
+def test_progress_without_subscribers_does_nothing(clock, monkeypatch):
+    emitted = []
+    emitter = EventEmitter([])
+    monkeypatch.setattr(emitter, "emit", emitted.append)
+
+    with emitter.stage("transcribe", 3, 7, "Transcribing audio"):
+        clock.now += 1.0
+        emitter.progress(600.0, 600.0)
+
+    assert not any(isinstance(e, StageProgress) for e in emitted)
+
+
+def test_failing_subscriber_does_not_stop_the_others(capsys):
+    received = []
+
+    def broken(event):
+        raise RuntimeError("dashboard offline")
+
+    emitter = EventEmitter([broken, received.append])
+
+    with emitter.stage("decode", 1, 7, "Preparing audio"):
+        emitter.message("  Audio ready: a.wav (60.0s)")
+
+    assert [type(e) for e in received] == [StageStarted, StageMessage, StageFinished]
+    assert "dashboard offline" in capsys.readouterr().err
+
+
+def test_message_names_the_running_stage(tmp_path):
+    received = []
+    emitter = EventEmitter([received.append], input_path=tmp_path / "a.m4a")
+
+    with emitter.stage("align", 4, 7, "Aligning transcript with speakers"):
+        emitter.message("  Aligned 3 utterances")
+
+    assert received[1] == StageMessage("align", "  Aligned 3 utterances", tmp_path / "a.m4a")
+
+
+def test_print_event_prints_step_header(capsys):
+    print_event(StageStarted("decode", 1, 7, "Preparing audio"))
+    print_event(StageFinished("decode", 1, 7, 1.0))
+
+    assert capsys.readouterr().out == "\n[1/7] Preparing audio...\n"
+
+
+def test_print_event_prints_messages(capsys):
+    print_event(StageMessage("align", "  Aligned 3 utterances"))
+
+    assert capsys.readouterr().out == "  Aligned 3 utterances\n"
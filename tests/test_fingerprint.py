@@ -0,0 +1,156 @@
+"""Tests for the fingerprint module."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from meeting_tool.fingerprint import (
+    HOP_SAMPLES,
+    FingerprintIndex,
+    compute_fingerprint,
+    match_fingerprints,
+)
+from meeting_tool.wav import PcmWav
+
+from .conftest import write_wav
+
+SAMPLE_RATE = 16000
+
+
+def _speechlike(seconds, seed):
+    """Noise with a changing loudness and pitch, so the bands vary like speech."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    envelope = np.repeat(rng.random(n // 800 + 1), 800)[:n]
+    pitch = np.repeat(300 + 700 * rng.random(n // 1600 + 1), 1600)[:n]
+    t = np.arange(n) / SAMPLE_RATE
+    return rng.standard_normal(n) * envelope * 3000 + 2000 * np.sin(2 * np.pi * pitch * t)
+
+
+@pytest.fixture
+def original(tmp_path):
+    return _speechlike(60, seed=0)
+
+
+def test_trimmed_and_reencoded_copy_matches(tmp_path, original):
+    trim = int(7.3 * SAMPLE_RATE)
+    rng = np.random.default_rng(1)
+    # Quieter, slightly noisy copy that starts 7.3 seconds later
+    copy = original[trim:] * 0.6 + rng.standard_normal(len(original) - trim) * 100
+
+    stored = compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original)))
+    query = compute_fingerprint(PcmWav(write_wav(tmp_path / "b.wav", copy)))
+    offset, ber, coverage = match_fingerprints(query, stored)
+
+    assert offset * HOP_SAMPLES / SAMPLE_RATE == pytest.approx(7.3, abs=0.05)
+    assert ber < 0.15
+    assert coverage == 1.0
+
+
+def test_different_audio_does_not_match(tmp_path, original):
+    stored = compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original)))
+    other = compute_fingerprint(PcmWav(write_wav(tmp_path / "b.wav", _speechlike(60, seed=2))))
+
+    result = match_fingerprints(other, stored)
+
+    assert result is None or result[1] > 0.4
+
+
+def test_index_finds_duplicate_only_when_covered(tmp_path, original):
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    full = compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original)))
+    index.add(minutes, tmp_path / "audio_only.m4a", 60.0, full)
+
+    trimmed = compute_fingerprint(PcmWav(write_wav(tmp_path / "b.wav", original[5 * SAMPLE_RATE:])))
+    match = index.find_duplicate(trimmed, 55.0)
+    assert match.output_path == str(minutes.resolve())
+    assert match.offset_seconds == pytest.approx(5.0, abs=0.05)
+
+    # The same minutes are not reported as a duplicate of themselves
+    assert index.find_duplicate(full, 60.0, exclude_output=minutes) is None
+
+    # A longer recording is not covered by the shorter one that was indexed
+    index = FingerprintIndex(tmp_path / "other.db")
+    index.add(minutes, tmp_path / "clip.m4a", 55.0, trimmed)
+    assert index.find_duplicate(full, 60.0) is None
+
+
+def test_index_does_not_match_a_clip_of_a_longer_meeting(tmp_path):
+    meeting = _speechlike(120, seed=3)
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    index.add(minutes, tmp_path / "meeting.m4a", 120.0,
+              compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", meeting))))
+
+    clip = compute_fingerprint(PcmWav(write_wav(tmp_path / "b.wav",
+                                          meeting[32 * SAMPLE_RATE:42 * SAMPLE_RATE])))
+    assert index.find_duplicate(clip, 10.0) is None
+    # Past the duration filter, the clip still doesn't cover the meeting
+    assert index.find_duplicate(clip, 115.0) is None
+
+
+def test_index_matches_only_minutes_made_with_the_same_settings(tmp_path, original):
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    fingerprint = compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original)))
+    index.add(minutes, tmp_path / "audio_only.m4a", 60.0, fingerprint, settings="large-v3")
+
+    assert index.find_duplicate(fingerprint, 60.0, settings="base") is None
+    assert index.find_duplicate(fingerprint, 60.0, settings="large-v3") is not None
+
+
+def test_index_finds_a_reencoded_copy_among_other_recordings(tmp_path, original):
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    for seed in (4, 5, 6):
+        other = tmp_path / f"other{seed}.md"
+        other.write_text("# Meeting Minutes", encoding="utf-8")
+        index.add(other, tmp_path / f"other{seed}.m4a", 60.0, compute_fingerprint(
+            PcmWav(write_wav(tmp_path / f"other{seed}.wav", _speechlike(60, seed=seed)))))
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    index.add(minutes, tmp_path / "audio_only.m4a", 60.0,
+              compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original))))
+
+    rng = np.random.default_rng(1)
+    copy = original[3 * SAMPLE_RATE:] * 0.6 + rng.standard_normal(57 * SAMPLE_RATE) * 100
+    query = compute_fingerprint(PcmWav(write_wav(tmp_path / "b.wav", copy)))
+    with index._connect() as conn:
+        candidates = FingerprintIndex._vote(conn, query, 57.0, "")
+
+    # Only the recording with the same audio gets enough votes to be loaded
+    assert len(candidates) == 1
+    match = index.find_duplicate(query, 57.0)
+    assert match.output_path == str(minutes.resolve())
+    assert match.offset_seconds == pytest.approx(3.0, abs=0.05)
+
+
+def test_index_adds_settings_and_values_to_an_older_database(tmp_path, original):
+    db_path = tmp_path / "fingerprints.db"
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    fingerprint = compute_fingerprint(PcmWav(write_wav(tmp_path / "a.wav", original)))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE recordings (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "output_path TEXT NOT NULL UNIQUE, source_file TEXT NOT NULL, "
+            "duration_seconds REAL NOT NULL, fingerprint BLOB NOT NULL, added_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO recordings (output_path, source_file, duration_seconds, fingerprint, "
+            "added_at) VALUES (?, ?, 60.0, ?, 0.0)",
+            (str(minutes.resolve()), "old.m4a", fingerprint.astype("<u4").tobytes()),
+        )
+    conn.close()
+
+    index = FingerprintIndex(db_path)
+    assert index.find_duplicate(fingerprint, 60.0).source_file == "old.m4a"
+
+    index.add(minutes, tmp_path / "audio_only.m4a", 60.0, fingerprint, settings="large-v3")
+    assert index.find_duplicate(fingerprint, 60.0, settings="large-v3") is not None
+    # Replacing the recording removed its old values with it
+    assert index.find_duplicate(fingerprint, 60.0) is None
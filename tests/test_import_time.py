@@ -0,0 +1,73 @@
+"""Cold-start guard: lightweight commands must not import the model libraries.
+
+Runs the CLI in a fresh interpreter with ``-X importtime`` and parses the
+per-module report that Python writes to stderr.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = {"torch", "torchaudio", "faster_whisper", "ctranslate2", "pyannote"}
+
+# Generous ceiling for importing the CLI, in microseconds
+MAX_CLI_IMPORT_US = 1_000_000
+
+
+def _import_times(*args: str, env: dict[str, str] | None = None) -> dict[str, int]:
+    """Run main.py under -X importtime and return cumulative microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(REPO_ROOT / "main.py"), *args],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env={**os.environ, **(env or {})},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def _heavy_imports(times: dict[str, int]) -> set[str]:
+    """Top-level packages from HEAVY_MODULES that were imported."""
+    return {name.split(".")[0] for name in times} & HEAVY_MODULES
+
+
+def test_help_does_not_import_models():
+    times = _import_times("--help")
+    assert "meeting_tool.cli" in times
+    assert _heavy_imports(times) == set()
+
+
+def test_typo_does_not_import_models():
+    times = _import_times("proccess")
+    assert _heavy_imports(times) == set()
+
+
+def test_rename_does_not_import_models(tmp_path):
+    minutes = tmp_path / "meeting.md"
+    minutes.write_text("**SPEAKER_00** (00:00:01):\nHello\n", encoding="utf-8")
+
+    index_path = tmp_path / "search.db"
+
+    times = _import_times("rename", str(minutes), "-s", "SPEAKER_00=Alice",
+                          env={"MEETING_TOOL_INDEX": str(index_path)})
+
+    assert _heavy_imports(times) == set()
+    assert "**Alice**" in minutes.read_text(encoding="utf-8")
+    # No search index is created just to rename speakers
+    assert not index_path.exists()
+
+
+def test_cli_import_time_budget():
+    times = _import_times("--help")
+    assert times["meeting_tool.cli"] < MAX_CLI_IMPORT_US
@@ -0,0 +1,136 @@
+"""Tests for the isolation module.
+
+The stage functions are module-level so the child processes can import them.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from meeting_tool.isolation import (
+    CRASHED,
+    ERROR,
+    MEMORY,
+    TIMEOUT,
+    StageFailed,
+    StageLimits,
+    describe_failure,
+    process_tree_memory,
+    run_isolated,
+)
+from meeting_tool.pipeline import MeetingJob, cleanup_job, meeting_graph
+from meeting_tool.resources import ThreadAllocation
+from meeting_tool.stage_graph import run_graph
+
+from .conftest import write_wav
+
+HAS_PROC = Path("/proc/self/statm").exists()
+
+
+def _count_to(n, progress=None):
+    print(f"counting to {n}")
+    for i in range(1, n + 1):
+        progress(float(i), float(n), words=i)
+    return {"pid": os.getpid(), "total": n}
+
+
+def _say(text, log=print):
+    log(text)
+    return len(text)
+
+
+def _fail():
+    raise ValueError("bad audio header")
+
+
+def _hang():
+    time.sleep(60)
+
+
+def _hog():
+    hog = b"x" * (400 * 2**20)
+    time.sleep(60)
+    return len(hog)
+
+
+def _die():
+    os._exit(3)
+
+
+def test_returns_result_and_forwards_output_and_progress(capsys):
+    reports = []
+
+    result = run_isolated("count", None, _count_to, 3,
+                          progress=lambda done, total, **counters: reports.append((done, counters)))
+
+    assert result["total"] == 3 and result["pid"] != os.getpid()
+    assert reports == [(1.0, {"words": 1}), (2.0, {"words": 2}), (3.0, {"words": 3})]
+    assert "counting to 3" in capsys.readouterr().out
+
+
+def test_forwards_log_lines():
+    lines = []
+
+    assert run_isolated("decode", None, _say, "  Audio ready", log=lines.append) == 13
+    assert lines == ["  Audio ready"]
+
+
+def test_exception_comes_back_with_the_child_traceback():
+    with pytest.raises(StageFailed, match="diarize stage failed: ValueError: bad audio header") as info:
+        run_isolated("diarize", None, _fail)
+
+    assert info.value.reason == ERROR
+    assert "_fail" in info.value.details
+    assert describe_failure(info.value).splitlines()[0] == str(info.value)
+    assert "_fail" in describe_failure(info.value)
+
+
+def test_timeout_stops_the_stage():
+    start = time.monotonic()
+
+    with pytest.raises(StageFailed, match="within 1s") as info:
+        run_isolated("transcribe", StageLimits(timeout=1.0), _hang)
+
+    assert info.value.reason == TIMEOUT
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.skipif(not HAS_PROC, reason="memory is measured from /proc")
+def test_memory_cap_stops_the_stage():
+    with pytest.raises(StageFailed, match="200 MB cap") as info:
+        run_isolated("diarize", StageLimits(memory_bytes=200 * 2**20, timeout=30), _hog)
+
+    assert info.value.reason == MEMORY
+    assert info.value.peak_memory_bytes > 200 * 2**20
+
+
+def test_dying_child_is_reported():
+    with pytest.raises(StageFailed, match="exit code 3") as info:
+        run_isolated("decode", None, _die)
+
+    assert info.value.reason == CRASHED
+
+
+@pytest.mark.skipif(not HAS_PROC, reason="memory is measured from /proc")
+def test_process_tree_memory():
+    assert process_tree_memory(os.getpid()) > 0
+    assert process_tree_memory(2**22 + 12345) is None
+
+
+def test_isolated_decode_stage(tmp_path):
+    wav_path = write_wav(tmp_path / "meeting.wav", seconds=1)
+    job = MeetingJob(wav_path, tmp_path / "meeting.md", isolation=StageLimits(timeout=60),
+                     share_samples=True)
+
+    values = run_graph(meeting_graph(job, ThreadAllocation(1, 1, 1), 1, dedup=False),
+                       ["audio"], {"input_path": wav_path})
+
+    assert job.audio_path == wav_path
+    assert job.duration == pytest.approx(1.0)
+    # The isolated stages read the samples converted once by the decode stage
+    assert values["audio"] is job.samples and job.samples.num_samples == 16000
+    samples_path = job.samples.path
+    cleanup_job(job)
+    assert not samples_path.exists() and wav_path.exists()
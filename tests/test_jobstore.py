@@ -0,0 +1,86 @@
+"""Tests for the job store module."""
+
+from meeting_tool.jobstore import DONE, FAILED, QUEUED, RUNNING, JobStore
+
+
+def test_submit_and_get(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    job = store.submit("/data/a.m4a", options={"num_speakers": 2})
+
+    assert job.status == QUEUED
+    assert store.get(job.id).options == {"num_speakers": 2}
+
+
+def test_claim_oldest_first(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    first = store.submit("/data/a.m4a")
+    store.submit("/data/b.m4a")
+
+    claimed = store.claim("worker-0")
+
+    assert claimed.id == first.id
+    assert claimed.status == RUNNING
+    assert claimed.worker == "worker-0"
+
+
+def test_claim_empty_queue(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    assert store.claim("worker-0") is None
+
+
+def test_claim_does_not_hand_out_a_job_twice(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("/data/a.m4a")
+
+    assert store.claim("worker-0") is not None
+    assert JobStore(tmp_path / "jobs.db").claim("worker-1") is None
+
+
+def test_complete_and_fail(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("/data/a.m4a")
+    store.submit("/data/b.m4a")
+    a = store.claim("w")
+    b = store.claim("w")
+
+    store.complete(a.id, "/data/a.md")
+    store.fail(b.id, "boom")
+
+    assert store.get(a.id).status == DONE
+    assert store.get(a.id).result_path == "/data/a.md"
+    assert store.get(b.id).status == FAILED
+    assert store.get(b.id).error == "boom"
+
+
+def test_requeue_running(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("/data/a.m4a")
+    job = store.claim("w")
+
+    assert store.requeue_running() == 1
+    assert store.get(job.id).status == QUEUED
+
+
+def test_stats(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("/data/a.m4a")
+    store.submit("/data/b.m4a")
+    job = store.claim("w")
+    store.complete(job.id, "/data/a.md")
+
+    stats = store.stats(window_seconds=3600)
+
+    assert stats["queued"] == 1
+    assert stats["done"] == 1
+    assert stats["finished_in_window"] == 1
+    assert stats["jobs_per_hour"] == 1.0
+
+
+def test_list_jobs_filter(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("/data/a.m4a")
+    store.submit("/data/b.m4a")
+    store.claim("w")
+
+    assert len(store.list_jobs()) == 2
+    assert [j.input_path for j in store.list_jobs(status=QUEUED)] == ["/data/b.m4a"]
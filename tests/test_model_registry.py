@@ -0,0 +1,100 @@
+"""Tests for the model registry module."""
+
+import pytest
+
+from meeting_tool.model_registry import (
+    ModelKey,
+    ModelRegistry,
+    estimate_whisper_bytes,
+    parse_memory_size,
+)
+
+
+def _key(size):
+    return ModelKey(name="whisper", size=size, device="cpu", compute_type="int8")
+
+
+class _Loader:
+    """Fake loader that counts calls."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_get_reuses_loaded_model():
+    registry = ModelRegistry()
+    loader = _Loader("small-model")
+
+    first = registry.get(_key("small"), loader, 100)
+    second = registry.get(_key("small"), loader, 100)
+
+    assert first is second
+    assert loader.calls == 1
+
+
+def test_alternating_models_without_budget_never_reload():
+    registry = ModelRegistry()
+    small, large = _Loader("small"), _Loader("large")
+    for _ in range(3):
+        registry.get(_key("small"), small, 100)
+        registry.get(_key("large-v3"), large, 1000)
+
+    assert small.calls == 1
+    assert large.calls == 1
+
+
+def test_lru_eviction_under_budget():
+    registry = ModelRegistry(memory_budget=250)
+    registry.get(_key("tiny"), _Loader("tiny"), 100)
+    registry.get(_key("base"), _Loader("base"), 100)
+    # Touch tiny so base becomes least recently used
+    registry.get(_key("tiny"), _Loader("unused"), 100)
+
+    registry.get(_key("small"), _Loader("small"), 100)
+
+    assert registry.loaded() == [_key("tiny"), _key("small")]
+    assert registry.memory_used == 200
+
+
+def test_model_larger_than_budget_loads_alone():
+    registry = ModelRegistry(memory_budget=150)
+    registry.get(_key("tiny"), _Loader("tiny"), 100)
+
+    model = registry.get(_key("large-v3"), _Loader("large"), 1000)
+
+    assert model == "large"
+    assert registry.loaded() == [_key("large-v3")]
+
+
+def test_evict_and_clear():
+    registry = ModelRegistry()
+    registry.get(_key("tiny"), _Loader("tiny"), 100)
+    registry.get(_key("base"), _Loader("base"), 100)
+
+    assert registry.evict(_key("tiny"))
+    assert not registry.evict(_key("tiny"))
+    registry.clear()
+    assert registry.loaded() == []
+
+
+def test_parse_memory_size():
+    assert parse_memory_size("512MB") == 512 * 1024 ** 2
+    assert parse_memory_size("4gb") == 4 * 1024 ** 3
+    assert parse_memory_size("1.5G") == int(1.5 * 1024 ** 3)
+    assert parse_memory_size("1024") == 1024
+
+
+def test_parse_memory_size_invalid():
+    with pytest.raises(ValueError):
+        parse_memory_size("lots")
+
+
+def test_estimate_whisper_bytes_by_compute_type():
+    assert estimate_whisper_bytes("small", "int8") < estimate_whisper_bytes("small", "float16")
+    assert estimate_whisper_bytes("small", "float16") < estimate_whisper_bytes("small", "float32")
+    assert estimate_whisper_bytes("tiny", "int8") < estimate_whisper_bytes("large-v3", "int8")
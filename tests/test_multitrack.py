@@ -0,0 +1,30 @@
+"""Tests for the multitrack module."""
+
+from pathlib import Path
+
+from meeting_tool.multitrack import collect_tracks, track_name
+
+
+def test_track_name_from_zoom_file_name():
+    assert track_name(Path("audioAliceSmith11234567890.m4a")) == "Alice Smith"
+    assert track_name(Path("audioBob21234567890.m4a")) == "Bob"
+
+
+def test_track_name_falls_back_to_file_name():
+    assert track_name(Path("carol.wav")) == "carol"
+    assert track_name(Path("audio_only.m4a")) == "audio_only"
+
+
+def test_collect_tracks(tmp_path):
+    folder = tmp_path / "Audio Record"
+    folder.mkdir()
+    for name in ("audioBob2123456789.m4a", "audioAlice1123456789.m4a", "notes.txt"):
+        (folder / name).write_bytes(b"")
+    extra = tmp_path / "guest.wav"
+    extra.write_bytes(b"")
+
+    tracks = collect_tracks([folder, extra])
+
+    assert [t.name for t in tracks] == [
+        "audioAlice1123456789.m4a", "audioBob2123456789.m4a", "guest.wav",
+    ]
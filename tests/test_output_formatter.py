@@ -1,9 +1,14 @@
 """Tests for the output formatter module."""
 
+from datetime import date
+
 from meeting_tool.output_formatter import (
     _format_duration,
-    _format_timestamp,
+    carry_over_summary,
     format_meeting_minutes,
+    format_timestamp,
+    retarget_minutes,
+    write_output,
 )
 
 
@@ -20,9 +25,9 @@ def test_format_duration_zero():
 
 
 def test_format_timestamp():
-    assert _format_timestamp(0) == "00:00:00"
-    assert _format_timestamp(65) == "00:01:05"
-    assert _format_timestamp(3661) == "01:01:01"
+    assert format_timestamp(0) == "00:00:00"
+    assert format_timestamp(65) == "00:01:05"
+    assert format_timestamp(3661) == "01:01:01"
 
 
 def test_format_meeting_minutes_with_summary(sample_transcript, sample_summary):
@@ -58,3 +63,50 @@ def test_transcript_timestamps(sample_transcript):
     assert "(00:00:00)" in result  # first utterance at 0.0s
     assert "(00:00:03)" in result  # second utterance at 3.5s -> 00:00:03
     assert "(00:00:07)" in result  # third utterance at 7.5s -> 00:00:07
+
+
+def test_carry_over_summary(sample_transcript, sample_summary):
+    old = format_meeting_minutes(sample_transcript, sample_summary)
+    new = format_meeting_minutes(sample_transcript)
+
+    result = carry_over_summary(old, new)
+
+    assert "## Summary" in result
+    assert "project updates" in result
+    assert result.index("## Summary") < result.index("## Full Transcript")
+
+
+def test_carry_over_summary_without_old_summary(sample_transcript):
+    old = format_meeting_minutes(sample_transcript)
+    new = format_meeting_minutes(sample_transcript)
+    assert carry_over_summary(old, new) == new
+
+
+def test_format_meeting_minutes_with_note(sample_transcript):
+    result = format_meeting_minutes(sample_transcript, note="Draft transcript (base model).")
+
+    assert "> Draft transcript (base model)." in result
+    assert result.index("> Draft") < result.index("## Full Transcript")
+
+
+def test_write_output_replaces_existing_file(tmp_path):
+    path = tmp_path / "meeting.md"
+    path.write_text("draft", encoding="utf-8")
+
+    write_output("refined", path)
+
+    assert path.read_text(encoding="utf-8") == "refined"
+    assert [p.name for p in tmp_path.iterdir()] == ["meeting.md"]
+
+
+def test_retarget_minutes(sample_transcript):
+    copied = format_meeting_minutes(sample_transcript).replace(
+        f"**Date:** {date.today().isoformat()}", "**Date:** 2020-01-01")
+
+    result = retarget_minutes(copied, 90.0, "Transcript of audio_only.m4a, which has the same audio.")
+
+    header = result.split("\n")[1]
+    assert header.startswith(f"**Date:** {date.today().isoformat()}  |  **Duration:** 1m  |  ")
+    assert header.endswith("**Participants:** Alice, Bob")
+    assert "> Transcript of audio_only.m4a" in result
+    assert result.index("> Transcript of") < result.index("## Full Transcript")
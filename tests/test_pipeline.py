@@ -0,0 +1,218 @@
+"""Tests for the pipeline module, with the model stages replaced by fakes."""
+
+import threading
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from meeting_tool import pipeline
+from meeting_tool.archive import MeetingArchive, archive_path_for
+from meeting_tool.cache import cache_dir_for, load_meeting_info, load_transcription
+from meeting_tool.events import EventEmitter, StageMessage
+from meeting_tool.models import TranscriptionSegment, TranscriptionWord
+from meeting_tool.wav import SharedSamples, open_audio
+
+from .conftest import write_wav
+
+
+def _noise(seconds):
+    """Samples whose fingerprint is distinctive, unlike silence."""
+    rng = np.random.default_rng(0)
+    return rng.standard_normal(16000 * seconds) * np.repeat(rng.random(seconds * 20), 800) * 3000
+
+
+def _fake_models(monkeypatch, diarization, transcription, seen):
+    def diarize(job, audio, *args):
+        seen["duration"] = open_audio(audio).duration
+        seen["diarized"] = seen.get("diarized", 0) + 1
+        return list(diarization)
+
+    def transcribe(job, audio, diarization_segments, whisper_threads, whisper_model, *args):
+        seen.setdefault("models", []).append(whisper_model)
+        return list(transcription), None
+
+    monkeypatch.setattr(pipeline, "_diarize", diarize)
+    monkeypatch.setattr(pipeline, "_transcribe", transcribe)
+
+
+def test_time_range_keeps_recording_timestamps(tmp_path, monkeypatch,
+                                               sample_diarization_segments,
+                                               sample_transcription_segments):
+    seen = {}
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, seen)
+    recording = write_wav(tmp_path / "townhall.wav", seconds=120)
+
+    minutes_path = pipeline.process_meeting(
+        recording, start=60.0, end=90.0, no_interactive=True, index=False,
+    )
+
+    # Only the range went through the models, with its times starting at 0
+    assert seen["duration"] == 30.0
+    assert minutes_path == tmp_path / "townhall_60-90s.md"
+    minutes = minutes_path.read_text(encoding="utf-8")
+    assert "00:01:07" in minutes and "00:00:07" not in minutes
+    assert "Covers 00:01:00 to 00:01:30 of the recording" in minutes
+    prompt = minutes_path.with_suffix(".prompt.txt").read_text(encoding="utf-8")
+    assert "[01:07]" in prompt
+
+    archive = MeetingArchive(archive_path_for(minutes_path))
+    assert [u.start for u in archive.utterances()] == [60.0, 63.5, 67.5]
+    assert archive.words()[0].start == 60.0
+    cache_dir = cache_dir_for(minutes_path)
+    assert load_transcription(cache_dir)[0].words[-1].end == 63.0
+    assert load_meeting_info(cache_dir)["offset_seconds"] == 60.0
+    # The temporary WAV file of the range is removed again
+    assert sorted(p.name for p in tmp_path.glob("*.wav")) == ["townhall.wav"]
+
+
+def test_selective_retranscribes_only_low_confidence_segments(tmp_path, monkeypatch,
+                                                              sample_diarization_segments,
+                                                              sample_transcription_segments):
+    draft = list(sample_transcription_segments)
+    # Confident-looking words where the draft model probably heard only noise
+    draft[1] = replace(draft[1], no_speech_prob=0.9)
+    models = []
+    _fake_models(monkeypatch, sample_diarization_segments, draft, {})
+
+    def transcribe_spans(job, audio, spans, whisper_threads, whisper_model, *args):
+        models.append(whisper_model)
+        assert spans == [(3.5, 7.0)]
+        return [TranscriptionSegment(
+            start=3.5, end=7.0, text="Thanks Alice let's start",
+            words=[TranscriptionWord(start=3.5 + i, end=4.0 + i, text=word)
+                   for i, word in enumerate(["Thanks", "Alice", "let's", "start"])],
+        )]
+
+    monkeypatch.setattr(pipeline, "_transcribe_spans", transcribe_spans)
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+
+    minutes_path = pipeline.process_meeting(
+        recording, draft_model="base", selective=True, whisper_model="large-v3",
+        no_interactive=True, index=False, dedup=False,
+    )
+
+    assert models == ["large-v3"]
+    minutes = minutes_path.read_text(encoding="utf-8")
+    assert "let's start" in minutes and "with the agenda" not in minutes
+    assert "Hello everyone welcome to the meeting" in minutes
+    assert [seg.text for seg in load_transcription(cache_dir_for(minutes_path))][1] == \
+        "Thanks Alice let's start"
+
+
+def test_duplicate_reuses_minutes_made_with_the_same_settings(tmp_path, monkeypatch,
+                                                             sample_diarization_segments,
+                                                             sample_transcription_segments):
+    monkeypatch.setenv("MEETING_TOOL_FINGERPRINTS", str(tmp_path / "fingerprints.db"))
+    seen = {}
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, seen)
+    original = write_wav(tmp_path / "audio_only.wav", _noise(30))
+    pipeline.process_meeting(original, no_interactive=True, index=False)
+    copy = tmp_path / "meeting.wav"
+    copy.write_bytes(original.read_bytes())
+
+    seen.clear()
+    minutes_path = pipeline.process_meeting(copy, no_interactive=True, index=False)
+
+    assert seen == {}
+    minutes = minutes_path.read_text(encoding="utf-8")
+    assert "> Transcript of audio_only.wav, which has the same audio." in minutes
+    assert MeetingArchive(archive_path_for(minutes_path)).source_file == copy
+
+    # Other settings make other minutes, so the recording is processed again
+    pipeline.process_meeting(copy, whisper_model="base", no_interactive=True, index=False)
+    assert seen["duration"] == 30.0
+
+
+def test_stage_details_are_sent_as_events(tmp_path, monkeypatch, capsys,
+                                          sample_diarization_segments,
+                                          sample_transcription_segments):
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, {})
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+    received = []
+
+    pipeline.process_meeting(recording, no_interactive=True, index=False, dedup=False,
+                             events=EventEmitter([received.append]))
+
+    messages = [(e.stage, e.text) for e in received if isinstance(e, StageMessage)]
+    assert ("decode", "  Using standup.wav directly (already 16kHz mono PCM)") in messages
+    assert ("align", "  Aligned 3 utterances") in messages
+    assert "Aligned 3 utterances" not in capsys.readouterr().out
+
+
+def test_draft_minutes_get_no_archive(tmp_path, monkeypatch,
+                                      sample_diarization_segments,
+                                      sample_transcription_segments):
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, {})
+
+    def transcribe(job, audio, diarization_segments, whisper_threads, whisper_model, *args):
+        if whisper_model == "large-v3":
+            raise RuntimeError("out of memory")
+        return list(sample_transcription_segments), None
+
+    monkeypatch.setattr(pipeline, "_transcribe", transcribe)
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        pipeline.process_meeting(recording, draft_model="base", no_interactive=True,
+                                 index=False, dedup=False)
+
+    assert "> Draft transcript (base model)" in (tmp_path / "standup.md").read_text(encoding="utf-8")
+    assert not archive_path_for(tmp_path / "standup.md").exists()
+
+
+def test_progressive_replaces_the_draft_and_diarizes_once(tmp_path, monkeypatch,
+                                                         sample_diarization_segments,
+                                                         sample_transcription_segments):
+    seen = {}
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, seen)
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+
+    minutes_path = pipeline.process_meeting(
+        recording, draft_model="base", speakers="SPEAKER_00=Alice",
+        no_interactive=True, index=False, dedup=False,
+    )
+
+    assert seen["models"] == ["base", "large-v3"]
+    assert seen["diarized"] == 1
+    minutes = minutes_path.read_text(encoding="utf-8")
+    assert "Draft transcript" not in minutes and "Alice" in minutes
+    assert archive_path_for(minutes_path).exists()
+
+
+def test_only_prompt_stops_before_the_minutes(tmp_path, monkeypatch,
+                                              sample_diarization_segments,
+                                              sample_transcription_segments):
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, {})
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+
+    prompt_path = pipeline.process_meeting(recording, only="prompt", no_interactive=True,
+                                           index=False, dedup=False)
+
+    assert prompt_path == tmp_path / "standup.prompt.txt"
+    assert "Hello everyone" in prompt_path.read_text(encoding="utf-8")
+    assert not (tmp_path / "standup.md").exists()
+    assert not archive_path_for(tmp_path / "standup.md").exists()
+
+
+def test_parallel_stages_read_shared_samples(tmp_path, monkeypatch,
+                                             sample_diarization_segments,
+                                             sample_transcription_segments):
+    _fake_models(monkeypatch, sample_diarization_segments, sample_transcription_segments, {})
+    recording = write_wav(tmp_path / "standup.wav", seconds=20)
+    read = []
+
+    def transcribe(job, audio, *args):
+        read.append((audio, threading.current_thread() is threading.main_thread()))
+        return list(sample_transcription_segments), None
+
+    monkeypatch.setattr(pipeline, "_transcribe", transcribe)
+
+    minutes_path = pipeline.process_meeting(recording, parallel_stages=True,
+                                            no_interactive=True, index=False, dedup=False)
+
+    [(audio, in_main_thread)] = read
+    assert isinstance(audio, SharedSamples) and not in_main_thread
+    assert "Hello everyone welcome to the meeting" in minutes_path.read_text(encoding="utf-8")
+    # The shared samples are removed with the job
+    assert not audio.path.exists()
@@ -0,0 +1,71 @@
+"""Tests for the resources module."""
+
+import pytest
+
+from meeting_tool.resources import (
+    CPUS_ENV_VAR,
+    JOBS_ENV_VAR,
+    allocate_threads,
+    plan_threads,
+    resolve_cpu_budget,
+    resolve_jobs_per_host,
+)
+
+
+def test_allocate_single_job_gets_full_budget():
+    result = allocate_threads(8)
+    assert result.torch_threads == 8
+    assert result.whisper_threads == 8
+    assert result.ffmpeg_threads == 8
+
+
+def test_allocate_many_jobs_split_budget():
+    result = allocate_threads(16, jobs=4)
+    assert result.torch_threads == 4
+    assert result.whisper_threads == 4
+    assert result.ffmpeg_threads == 4
+
+
+def test_allocate_more_jobs_than_cores():
+    result = allocate_threads(2, jobs=8)
+    assert result.torch_threads == 1
+    assert result.whisper_threads == 1
+    assert result.ffmpeg_threads == 1
+
+
+def test_allocate_concurrent_stages_share_job_budget():
+    result = allocate_threads(8, concurrent_stages=True)
+    assert result.torch_threads + result.whisper_threads == 8
+
+
+def test_allocate_invalid_budget():
+    with pytest.raises(ValueError):
+        allocate_threads(0)
+
+
+def test_resolve_cpu_budget_explicit_wins(monkeypatch):
+    monkeypatch.setenv(CPUS_ENV_VAR, "4")
+    assert resolve_cpu_budget(2) == 2
+
+
+def test_resolve_cpu_budget_from_env(monkeypatch):
+    monkeypatch.setenv(CPUS_ENV_VAR, "3")
+    assert resolve_cpu_budget() == 3
+
+
+def test_resolve_cpu_budget_invalid_env(monkeypatch):
+    monkeypatch.setenv(CPUS_ENV_VAR, "many")
+    with pytest.raises(ValueError):
+        resolve_cpu_budget()
+
+
+def test_resolve_jobs_default(monkeypatch):
+    monkeypatch.delenv(JOBS_ENV_VAR, raising=False)
+    assert resolve_jobs_per_host() == 1
+
+
+def test_plan_threads_uses_env(monkeypatch):
+    monkeypatch.setenv(CPUS_ENV_VAR, "12")
+    monkeypatch.setenv(JOBS_ENV_VAR, "3")
+    result = plan_threads()
+    assert result.whisper_threads == 4
@@ -0,0 +1,95 @@
+"""Tests for the search index module."""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from meeting_tool.models import AlignedUtterance
+from meeting_tool.search_index import SearchIndex, parse_timestamp
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(tmp_path / "search.db")
+
+
+def _utterance(label, name, start, text):
+    return AlignedUtterance(speaker_label=label, speaker_name=name,
+                            start=start, end=start + 5.0, text=text)
+
+
+@pytest.fixture
+def populated(index, tmp_path):
+    index.add_meeting(
+        tmp_path / "standup.md", Path("standup.m4a"), 900.0,
+        [
+            _utterance("SPEAKER_00", "Alice", 10.0, "We decided to use the new API framework"),
+            _utterance("SPEAKER_01", "Bob", 600.0, "The API migration starts next week"),
+        ],
+        date(2026, 2, 10),
+    )
+    index.add_meeting(
+        tmp_path / "retro.md", Path("retro.m4a"), 1800.0,
+        [_utterance("SPEAKER_00", "SPEAKER_00", 30.0, "Deployment of the API went well")],
+        date(2026, 3, 5),
+    )
+    return index
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("90") == 90.0
+    assert parse_timestamp("01:30") == 90.0
+    assert parse_timestamp("1:02:03") == 3723.0
+    with pytest.raises(ValueError):
+        parse_timestamp("ten minutes")
+
+
+def test_search_matches_word_forms(populated):
+    hits = populated.search("decide")
+    assert [hit.speaker_name for hit in hits] == ["Alice"]
+    assert hits[0].start == 10.0
+    assert hits[0].meeting_date == "2026-02-10"
+    assert "[decided]" in hits[0].snippet
+
+
+def test_search_phrase(populated):
+    assert len(populated.search('"new API framework"')) == 1
+    assert populated.search('"framework API"') == []
+
+
+def test_search_filters(populated):
+    assert len(populated.search("API")) == 3
+    assert [h.speaker_name for h in populated.search("API", speaker="bob")] == ["Bob"]
+    assert len(populated.search("API", speaker="SPEAKER_00")) == 2
+    assert [h.meeting_date for h in populated.search("API", since=date(2026, 3, 1))] == ["2026-03-05"]
+    assert len(populated.search("API", until=date(2026, 2, 28))) == 2
+    assert [h.start for h in populated.search("API", start=300.0, end=900.0)] == [600.0]
+
+
+def test_reindexing_replaces_only_that_meeting(populated, tmp_path):
+    populated.add_meeting(
+        tmp_path / "standup.md", Path("standup.m4a"), 900.0,
+        [_utterance("SPEAKER_00", "Alice", 10.0, "Nothing relevant here")],
+    )
+
+    assert populated.search("decided") == []
+    assert len(populated.search("API")) == 1
+    assert populated.stats() == {"meetings": 2, "utterances": 2}
+
+
+def test_rename_speakers(populated, tmp_path):
+    assert populated.rename_speakers(tmp_path / "retro.md", {"SPEAKER_00": "Carol"}) == 1
+    assert [h.speaker_name for h in populated.search("deployment")] == ["Carol"]
+    assert populated.rename_speakers(tmp_path / "unknown.md", {"SPEAKER_00": "Carol"}) == 0
+
+
+def test_remove_meeting(populated, tmp_path):
+    assert populated.remove_meeting(tmp_path / "retro.md")
+    assert populated.search("deployment") == []
+    assert not populated.remove_meeting(tmp_path / "retro.md")
+
+
+def test_invalid_query(populated):
+    with pytest.raises(ValueError, match="Invalid search query"):
+        populated.search('"unbalanced')
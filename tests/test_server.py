@@ -0,0 +1,127 @@
+"""Tests for the server HTTP API (no worker processes)."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from meeting_tool.jobstore import JobStore
+from meeting_tool.server import create_server
+
+
+@pytest.fixture
+def api(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    server = create_server(store, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, data=None):
+    body = json.dumps(data).encode("utf-8") if data is not None else None
+    request = urllib.request.Request(url, data=body, method="POST" if body else "GET")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_returns_queued_job(api, tmp_path):
+    recording = tmp_path / "meeting.m4a"
+    recording.write_bytes(b"")
+
+    status, job = _request(f"{api}/jobs", {"input_path": str(recording),
+                                           "options": {"num_speakers": 2}})
+
+    assert status == 202
+    assert job["status"] == "queued"
+    assert _request(f"{api}/jobs/{job['id']}")[1]["options"] == {"num_speakers": 2}
+    assert _request(f"{api}/stats")[1]["queued"] == 1
+
+
+def test_submit_missing_file(api, tmp_path):
+    status, body = _request(f"{api}/jobs", {"input_path": str(tmp_path / "nope.m4a")})
+    assert status == 400
+    assert "not found" in body["error"]
+
+
+def test_submit_unknown_option(api, tmp_path):
+    recording = tmp_path / "meeting.m4a"
+    recording.write_bytes(b"")
+    status, body = _request(f"{api}/jobs", {"input_path": str(recording),
+                                            "options": {"device": "cuda"}})
+    assert status == 400
+    assert "device" in body["error"]
+
+
+@pytest.mark.parametrize("options, message", [
+    ({"num_speakers": "two"}, "num_speakers must be an integer"),
+    ({"num_speakers": 0}, "num_speakers must be at least 1"),
+    ({"transcribe_mode": "bogus"}, "transcribe_mode must be one of"),
+    ({"summary": "yes"}, "summary must be true or false"),
+    ({"diarization_overlap": True}, "diarization_overlap must be a number"),
+    ({"diarization_window": -60}, "must not be negative"),
+    ({"whisper_model": None}, "whisper_model must be a string"),
+])
+def test_submit_rejects_bad_option_values(api, tmp_path, options, message):
+    recording = tmp_path / "meeting.m4a"
+    recording.write_bytes(b"")
+
+    status, body = _request(f"{api}/jobs", {"input_path": str(recording), "options": options})
+
+    assert status == 400
+    assert message in body["error"]
+    assert _request(f"{api}/stats")[1]["queued"] == 0
+
+
+def test_submit_accepts_valid_option_values(api, tmp_path):
+    recording = tmp_path / "meeting.m4a"
+    recording.write_bytes(b"")
+    options = {"transcribe_mode": "turns", "diarization_window": 600, "num_speakers": None,
+               "dedup": False}
+
+    status, _ = _request(f"{api}/jobs", {"input_path": str(recording), "options": options})
+
+    assert status == 202
+
+
+def test_submit_options_not_an_object(api, tmp_path):
+    recording = tmp_path / "meeting.m4a"
+    recording.write_bytes(b"")
+    status, body = _request(f"{api}/jobs", {"input_path": str(recording),
+                                            "options": ["num_speakers"]})
+    assert status == 400
+    assert "options" in body["error"]
+
+
+def test_list_jobs_bad_limit(api):
+    status, body = _request(f"{api}/jobs?limit=ten")
+    assert status == 400
+    assert "limit" in body["error"]
+
+
+def test_unknown_job(api):
+    status, _ = _request(f"{api}/jobs/999")
+    assert status == 404
+
+
+def test_socket_path_replaces_only_a_stale_socket(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    socket_path = tmp_path / "api.sock"
+    create_server(store, socket_path=socket_path).server_close()
+    assert socket_path.exists()
+
+    # A socket left behind by an earlier server is replaced
+    create_server(store, socket_path=socket_path).server_close()
+
+    minutes = tmp_path / "minutes.md"
+    minutes.write_text("# Meeting Minutes", encoding="utf-8")
+    with pytest.raises(FileExistsError, match="not a socket"):
+        create_server(store, socket_path=minutes)
+    assert minutes.read_text(encoding="utf-8") == "# Meeting Minutes"
@@ -0,0 +1,127 @@
+"""Tests for the speaker linking module."""
+
+import numpy as np
+import pytest
+
+from meeting_tool.models import DiarizationSegment
+from meeting_tool.speaker_linking import (
+    DiarizationWindow,
+    link_speakers,
+    plan_windows,
+    stitch_segments,
+)
+
+
+def test_plan_windows_short_recording():
+    windows = plan_windows(100.0, window_seconds=600.0, overlap_seconds=60.0)
+    assert len(windows) == 1
+    assert windows[0].start == 0.0
+    assert windows[0].end == 100.0
+
+
+def test_plan_windows_cover_recording():
+    windows = plan_windows(1000.0, window_seconds=300.0, overlap_seconds=60.0)
+
+    assert windows[0].own_start == 0.0
+    assert windows[-1].end == 1000.0
+    assert windows[-1].own_end == 1000.0
+    for prev, nxt in zip(windows, windows[1:]):
+        # Windows overlap, ownership is contiguous
+        assert nxt.start < prev.end
+        assert prev.own_end == nxt.own_start
+        assert nxt.start <= nxt.own_start < prev.end
+
+
+def test_plan_windows_invalid_overlap():
+    with pytest.raises(ValueError):
+        plan_windows(1000.0, window_seconds=60.0, overlap_seconds=60.0)
+
+
+def test_link_speakers_matches_similar_embeddings():
+    alice = np.array([1.0, 0.0, 0.0])
+    bob = np.array([0.0, 1.0, 0.0])
+    windows = [
+        {"SPEAKER_00": alice, "SPEAKER_01": bob},
+        # Labels swapped in the second window
+        {"SPEAKER_00": bob + 0.05, "SPEAKER_01": alice + 0.05},
+    ]
+    maps = link_speakers(windows)
+
+    assert maps[0] == {"SPEAKER_00": "SPEAKER_00", "SPEAKER_01": "SPEAKER_01"}
+    assert maps[1] == {"SPEAKER_00": "SPEAKER_01", "SPEAKER_01": "SPEAKER_00"}
+
+
+def test_link_speakers_new_speaker_in_later_window():
+    windows = [
+        {"SPEAKER_00": np.array([1.0, 0.0, 0.0])},
+        {"SPEAKER_00": np.array([0.0, 0.0, 1.0])},
+    ]
+    maps = link_speakers(windows)
+    assert maps[1]["SPEAKER_00"] == "SPEAKER_01"
+
+
+def test_link_speakers_same_window_speakers_stay_distinct():
+    similar = np.array([1.0, 0.1, 0.0])
+    windows = [
+        {"SPEAKER_00": np.array([1.0, 0.0, 0.0])},
+        {"SPEAKER_00": similar, "SPEAKER_01": similar},
+    ]
+    maps = link_speakers(windows)
+    assert maps[1]["SPEAKER_00"] != maps[1]["SPEAKER_01"]
+
+
+def test_link_speakers_num_speakers_merges_closest():
+    windows = [
+        {"SPEAKER_00": np.array([1.0, 0.0, 0.0])},
+        {"SPEAKER_00": np.array([0.6, 0.8, 0.0])},
+        {"SPEAKER_00": np.array([0.0, 0.0, 1.0])},
+    ]
+    maps = link_speakers(windows, num_speakers=2)
+    labels = {m["SPEAKER_00"] for m in maps}
+    assert len(labels) == 2
+    assert maps[0]["SPEAKER_00"] == maps[1]["SPEAKER_00"]
+
+
+def test_link_speakers_nan_embedding():
+    windows = [
+        {"SPEAKER_00": np.array([1.0, 0.0]), "SPEAKER_01": np.array([np.nan, np.nan])},
+    ]
+    maps = link_speakers(windows)
+    assert maps[0]["SPEAKER_00"] != maps[0]["SPEAKER_01"]
+
+
+def test_link_speakers_num_speakers_places_speakers_without_embedding():
+    windows = [
+        {"SPEAKER_00": np.array([1.0, 0.0]), "SPEAKER_01": np.array([0.0, 1.0])},
+        {"SPEAKER_00": np.array([1.0, 0.1]), "SPEAKER_01": np.array([np.nan, np.nan])},
+    ]
+    times = [
+        {"SPEAKER_00": 10.0, "SPEAKER_01": 50.0},
+        {"SPEAKER_00": 110.0, "SPEAKER_01": 60.0},
+    ]
+
+    maps = link_speakers(windows, num_speakers=2, speaker_times=times)
+
+    # Never more speakers than asked for; the short one joins the speaker talking nearby
+    assert len({label for m in maps for label in m.values()}) == 2
+    assert maps[1]["SPEAKER_01"] == maps[0]["SPEAKER_01"]
+
+
+def test_stitch_segments_clips_and_joins():
+    windows = [
+        DiarizationWindow(start=0.0, end=100.0, own_start=0.0, own_end=90.0),
+        DiarizationWindow(start=80.0, end=180.0, own_start=90.0, own_end=180.0),
+    ]
+    window_segments = [
+        [DiarizationSegment(start=50.0, end=100.0, speaker_label="SPEAKER_00")],
+        # Window-relative times: 80s-120s in the recording
+        [DiarizationSegment(start=0.0, end=40.0, speaker_label="SPEAKER_03")],
+    ]
+    maps = [{"SPEAKER_00": "SPEAKER_00"}, {"SPEAKER_03": "SPEAKER_00"}]
+
+    result = stitch_segments(windows, window_segments, maps)
+
+    assert len(result) == 1
+    assert result[0].start == 50.0
+    assert result[0].end == 120.0
+    assert result[0].speaker_label == "SPEAKER_00"
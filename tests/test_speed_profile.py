@@ -0,0 +1,123 @@
+"""Tests for the speed profile module."""
+
+import json
+
+import pytest
+
+from meeting_tool.speed_profile import (
+    DIARIZATION,
+    PROFILE_PATH_ENV_VAR,
+    SpeedMeasurement,
+    SpeedProfile,
+    choose_model,
+    default_profile_path,
+)
+
+
+def _measurement(model, rtf, compute_type="int8", device="cpu", mode="sequential"):
+    return SpeedMeasurement(
+        model=model, device=device, compute_type=compute_type, transcribe_mode=mode,
+        rtf=rtf, threads=8, audio_seconds=120.0, measured_at=0.0,
+    )
+
+
+@pytest.fixture
+def profile(tmp_path):
+    profile = SpeedProfile(tmp_path / "profile.json")
+    profile.add(SpeedMeasurement(
+        model=DIARIZATION, device="cpu", compute_type=None, transcribe_mode=None,
+        rtf=0.05, threads=8, audio_seconds=120.0, measured_at=0.0,
+    ))
+    profile.add(_measurement("tiny", 0.02))
+    profile.add(_measurement("small", 0.10))
+    profile.add(_measurement("medium", 0.30))
+    profile.add(_measurement("large-v3", 0.60))
+    return profile
+
+
+def test_profile_round_trip_replaces_same_configuration(profile):
+    profile.add(_measurement("small", 0.12))
+    profile.save()
+
+    loaded = SpeedProfile(profile.path)
+
+    assert len(loaded.measurements) == 5
+    assert loaded.diarization_rtf("cpu") == 0.05
+    small = [m for m in loaded.measurements if m.model == "small"]
+    assert [m.rtf for m in small] == [0.12]
+
+
+def test_choose_most_accurate_model_that_fits(profile):
+    # One hour of audio in 30 minutes: medium needs (0.05 + 0.30) * 60 = 21 min
+    choice = choose_model(profile, 3600.0, 1800.0)
+
+    assert (choice.model, choice.compute_type, choice.fits) == ("medium", "int8", True)
+    assert choice.estimated_seconds == pytest.approx(0.35 * 3600.0)
+
+
+def test_choose_counts_model_loading(profile):
+    diarization = profile.diarization("cpu")
+    diarization.load_seconds = 10.0
+    for model, load_seconds in (("medium", 15.0), ("large-v3", 30.0)):
+        [m] = [m for m in profile.measurements if m.model == model]
+        m.load_seconds = load_seconds
+
+    # One minute of audio in one minute: large-v3 would infer in 39s but
+    # loading it and pyannote takes another 40s
+    choice = choose_model(profile, 60.0, 60.0)
+
+    assert (choice.model, choice.fits) == ("medium", True)
+    assert choice.estimated_seconds == pytest.approx(10.0 + 15.0 + 0.35 * 60.0)
+
+
+def test_profile_without_load_times_still_loads(profile):
+    profile.save()
+    data = json.loads(profile.path.read_text(encoding="utf-8"))
+    for m in data["measurements"]:
+        del m["load_seconds"]
+    profile.path.write_text(json.dumps(data), encoding="utf-8")
+
+    loaded = SpeedProfile(profile.path)
+
+    assert all(m.load_seconds == 0.0 for m in loaded.measurements)
+    assert choose_model(loaded, 600.0, 3600.0).model == "large-v3"
+
+
+def test_choose_generous_deadline_picks_largest(profile):
+    assert choose_model(profile, 600.0, 3600.0).model == "large-v3"
+
+
+def test_choose_falls_back_to_fastest_when_nothing_fits(profile):
+    choice = choose_model(profile, 3600.0, 60.0)
+
+    assert (choice.model, choice.fits) == ("tiny", False)
+
+
+def test_choose_prefers_more_precise_compute_type(profile):
+    profile.add(_measurement("medium", 0.40, compute_type="float32"))
+
+    choice = choose_model(profile, 3600.0, 1800.0)
+    assert (choice.model, choice.compute_type) == ("medium", "float32")
+
+    choice = choose_model(profile, 3600.0, 1800.0, compute_type="int8")
+    assert (choice.model, choice.compute_type) == ("medium", "int8")
+
+
+def test_choose_without_measurements_raises(profile):
+    with pytest.raises(ValueError, match="calibrate"):
+        choose_model(profile, 3600.0, 1800.0, device="cuda")
+
+
+def test_default_profile_path_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv(PROFILE_PATH_ENV_VAR, str(tmp_path / "custom.json"))
+    assert default_profile_path() == tmp_path / "custom.json"
+
+
+def test_choose_turns_mode_uses_batched_measurements_until_calibrated(profile):
+    profile.add(_measurement("small", 0.04, mode="batched"))
+    profile.add(_measurement("large-v3", 0.20, mode="batched"))
+
+    assert choose_model(profile, 3600.0, 1800.0, transcribe_mode="turns").model == "large-v3"
+
+    profile.add(_measurement("small", 0.03, mode="turns"))
+    assert choose_model(profile, 3600.0, 1800.0, transcribe_mode="turns").model == "small"
@@ -0,0 +1,193 @@
+"""Tests for the stage_graph module."""
+
+import threading
+import time
+
+import pytest
+
+from meeting_tool.events import EventEmitter, StageCancelled, StageStarted
+from meeting_tool.stage_graph import Stage, StageGraph, StageMemo, run_graph
+
+
+def _graph(log, key="small", barrier=None):
+    """decode -> (diarize, transcribe) -> align -> (prompt, write)."""
+    def stage(name, outputs):
+        def run(**inputs):
+            log.append(name)
+            if barrier is not None and name in ("diarize", "transcribe"):
+                barrier.wait(timeout=5)
+            return {output: f"{name}({','.join(sorted(inputs))})" for output in outputs}
+        return run
+
+    return StageGraph([
+        Stage("decode", stage("decode", ["audio"]), ("input",), ("audio",), "Preparing audio"),
+        Stage("diarize", stage("diarize", ["speakers"]), ("audio",), ("speakers",), "Diarizing"),
+        Stage("transcribe", stage("transcribe", ["text"]), ("audio",), ("text",), "Transcribing",
+              key=key),
+        Stage("align", stage("align", ["utterances"]), ("speakers", "text"), ("utterances",)),
+        Stage("prompt", stage("prompt", ["prompt_path"]), ("utterances",), ("prompt_path",),
+              "Saving prompt"),
+        Stage("write", stage("write", ["minutes"]), ("utterances", "prompt_path"), ("minutes",),
+              "Writing"),
+    ])
+
+
+def test_plan_orders_stages_by_their_inputs():
+    plan = _graph([]).plan(["minutes"], known={"input"})
+
+    assert [s.name for s in plan] == ["decode", "diarize", "transcribe", "align", "prompt", "write"]
+
+
+def test_plan_runs_only_the_needed_subgraph():
+    graph = _graph([])
+
+    assert [s.name for s in graph.plan(["text"], known={"input"})] == ["decode", "transcribe"]
+    assert [s.name for s in graph.plan(["minutes"], known={"utterances"})] == ["prompt", "write"]
+
+
+def test_plan_reports_missing_values():
+    with pytest.raises(ValueError, match="'input'"):
+        run_graph(_graph([]), ["minutes"])
+
+
+def test_graph_rejects_two_producers_and_cycles():
+    def run(**inputs):
+        return {}
+
+    with pytest.raises(ValueError, match="produced by both"):
+        StageGraph([Stage("a", run, outputs=("x",)), Stage("b", run, outputs=("x",))])
+
+    graph = StageGraph([Stage("a", run, ("y",), ("x",)), Stage("b", run, ("x",), ("y",))])
+    with pytest.raises(ValueError, match="depends on its own output"):
+        graph.plan(["x"])
+
+
+def test_run_graph_returns_all_values():
+    log = []
+
+    values = run_graph(_graph(log), ["prompt_path"], {"input": "a.wav"})
+
+    assert log == ["decode", "diarize", "transcribe", "align", "prompt"]
+    assert values["utterances"] == "align(speakers,text)"
+    assert "minutes" not in values
+
+
+def test_run_graph_runs_independent_stages_concurrently():
+    log = []
+    # Diarization and transcription each wait until the other has started
+    barrier = threading.Barrier(2)
+
+    run_graph(_graph(log, barrier=barrier), ["minutes"], {"input": "a.wav"}, workers=2)
+
+    assert set(log[1:3]) == {"diarize", "transcribe"}
+
+
+def test_memo_reruns_only_what_changed():
+    log = []
+    memo = StageMemo()
+    values = {"input": "a.wav"}
+
+    run_graph(_graph(log, key="small"), ["minutes"], values, memo)
+    log.clear()
+    run_graph(_graph(log, key="small"), ["minutes"], values, memo)
+    assert log == []
+
+    run_graph(_graph(log, key="large"), ["minutes"], values, memo)
+    assert log == ["transcribe", "align", "prompt", "write"]
+
+
+def test_steps_are_numbered_over_the_stages_that_run():
+    received = []
+    events = EventEmitter([received.append])
+    memo = StageMemo()
+    values = {"input": "a.wav"}
+
+    run_graph(_graph([]), ["minutes"], values, memo, events=events)
+    started = [(e.stage, e.step, e.total_steps) for e in received if isinstance(e, StageStarted)]
+    assert started == [("decode", 1, 5), ("diarize", 2, 5), ("transcribe", 3, 5),
+                       ("prompt", 4, 5), ("write", 5, 5)]
+
+    received.clear()
+    run_graph(_graph([], key="large"), ["minutes"], values, memo, events=events)
+    started = [(e.stage, e.step, e.total_steps) for e in received if isinstance(e, StageStarted)]
+    assert started == [("transcribe", 1, 3), ("prompt", 2, 3), ("write", 3, 3)]
+
+
+def test_halt_stops_before_later_stages():
+    log = []
+
+    values = run_graph(_graph(log), ["minutes"], {"input": "a.wav"},
+                       halt=lambda v: "audio" in v)
+
+    assert log == ["decode"]
+    assert "minutes" not in values
+
+
+def test_failure_propagates_and_stops_the_run():
+    def fail(**inputs):
+        raise RuntimeError("diarization failed")
+
+    log = []
+    graph = StageGraph([
+        Stage("diarize", fail, s.inputs, s.outputs, s.title) if s.name == "diarize" else s
+        for s in _graph(log).stages
+    ])
+
+    with pytest.raises(RuntimeError, match="diarization failed"):
+        run_graph(graph, ["minutes"], {"input": "a.wav"})
+    assert "write" not in log
+
+
+def test_failure_cancels_the_running_sibling():
+    events = EventEmitter([])
+    transcribing = threading.Event()
+    sibling = {}
+
+    def fail(**inputs):
+        transcribing.wait(timeout=5)
+        raise RuntimeError("diarization failed")
+
+    def transcribe(**inputs):
+        transcribing.set()
+        try:
+            while True:
+                events.progress(1.0, 60.0)
+                time.sleep(0.01)
+        except StageCancelled as e:
+            sibling["cancelled"] = e
+        return {"text": ""}
+
+    graph = StageGraph([
+        Stage("diarize", fail, ("audio",), ("speakers",)),
+        Stage("transcribe", transcribe, ("audio",), ("text",)),
+    ])
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="diarization failed"):
+        run_graph(graph, ["speakers", "text"], {"audio": "a.wav"}, workers=2, events=events)
+
+    assert time.monotonic() - started < 5
+    assert events.cancelled
+    for _ in range(500):
+        if "cancelled" in sibling:
+            break
+        time.sleep(0.01)
+    assert isinstance(sibling["cancelled"], StageCancelled)
+
+
+def test_steps_can_be_numbered_over_a_given_plan():
+    received = []
+    events = EventEmitter([received.append])
+
+    run_graph(_graph([]), ["text"], {"input": "a.wav", "audio": "a.wav"}, events=events,
+              step_names=["decode", "diarize", "transcribe", "prompt", "write"])
+
+    started = [(e.stage, e.step, e.total_steps) for e in received if isinstance(e, StageStarted)]
+    assert started == [("transcribe", 3, 5)]
+
+
+def test_stage_must_return_its_outputs():
+    graph = StageGraph([Stage("a", lambda: {}, outputs=("x",))])
+
+    with pytest.raises(ValueError, match="did not produce x"):
+        run_graph(graph, ["x"])
@@ -0,0 +1,75 @@
+"""Tests for the turns module."""
+
+from meeting_tool.models import DiarizationSegment, TranscriptionSegment
+from meeting_tool.turns import (
+    MAX_TURN_SECONDS,
+    align_turns,
+    assign_segments,
+    plan_turns,
+    split_into_lanes,
+)
+
+
+def _seg(start, end, text="words"):
+    return TranscriptionSegment(start=start, end=end, text=text, words=[])
+
+
+def test_plan_turns_joins_same_speaker_segments():
+    turns = plan_turns([
+        DiarizationSegment(0.0, 2.0, "SPEAKER_00"),
+        DiarizationSegment(2.3, 4.0, "SPEAKER_00"),
+        DiarizationSegment(4.5, 6.0, "SPEAKER_01"),
+        DiarizationSegment(8.0, 9.0, "SPEAKER_01"),
+    ])
+
+    assert [(t.start, t.end, t.speaker_label) for t in turns] == [
+        (0.0, 4.0, "SPEAKER_00"),
+        (4.5, 6.0, "SPEAKER_01"),
+        (8.0, 9.0, "SPEAKER_01"),
+    ]
+
+
+def test_plan_turns_splits_long_turns_and_drops_blips():
+    turns = plan_turns([
+        DiarizationSegment(0.0, 70.0, "SPEAKER_00"),
+        DiarizationSegment(75.0, 75.1, "SPEAKER_01"),
+    ])
+
+    assert len(turns) == 3
+    assert all(t.end - t.start <= MAX_TURN_SECONDS for t in turns)
+    assert (turns[0].start, turns[-1].end) == (0.0, 70.0)
+    assert all(t.speaker_label == "SPEAKER_00" for t in turns)
+
+
+def test_split_into_lanes_separates_overlapping_turns():
+    a = DiarizationSegment(0.0, 5.0, "SPEAKER_00")
+    b = DiarizationSegment(4.0, 6.0, "SPEAKER_01")
+    c = DiarizationSegment(5.0, 9.0, "SPEAKER_00")
+
+    assert split_into_lanes([a, b, c]) == [[a, c], [b]]
+
+
+def test_assign_segments_by_turn():
+    lane = [DiarizationSegment(0.0, 5.0, "SPEAKER_00"), DiarizationSegment(6.0, 9.0, "SPEAKER_01")]
+    segments = [_seg(0.2, 2.0), _seg(2.0, 4.9), _seg(6.1, 8.0)]
+
+    labels = [speaker for speaker, _ in assign_segments(lane, segments)]
+
+    assert labels == ["SPEAKER_00", "SPEAKER_00", "SPEAKER_01"]
+
+
+def test_align_turns_merges_close_same_speaker_segments():
+    labeled = [
+        ("SPEAKER_01", _seg(6.0, 8.0, "Sure.")),
+        ("SPEAKER_00", _seg(0.0, 2.0, "Hello")),
+        ("SPEAKER_00", _seg(2.5, 5.0, "everyone.")),
+        ("SPEAKER_00", _seg(9.0, 10.0, "")),
+    ]
+
+    result = align_turns(labeled)
+
+    assert [(u.speaker_label, u.text) for u in result] == [
+        ("SPEAKER_00", "Hello everyone."),
+        ("SPEAKER_01", "Sure."),
+    ]
+    assert (result[0].start, result[0].end) == (0.0, 5.0)
@@ -0,0 +1,140 @@
+"""Tests for the watcher module."""
+
+import os
+
+from meeting_tool import watcher as watcher_module
+from meeting_tool.batch import DONE, SKIPPED
+from meeting_tool.watcher import DUPLICATE, QUEUED, FolderWatcher, WatchState, file_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write(path, data=b"audio", mtime=1000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _watcher(tmp_path, clock, settle=30.0):
+    state = WatchState(tmp_path / "state" / "watch.db")
+    return FolderWatcher(tmp_path / "zoom", state, settle_seconds=settle, clock=clock), state
+
+
+def test_file_digest_depends_on_content(tmp_path):
+    a = _write(tmp_path / "a.m4a", b"one")
+    b = _write(tmp_path / "b.m4a", b"one")
+    c = _write(tmp_path / "c.m4a", b"two")
+    assert file_digest(a) == file_digest(b) != file_digest(c)
+
+
+def test_poll_waits_for_file_to_settle(tmp_path):
+    clock = FakeClock()
+    watcher, _ = _watcher(tmp_path, clock)
+    recording = _write(tmp_path / "zoom" / "meeting 1" / "audio.m4a")
+    _write(tmp_path / "zoom" / "meeting 1" / "notes.txt")
+
+    assert watcher.poll() == []
+    clock.now = 10
+    assert watcher.poll() == []
+
+    clock.now = 31
+    assert watcher.poll() == [(recording, recording.with_suffix(".md"))]
+
+
+def test_poll_restarts_debounce_when_file_changes(tmp_path):
+    clock = FakeClock()
+    watcher, _ = _watcher(tmp_path, clock)
+    recording = _write(tmp_path / "zoom" / "audio.m4a", b"part")
+    watcher.poll()
+
+    clock.now = 31
+    _write(recording, b"part and more", mtime=1030)
+    assert watcher.poll() == []
+
+    clock.now = 62
+    assert watcher.poll() == [(recording, recording.with_suffix(".md"))]
+
+
+def test_poll_skips_file_that_disappears_before_hashing(tmp_path, monkeypatch):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    recording = _write(tmp_path / "zoom" / "audio.m4a")
+    watcher.poll()
+
+    def vanished(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(watcher_module, "file_digest", vanished)
+    assert watcher.poll() == []
+    assert state.counts() == {}
+
+    monkeypatch.undo()
+    watcher.poll()
+    assert watcher.poll() == [(recording, recording.with_suffix(".md"))]
+
+
+def test_poll_hands_out_each_file_once(tmp_path):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    _write(tmp_path / "zoom" / "audio.m4a")
+    watcher.poll()
+    assert len(watcher.poll()) == 1
+    assert watcher.poll() == []
+    assert state.counts() == {QUEUED: 1}
+
+
+def test_state_survives_restart(tmp_path):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    recording = _write(tmp_path / "zoom" / "audio.m4a")
+    watcher.poll()
+    watcher.poll()
+    state.set_status(recording, DONE)
+
+    restarted, _ = _watcher(tmp_path, clock, settle=0)
+    restarted.poll()
+    assert restarted.poll() == []
+
+
+def test_unfinished_files_are_picked_up_after_restart(tmp_path):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    _write(tmp_path / "zoom" / "audio.m4a")
+    watcher.poll()
+    watcher.poll()
+
+    assert state.forget_queued() == 1
+    restarted, _ = _watcher(tmp_path, clock, settle=0)
+    restarted.poll()
+    assert len(restarted.poll()) == 1
+
+
+def test_copies_are_deduplicated_by_content(tmp_path):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    _write(tmp_path / "zoom" / "a" / "audio.m4a", b"same meeting")
+    _write(tmp_path / "zoom" / "b" / "audio.m4a", b"same meeting")
+    watcher.poll()
+
+    ready = watcher.poll()
+
+    assert [path.parent.name for path, _ in ready] == ["a"]
+    assert state.counts() == {QUEUED: 1, DUPLICATE: 1}
+
+
+def test_up_to_date_outputs_are_skipped(tmp_path):
+    clock = FakeClock()
+    watcher, state = _watcher(tmp_path, clock, settle=0)
+    _write(tmp_path / "zoom" / "audio.m4a", mtime=1000)
+    _write(tmp_path / "zoom" / "audio.md", b"minutes", mtime=2000)
+    watcher.poll()
+
+    assert watcher.poll() == []
+    assert state.counts() == {SKIPPED: 1}
@@ -0,0 +1,144 @@
+"""Tests for the wav module."""
+
+import pickle
+import struct
+
+import numpy as np
+import pytest
+
+from meeting_tool import wav as wav_module
+from meeting_tool.isolation import run_isolated
+from meeting_tool.wav import PcmWav, SharedSamples, open_audio, share_samples
+
+from .conftest import write_wav
+
+
+def test_header_and_duration(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", np.zeros(24000)))
+    assert wav.sample_rate == 16000
+    assert wav.num_samples == 24000
+    assert wav.duration == 1.5
+
+
+def test_window_is_a_view_of_the_file(tmp_path):
+    samples = np.arange(16000 * 3, dtype=np.int16)
+    wav = PcmWav(write_wav(tmp_path / "a.wav", samples))
+
+    window = wav.window(1.0, 2.0)
+
+    assert np.array_equal(window, samples[16000:32000])
+    assert np.shares_memory(window, wav.samples)
+
+
+def test_window_is_clamped_to_the_recording(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", np.ones(16000)))
+    assert len(wav.window(0.5, 10.0)) == 8000
+    assert len(wav.window(5.0, 10.0)) == 0
+
+
+def test_float_window(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", [-32768, 0, 16384]))
+    result = wav.float_window()
+    assert result.dtype == np.float32
+    assert result.tolist() == [-1.0, 0.0, 0.5]
+
+
+def test_skips_extra_chunks(tmp_path):
+    samples = np.arange(10, dtype="<i2").tobytes()
+    fmt = struct.pack("<HHIIHH", 1, 1, 16000, 32000, 2, 16)
+    chunks = (b"fmt " + struct.pack("<I", len(fmt)) + fmt
+              + b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+              + b"data" + struct.pack("<I", len(samples)) + samples)
+    path = tmp_path / "list.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks)
+
+    assert PcmWav(path).window().tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("channels, width", [(2, 2), (1, 1)])
+def test_rejects_other_formats(tmp_path, channels, width):
+    path = write_wav(tmp_path / "a.wav", np.zeros(100), channels=channels, width=width)
+    with pytest.raises(ValueError, match="not mono 16-bit PCM"):
+        PcmWav(path)
+
+
+def test_rejects_non_wav(tmp_path):
+    path = tmp_path / "a.m4a"
+    path.write_bytes(b"\x00\x00\x00\x20ftypM4A ")
+    with pytest.raises(ValueError, match="Not a WAV file"):
+        PcmWav(path)
+
+
+def _sum_window(samples, start, end):
+    """Runs in a child process, which gets only the handle."""
+    return float(samples.float_window(start, end).sum())
+
+
+def test_shared_samples_match_float_window(tmp_path, monkeypatch):
+    # Convert in several chunks
+    monkeypatch.setattr(wav_module, "_CONVERT_CHUNK_SAMPLES", 7000)
+    rng = np.random.default_rng(0)
+    wav = PcmWav(write_wav(tmp_path / "a.wav", rng.integers(-32768, 32767, 16000 * 2)))
+
+    shared = share_samples(wav, tmp_path)
+
+    assert shared.duration == 2.0 and shared.path.parent == tmp_path
+    assert np.array_equal(shared.float_window(), wav.float_window())
+    assert np.array_equal(shared.float_window(0.5, 1.5), wav.float_window(0.5, 1.5))
+    assert len(shared.float_window(5.0, 6.0)) == 0
+    assert open_audio(shared) is shared
+    assert isinstance(open_audio(wav.path), PcmWav)
+
+
+def test_shared_samples_views_are_private_copies_on_write(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", [16384] * 100))
+    shared = share_samples(wav, tmp_path)
+
+    view = shared.float_window()
+    view[:] = 0.0
+
+    assert shared.float_window().tolist() == [0.5] * 100
+
+
+def test_shared_samples_are_read_by_other_processes(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", [16384] * 16000 + [-16384] * 16000))
+    shared = share_samples(wav, tmp_path)
+
+    assert len(pickle.dumps(shared)) < 500
+    assert run_isolated("test", None, _sum_window, shared, 0.0, 1.0) == 8000.0
+    assert run_isolated("test", None, _sum_window, shared, 1.0, None) == -8000.0
+
+
+def test_release_deletes_the_samples(tmp_path):
+    shared = share_samples(PcmWav(write_wav(tmp_path / "a.wav", np.ones(10))), tmp_path)
+
+    shared.release()
+    shared.release()
+
+    assert not shared.path.exists()
+
+
+def test_shared_samples_of_empty_recording(tmp_path):
+    shared = share_samples(PcmWav(write_wav(tmp_path / "a.wav", [])), tmp_path)
+
+    assert isinstance(shared, SharedSamples)
+    assert len(shared.float_window()) == 0
+
+
+def test_shared_samples_must_be_at_the_model_rate(tmp_path):
+    wav = PcmWav(write_wav(tmp_path / "a.wav", np.ones(10), sample_rate=8000))
+
+    with pytest.raises(ValueError, match="must be 16000 Hz"):
+        share_samples(wav, tmp_path)
+    assert list(tmp_path.glob("*.f32")) == []
+
+
+def test_samples_of_dead_processes_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(wav_module, "_process_alive", lambda pid: pid != 999999)
+    orphan = tmp_path / "meeting_tool_999999_abc.f32"
+    orphan.write_bytes(b"\0" * 8)
+    in_use = share_samples(PcmWav(write_wav(tmp_path / "a.wav", np.ones(10))), tmp_path)
+
+    assert not orphan.exists()
+    assert in_use.path.exists()
+    assert wav_module.remove_orphaned_samples(tmp_path) == 0